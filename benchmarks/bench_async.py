@@ -0,0 +1,52 @@
+"""
+Throughput dan latensi engine extract asyncio (`scrape_all_pages_async`) dibandingkan thread pool
+(`scrape_all_pages`) pada concurrency 1 sampai 64, terhadap server asyncio lokal dengan latensi tetap.
+
+Jalankan dari root project:
+python -m benchmarks.bench_async --pages 256 --latency 0.05 --concurrency 1 2 4 8 16 32 64
+"""
+import argparse
+import logging
+import statistics
+import time
+import utils.extract as extract
+from benchmarks.stub_server import AsyncStubServer
+from utils.extract_async import scrape_all_pages_sync
+
+ENGINES = {
+    "threads": extract.scrape_all_pages,
+    "async": scrape_all_pages_sync,
+}
+
+
+def run_engine(engine, pages, concurrency):
+    """Mengembalikan (detik, jumlah halaman, p50 dan p95 latensi per request dalam ms)."""
+    stats = []
+    start = time.perf_counter()
+    ENGINES[engine](max_pages=pages + 1, max_workers=concurrency, stats=stats)
+    seconds = time.perf_counter() - start
+    latencies = sorted(page["elapsed"] * 1000 for page in stats if page.get("elapsed"))
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return seconds, len(stats), statistics.median(latencies), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark engine extract asyncio vs thread pool.")
+    parser.add_argument("--pages", type=int, default=256)
+    parser.add_argument("--latency", type=float, default=0.05, help="Latensi server per respons (detik).")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    with AsyncStubServer(pages=args.pages, latency=args.latency) as server:
+        extract.BASE_URL = server.base_url
+        print(f"{'engine':<8} {'concurrency':>11} {'seconds':>8} {'pages/s':>8} {'p50 ms':>7} {'p95 ms':>7}")
+        for concurrency in args.concurrency:
+            for engine in args.engines:
+                seconds, pages, p50, p95 = run_engine(engine, args.pages, concurrency)
+                print(f"{engine:<8} {concurrency:>11} {seconds:>8.2f} {pages / seconds:>8.0f} {p50:>7.1f} {p95:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
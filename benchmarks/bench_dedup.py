@@ -0,0 +1,59 @@
+"""
+Membandingkan deduplikasi riwayat multi-hari: drop_duplicates pada gabungan riwayat + run baru
+dengan DedupIndex (binary search fingerprint di file .npy) yang hanya memproses baris baru.
+
+Jalankan dari root project:
+python -m benchmarks.bench_dedup --history 100000 1000000 --new-rows 10000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import pandas as pd
+from benchmarks.synthetic import make_raw_catalogue
+from utils.dedup import DedupIndex
+from utils.transform import clean_and_transform
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indeks dedup riwayat.")
+    parser.add_argument("--history", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--new-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    # Run baru: separuh produk lama (timestamp berbeda), separuh produk baru
+    print(f"{'history':>10} {'new rows':>9} {'drop_dup s':>11} {'index s':>9} {'commit s':>9}")
+    for rows in args.history:
+        catalogue = make_raw_catalogue(rows + args.new_rows // 2)
+        history = clean_and_transform(catalogue[:rows])
+        new_raw = [dict(product, timestamp="2030-01-01T00:00:00")
+                   for product in catalogue[rows - args.new_rows // 2:]]
+        content = [column for column in history.columns if column != "timestamp"]
+
+        start = time.perf_counter()
+        merged = pd.concat([history, clean_and_transform(new_raw)], ignore_index=True)
+        expected = merged.drop_duplicates(subset=content)
+        drop_seconds = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dedup.npy")
+            index = DedupIndex(path)
+            index.add_frame(history)
+            index.commit()
+
+            index = DedupIndex(path)
+            start = time.perf_counter()
+            fresh = clean_and_transform(new_raw, history=index)
+            index_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            index.commit()
+            commit_seconds = time.perf_counter() - start
+
+        assert len(fresh) == len(expected) - len(history)
+        print(f"{rows:>10} {len(new_raw):>9} {drop_seconds:>11.3f} {index_seconds:>9.3f} {commit_seconds:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
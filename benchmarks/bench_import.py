@@ -0,0 +1,86 @@
+"""
+Benchmark waktu import (startup) modul pipeline memakai `python -X importtime`.
+
+Setiap pengukuran berjalan di proses Python baru, sehingga hasilnya sama dengan biaya startup
+sebuah run cron. Ditampilkan total waktu import per modul dan modul pihak ketiga termahal.
+
+Jalankan dari root project:
+python -m benchmarks.bench_import --modules main utils.load utils.sinks --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Dependensi backend sink/engine yang tidak boleh ikut ter-import saat startup
+HEAVY_MODULES = ("sqlalchemy", "googleapiclient", "google.oauth2", "aiohttp", "pyarrow.dataset", "dotenv")
+
+
+def import_profile(code):
+    """
+    Menjalankan `code` di proses Python baru dengan `-X importtime`.
+
+    Parameters:
+    code (str): Kode Python, misal 'import main'.
+
+    Returns:
+    dict: Nama modul -> waktu import kumulatif (detik), untuk setiap modul yang ter-import.
+
+    Raises:
+    subprocess.CalledProcessError: Jika kode gagal dijalankan.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative) / 1e6
+    return modules
+
+
+def import_seconds(module, repeat=3):
+    """
+    Waktu import kumulatif terbaik sebuah modul dari `repeat` proses baru.
+
+    Returns:
+    float: Waktu import dalam detik.
+    """
+    return min(import_profile(f"import {module}")[module] for _ in range(repeat))
+
+
+def heavy_imports(modules):
+    """Daftar paket di `HEAVY_MODULES` yang (beserta submodulnya) ikut ter-import menurut `import_profile`."""
+    return sorted(heavy for heavy in HEAVY_MODULES
+                  if any(name == heavy or name.startswith(f"{heavy}.") for name in modules))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark waktu import modul pipeline.")
+    parser.add_argument("--modules", nargs="+", default=["main", "utils.load", "utils.sinks", "utils.extract"])
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah proses per modul; waktu terbaik dicatat.")
+    parser.add_argument("--top", type=int, default=10, help="Jumlah modul termahal yang ditampilkan.")
+    args = parser.parse_args()
+
+    print(f"{'module':<16} {'import ms':>10}  heavy backends")
+    for module in args.modules:
+        seconds = import_seconds(module, args.repeat)
+        heavy = heavy_imports(import_profile(f"import {module}"))
+        print(f"{module:<16} {seconds * 1000:>10.1f}  {', '.join(heavy) or '-'}")
+
+    # Modul top-level termahal saat `import main` (tidak termasuk modul project sendiri)
+    profile = import_profile(f"import {args.modules[0]}")
+    top_level = {name: seconds for name, seconds in profile.items()
+                 if "." not in name and name not in args.modules and name != "utils"}
+    print(f"\nImport termahal untuk {args.modules[0]}:")
+    for name, seconds in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:<20} {seconds * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
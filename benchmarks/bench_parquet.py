@@ -0,0 +1,66 @@
+"""
+Membandingkan waktu baca riwayat produk dari CSV dengan dataset Parquet terpartisi
+(baca penuh, serta baca dengan proyeksi kolom + filter tanggal).
+
+Jalankan dari root project:
+python -m benchmarks.bench_parquet --days 30 --rows-per-day 20000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import pandas as pd
+from benchmarks.synthetic import make_raw_catalogue
+from utils.load import save_to_csv, save_to_parquet, read_parquet_history
+from utils.transform import clean_and_transform
+
+
+def timed(func):
+    """Menjalankan `func` dan mengembalikan (hasil, durasi detik)."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark baca CSV vs Parquet.")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--rows-per-day", type=int, default=20_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    day = clean_and_transform(make_raw_catalogue(args.rows_per_day))
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "products.csv")
+        parquet_path = os.path.join(directory, "products_parquet")
+        dates = pd.date_range("2025-01-01", periods=args.days).strftime("%Y-%m-%d")
+        for index, date in enumerate(dates):
+            run = day.assign(timestamp=f"{date}T10:00:00")
+            save_to_csv(run, csv_path, append=index > 0)
+            save_to_parquet(run, parquet_path)
+
+        last_week = dates[max(0, args.days - 7)]
+
+        def read_csv_last_week():
+            df = pd.read_csv(csv_path, usecols=["title", "price", "timestamp"])
+            return df[df["timestamp"] >= last_week]
+
+        csv_full, csv_seconds = timed(lambda: pd.read_csv(csv_path))
+        _, csv_query_seconds = timed(read_csv_last_week)
+        pq_full, pq_seconds = timed(lambda: read_parquet_history(parquet_path))
+        pq_query, pq_query_seconds = timed(lambda: read_parquet_history(
+            parquet_path, columns=["title", "price", "timestamp"], filters=[("scrape_date", ">=", last_week)]))
+
+        csv_mb = os.path.getsize(csv_path) / 1e6
+        parquet_mb = sum(os.path.getsize(os.path.join(root, name))
+                         for root, _, names in os.walk(parquet_path) for name in names) / 1e6
+
+    print(f"{len(csv_full)} baris, CSV {csv_mb:.1f} MB, Parquet {parquet_mb:.1f} MB")
+    print(f"{'query':>24} {'csv (s)':>9} {'parquet (s)':>12}")
+    print(f"{'semua kolom':>24} {csv_seconds:>9.3f} {pq_seconds:>12.3f}")
+    print(f"{'3 kolom, 7 hari terakhir':>24} {csv_query_seconds:>9.3f} {pq_query_seconds:>12.3f}  ({len(pq_query)} baris)")
+
+
+if __name__ == "__main__":
+    main()
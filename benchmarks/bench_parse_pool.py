@@ -0,0 +1,46 @@
+"""
+Membandingkan parsing di thread fetch (dibatasi GIL) dengan parsing di process pool
+(`parse_workers`) saat scraping server lokal tanpa latensi, sehingga parsing menjadi bottleneck.
+
+Jalankan dari root project:
+python -m benchmarks.bench_parse_pool --pages 400 --backend bs4 --workers 1 2 4 8
+"""
+import argparse
+import logging
+import os
+import time
+import utils.extract as extract
+from benchmarks.stub_server import StubServer
+
+
+def scrape_seconds(pages, max_workers, parse_workers):
+    """Durasi scrape_all_pages untuk semua halaman server lokal."""
+    start = time.perf_counter()
+    products = extract.scrape_all_pages(max_pages=pages + 1, max_workers=max_workers, parse_workers=parse_workers)
+    return time.perf_counter() - start, len(products)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsing di process pool.")
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--backend", default="bs4", help="Backend parser: bs4 atau lxml.")
+    parser.add_argument("--max-workers", type=int, default=16, help="Jumlah thread fetch.")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count()}),
+                        help="Variasi jumlah proses parser.")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    extract.PARSER_BACKEND = args.backend
+    with StubServer(pages=args.pages) as server:
+        extract.BASE_URL = server.base_url
+        baseline, products = scrape_seconds(args.pages, args.max_workers, 0)
+        print(f"{'parse_workers':>13} {'seconds':>8} {'pages/s':>8} {'speedup':>8}")
+        print(f"{'0 (threads)':>13} {baseline:>8.2f} {args.pages / baseline:>8.0f} {1:>7.1f}x")
+        for workers in args.workers:
+            seconds, pooled = scrape_seconds(args.pages, args.max_workers, workers)
+            assert pooled == products
+            print(f"{workers:>13} {seconds:>8.2f} {args.pages / seconds:>8.0f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Micro-benchmark CPU time per halaman untuk setiap backend parser.
+
+Jalankan dari root project:
+python -m benchmarks.bench_parsers --repeat 200
+"""
+import argparse
+import time
+from pathlib import Path
+from utils.parsers import PARSER_BACKENDS, available_backends
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def bench_backend(backend, pages, repeat):
+    """Mengembalikan rata-rata CPU time (detik) untuk mem-parse satu halaman."""
+    parse = PARSER_BACKENDS[backend]
+    start = time.process_time()
+    for _ in range(repeat):
+        for html in pages:
+            parse(html, "2025-05-22T10:00:00")
+    return (time.process_time() - start) / (repeat * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend parser HTML.")
+    parser.add_argument("--repeat", type=int, default=100, help="Jumlah pengulangan per halaman fixture.")
+    args = parser.parse_args()
+
+    pages = [path.read_text(encoding="utf-8") for path in sorted(FIXTURE_DIR.glob("*.html"))]
+    results = {backend: bench_backend(backend, pages, args.repeat) for backend in available_backends()}
+
+    baseline = results["bs4"]
+    print(f"{'backend':<8} {'cpu ms/page':>12} {'speedup':>8}")
+    for backend, seconds in results.items():
+        print(f"{backend:<8} {seconds * 1000:>12.3f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
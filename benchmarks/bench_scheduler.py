@@ -0,0 +1,102 @@
+"""
+Membandingkan biaya per run: run one-shot (proses Python baru setiap run, seperti cron) dengan
+run di daemon `--schedule` yang memakai ulang import, session HTTP dan sink.
+
+Kedua mode men-scrape StubServer lokal dan memuat ke sink CSV (ditambah PostgreSQL jika
+BENCH_DATABASE_URL diisi, untuk mengukur engine dan connection pool yang tetap hangat).
+
+Jalankan dari root project:
+python -m benchmarks.bench_scheduler --runs 5 --pages 10
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.bench_import import PROJECT_ROOT
+from benchmarks.stub_server import StubServer
+
+# Kode satu run one-shot: import main lalu satu run_batch, mencetak waktu kerja run_batch
+ONE_SHOT_CODE = """
+import json, logging, sys, time
+import main, utils.extract as extract
+logging.disable(logging.CRITICAL)
+extract.BASE_URL, options = sys.argv[1], json.loads(sys.argv[2])
+main.SINK_OPTIONS = options
+work_start = time.perf_counter()
+main.run_batch(list(options))
+print(json.dumps({"work": time.perf_counter() - work_start}))
+"""
+
+
+def sink_options(directory):
+    """Sink yang diukur: CSV, ditambah PostgreSQL jika BENCH_DATABASE_URL tersedia."""
+    options = {"csv": {"filename": os.path.join(directory, "products.csv")}}
+    database_url = os.getenv("BENCH_DATABASE_URL")
+    if database_url:
+        options["postgres"] = {"table_name": "products_bench_scheduler", "database_url": database_url}
+    return options
+
+
+def one_shot_runs(base_url, options, runs):
+    """Wall time dan waktu kerja (run_batch) setiap run one-shot di proses baru."""
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-c", ONE_SHOT_CODE, base_url, json.dumps(options)],
+                                   cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - start
+        results.append((wall, json.loads(completed.stdout.strip().splitlines()[-1])["work"]))
+    return results
+
+
+def warm_runs(base_url, options, runs):
+    """Wall time setiap run di proses yang sama dengan sink yang dipakai ulang (seperti `run_scheduler`)."""
+    import main
+    import utils.extract as extract
+    from utils.sinks import create_sinks, close_sinks
+
+    extract.BASE_URL = base_url
+    main.SINK_OPTIONS = options
+    sinks = {sink.name: sink for sink in create_sinks(list(options), options)}
+    results = []
+    try:
+        for _ in range(runs):
+            for sink in sinks.values():
+                sink.reset()
+            start = time.perf_counter()
+            main.run_batch(list(options), sinks=sinks)
+            results.append(time.perf_counter() - start)
+    finally:
+        close_sinks(list(sinks.values()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark run one-shot vs daemon terjadwal.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory, StubServer(pages=args.pages, latency=args.latency) as server:
+        options = sink_options(directory)
+        cold = one_shot_runs(server.base_url, options, args.runs)
+        warm = warm_runs(server.base_url, options, args.runs)
+
+    cold_wall = sorted(wall for wall, _ in cold)[len(cold) // 2]
+    cold_work = sorted(work for _, work in cold)[len(cold) // 2]
+    # Run warm pertama masih membayar koneksi dan schema check; median mewakili run berikutnya
+    warm_wall = sorted(warm)[len(warm) // 2]
+    print(f"sinks: {', '.join(options)}  pages: {args.pages}  runs: {args.runs}")
+    print(f"{'mode':>10} {'median run s':>13} {'overhead s':>11}")
+    print(f"{'one-shot':>10} {cold_wall:>13.3f} {cold_wall - cold_work:>11.3f}  (run_batch {cold_work:.3f})")
+    print(f"{'daemon':>10} {warm_wall:>13.3f} {'-':>11}  (pertama {warm[0]:.3f})")
+
+
+if __name__ == "__main__":
+    main()
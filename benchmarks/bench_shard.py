@@ -0,0 +1,50 @@
+"""
+Membandingkan scraping satu proses (`scrape_all_pages`) dengan scraping ter-shard di beberapa
+proses worker (`scrape_sharded`) terhadap server lokal.
+
+Setiap worker men-scrape shard-nya dengan `--max-workers` thread dan mem-parse HTML di prosesnya
+sendiri, sehingga fetch dan parsing ikut paralel di banyak core. Waktu shard sudah termasuk
+start proses worker dan penggabungan hasil per shard.
+
+Jalankan dari root project:
+python -m benchmarks.bench_shard --pages 200 --latency 0.05 --workers 1 2 4
+"""
+import argparse
+import logging
+import os
+import time
+import utils.extract as extract
+from benchmarks.stub_server import StubServer
+from utils.workqueue import scrape_sharded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraping ter-shard di beberapa proses.")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--max-workers", type=int, default=8, help="Jumlah thread fetch per proses.")
+    parser.add_argument("--shard-pages", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count()}),
+                        help="Variasi jumlah proses worker.")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    with StubServer(pages=args.pages, latency=args.latency) as server:
+        extract.BASE_URL = server.base_url
+        start = time.perf_counter()
+        products = extract.scrape_all_pages(max_pages=args.pages + 1, max_workers=args.max_workers)
+        baseline = time.perf_counter() - start
+        print(f"cpu: {os.cpu_count()}  pages: {args.pages}  latency: {args.latency}s  shard pages: {args.shard_pages}")
+        print(f"{'workers':>13} {'seconds':>8} {'pages/s':>8} {'speedup':>8}")
+        print(f"{'1 (no queue)':>13} {baseline:>8.2f} {args.pages / baseline:>8.0f} {1:>7.1f}x")
+        for workers in args.workers:
+            start = time.perf_counter()
+            sharded = scrape_sharded(max_pages=args.pages + 1, workers=workers, shard_pages=args.shard_pages,
+                                     max_workers=args.max_workers)
+            seconds = time.perf_counter() - start
+            assert len(sharded) == len(products)
+            print(f"{workers:>13} {seconds:>8.2f} {args.pages / seconds:>8.0f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Membandingkan engine `clean_and_transform` ('pandas' versi awal vs 'fast') pada data sintetis:
+memastikan hasilnya identik lalu melaporkan waktu dan speedup.
+
+Jalankan dari root project:
+python -m benchmarks.bench_transform --rows 1000 100000 1000000
+"""
+import argparse
+import logging
+import time
+import pandas as pd
+from benchmarks.synthetic import make_raw_catalogue
+from utils.transform import clean_and_transform
+
+
+def time_engine(raw_data, engine, repeat):
+    """Mengembalikan (waktu terbaik dalam detik, DataFrame hasil) untuk sebuah engine."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = clean_and_transform(raw_data, engine=engine)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark engine clean_and_transform.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"{'rows':>10} {'pandas s':>10} {'fast s':>10} {'speedup':>8}")
+    for rows in args.rows:
+        raw_data = make_raw_catalogue(rows)
+        pandas_time, expected = time_engine(raw_data, "pandas", args.repeat)
+        fast_time, actual = time_engine(raw_data, "fast", args.repeat)
+        pd.testing.assert_frame_equal(actual, expected)
+        print(f"{rows:>10} {pandas_time:>10.3f} {fast_time:>10.3f} {pandas_time / fast_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
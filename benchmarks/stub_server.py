@@ -0,0 +1,168 @@
+"""
+Server HTTP lokal pengganti fashion-studio untuk benchmark (dan test) scraping.
+
+Setiap halaman 1..`pages` mengembalikan HTML fixture `tests/fixtures/fashion_studio_page.html`
+(atau HTML lain yang diberikan), halaman setelahnya 404 seperti situs asli.
+
+Contoh:
+with StubServer(pages=50, latency=0.01) as server:
+    monkeypatch / set utils.extract.BASE_URL = server.base_url
+"""
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURE_PAGE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "fashion_studio_page.html"
+
+
+class _Server(ThreadingHTTPServer):
+    # Antrian koneksi default (5) terlalu kecil untuk puluhan worker bersamaan
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubServer:
+    """
+    Server HTTP lokal di thread terpisah dengan jumlah halaman dan latensi yang bisa diatur.
+
+    Parameters:
+    pages (int)    : Jumlah halaman yang tersedia. Default = 50.
+    latency (float): Jeda (detik) sebelum setiap respons, meniru latensi jaringan. Default = 0.
+    html (str)     : Isi setiap halaman. Default = HTML fixture fashion-studio.
+    """
+
+    def __init__(self, pages: int = 50, latency: float = 0.0, html: str = None):
+        self.pages = pages
+        self.latency = latency
+        self.body = (html if html is not None else FIXTURE_PAGE.read_text(encoding="utf-8")).encode("utf-8")
+        self.hits = []
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.strip("/")
+                page = 1 if not path else int(path.replace("page", ""))
+                stub.hits.append(page)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if page > stub.pages:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(stub.body)))
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Menjalankan server di port acak pada 127.0.0.1."""
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Menghentikan server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class AsyncStubServer(StubServer):
+    """
+    Varian asyncio (aiohttp.web) dari `StubServer`, berjalan di event loop sendiri pada thread terpisah.
+    Latensi disimulasikan dengan `asyncio.sleep`, sehingga ratusan request bisa menunggu bersamaan
+    tanpa dibatasi jumlah thread server.
+
+    Selain `hits`, server mencatat `max_active`: jumlah request terbanyak yang ditangani bersamaan.
+
+    Parameters:
+    pages (int)       : Jumlah halaman yang tersedia. Default = 50.
+    latency (float)   : Jeda (detik) sebelum setiap respons. Default = 0.
+    html (str)        : Isi setiap halaman. Default = HTML fixture fashion-studio.
+    fail_first (dict) : Status error yang dikirim dulu per halaman, misal {2: [503, 503]}.
+    """
+
+    def __init__(self, pages: int = 50, latency: float = 0.0, html: str = None, fail_first: dict = None):
+        super().__init__(pages=pages, latency=latency, html=html)
+        self.fail_first = {page: list(statuses) for page, statuses in (fail_first or {}).items()}
+        self.active = 0
+        self.max_active = 0
+        self._loop = None
+        self._runner = None
+        self._port = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._port}/"
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        path = request.path.strip("/")
+        page = 1 if not path else int(path.replace("page", ""))
+        self.hits.append(page)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.fail_first.get(page):
+                return web.Response(status=self.fail_first[page].pop(0))
+            if page > self.pages:
+                return web.Response(status=404)
+            return web.Response(body=self.body, content_type="text/html", charset="utf-8")
+        finally:
+            self.active -= 1
+
+    async def _start(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0, backlog=1024)
+        await site.start()
+        self._port = site._server.sockets[0].getsockname()[1]
+
+    def start(self):
+        """Menjalankan server di port acak pada 127.0.0.1."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def stop(self):
+        """Menghentikan server dan event loop-nya."""
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
@@ -0,0 +1,358 @@
+"""
+Suite benchmark yang dapat direproduksi untuk seluruh pipeline, tanpa akses jaringan atau layanan eksternal.
+
+Kasus yang diukur:
+- startup/<module>           : waktu import modul di proses baru (`python -X importtime`)
+- parse/<backend>            : parsing HTML fixture per halaman untuk setiap backend parser
+- scrape/stub                : scrape_all_pages terhadap server HTTP lokal (benchmarks.stub_server)
+- transform/<engine>/<rows>  : clean_and_transform pada katalog sintetis
+- load/<sink>/<rows>         : save_to_csv (file sementara), Parquet, GoogleSheetsLoader dengan
+                               FakeSheetsService, PostgresLoader mode 'insert' ke SQLite lokal, dan
+                               mode 'bulk' ke PostgreSQL lokal jika BENCH_DATABASE_URL di-set
+
+Hasil disimpan sebagai baseline JSON (waktu terbaik dari beberapa pengulangan + info environment),
+lalu dua baseline dapat dibandingkan; `compare` keluar dengan status 1 jika ada regresi.
+
+Jalankan dari root project:
+python -m benchmarks.suite run --sizes 1000 100000 1000000 --output benchmarks/results/baseline.json
+python -m benchmarks.suite compare benchmarks/results/baseline.json benchmarks/results/current.json --threshold 0.2
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import create_engine, text
+import utils.extract as extract
+from benchmarks.bench_import import import_seconds
+from benchmarks.stub_server import StubServer
+from benchmarks.synthetic import make_raw_catalogue
+from tests.fake_sheets import FakeSheetsService
+from utils.load import GoogleSheetsLoader, PostgresLoader, save_to_csv, save_to_parquet
+from utils.parsers import PARSER_BACKENDS, available_backends
+from utils.transform import clean_and_transform, TRANSFORM_ENGINES
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow opsional, hanya dibutuhkan kasus load/parquet
+    pa = None
+
+FIXTURE_DIR   = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+RESULTS_DIR   = Path(__file__).resolve().parent / "results"
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+BENCH_TABLE   = "products_bench_suite"
+
+# SQLite membatasi jumlah parameter per statement (32766), jadi mode 'insert' dimuat per chunk
+SQLITE_CHUNK_ROWS = 4_000
+
+# Modul yang diukur waktu import-nya: entry point CLI dan modul yang di-import cron / service
+STARTUP_MODULES = ("main", "utils.sinks")
+
+# Kasus di bawah durasi ini didominasi noise dan tidak dianggap regresi
+NOISE_FLOOR_SECONDS = 0.02
+
+
+def best_of(func, repeat):
+    """
+    Menjalankan `func` sebanyak `repeat` kali dan mengembalikan waktu wall terbaik (detik).
+    Waktu terbaik dipakai karena paling sedikit terganggu proses lain di mesin yang sama.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _result(seconds, rows=None, **extra):
+    result = {"seconds": seconds, "rows": rows}
+    if rows:
+        result["rows_per_second"] = rows / seconds if seconds else None
+    result.update(extra)
+    return result
+
+
+def selected(case, cases):
+    """True jika `case` cocok dengan salah satu prefix di `cases` (None = semua kasus)."""
+    return not cases or any(case.startswith(prefix) for prefix in cases)
+
+
+def bench_startup(repeat, cases=None):
+    """Waktu import terbaik setiap modul di `STARTUP_MODULES`, masing-masing di proses Python baru."""
+    results = {}
+    for module in STARTUP_MODULES:
+        case = f"startup/{module}"
+        if selected(case, cases):
+            results[case] = _result(import_seconds(module, repeat))
+    return results
+
+
+def bench_parse(repeat, cases=None):
+    """Waktu parsing per halaman fixture untuk setiap backend parser."""
+    pages = [path.read_text(encoding="utf-8") for path in sorted(FIXTURE_DIR.glob("*.html"))]
+    results = {}
+    for backend in available_backends():
+        if not selected(f"parse/{backend}", cases):
+            continue
+        parse = PARSER_BACKENDS[backend]
+        seconds = best_of(lambda: [parse(html, "2025-05-22T10:00:00") for html in pages], repeat)
+        results[f"parse/{backend}"] = _result(seconds / len(pages), unit="seconds per page")
+    return results
+
+
+def bench_scrape(pages, workers, latency, repeat, cases=None):
+    """scrape_all_pages terhadap server lokal dengan `pages` halaman dan latensi `latency` detik."""
+    if not selected("scrape/stub", cases):
+        return {}
+    original_url = extract.BASE_URL
+    with StubServer(pages=pages, latency=latency) as server:
+        extract.BASE_URL = server.base_url
+        try:
+            products = []
+            seconds = best_of(lambda: products.append(len(extract.scrape_all_pages(
+                max_pages=pages + 1, max_workers=workers))), repeat)
+        finally:
+            extract.BASE_URL = original_url
+    return {"scrape/stub": _result(seconds, products[-1], pages=pages, workers=workers, latency=latency)}
+
+
+def bench_transform(raw, repeat, cases=None):
+    """clean_and_transform untuk setiap engine pada katalog mentah yang sama."""
+    results = {}
+    for engine in TRANSFORM_ENGINES:
+        case = f"transform/{engine}/{len(raw)}"
+        if selected(case, cases):
+            results[case] = _result(best_of(lambda: clean_and_transform(raw, engine=engine), repeat), len(raw))
+    return results
+
+
+def _load_sqlite(df, directory, attempt):
+    """Memuat `df` ke file SQLite baru lewat PostgresLoader mode 'insert' (per chunk)."""
+    path = os.path.join(directory, f"bench-{attempt}.sqlite")
+    with PostgresLoader(BENCH_TABLE, mode="insert", database_url=f"sqlite:///{path}") as loader:
+        for start in range(0, len(df), SQLITE_CHUNK_ROWS):
+            loader.load(df.iloc[start:start + SQLITE_CHUNK_ROWS])
+
+
+def _load_postgres(df, database_url):
+    """Memuat `df` ke tabel kosong di PostgreSQL lokal lewat PostgresLoader mode 'bulk'."""
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text(f'DROP TABLE IF EXISTS "{BENCH_TABLE}"'))
+    engine.dispose()
+    with PostgresLoader(BENCH_TABLE, mode="bulk", database_url=database_url) as loader:
+        loader.load(df)
+
+
+def bench_loaders(df, size, repeat, database_url=None, cases=None):
+    """
+    Setiap loader terhadap pengganti lokalnya; file/tabel dibuat ulang di setiap pengulangan.
+    Nama kasus memakai ukuran katalog mentah (`size`), jumlah baris bersih dicatat di 'rows'.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        attempts = itertools.count()
+        loaders = {
+            "csv": lambda: save_to_csv(df, os.path.join(directory, "products.csv")),
+            "parquet": lambda: save_to_parquet(df, os.path.join(directory, f"parquet-{next(attempts)}")),
+            "google_sheets_fake": lambda: GoogleSheetsLoader(
+                "bench", "Sheet1!A2", service=FakeSheetsService()).load(df),
+            "sqlite_insert": lambda: _load_sqlite(df, directory, next(attempts)),
+            "postgres_bulk": lambda: _load_postgres(df, database_url),
+        }
+        if pa is None:
+            del loaders["parquet"]
+        if not database_url:
+            del loaders["postgres_bulk"]
+
+        results = {}
+        for name, load in loaders.items():
+            case = f"load/{name}/{size}"
+            if selected(case, cases):
+                results[case] = _result(best_of(load, repeat), len(df))
+    return results
+
+
+def environment() -> dict:
+    """Info environment yang memengaruhi hasil benchmark."""
+    import bs4
+    import pandas
+    import sqlalchemy
+    versions = {"python": platform.python_version(), "pandas": pandas.__version__, "bs4": bs4.__version__,
+                "sqlalchemy": sqlalchemy.__version__, "pyarrow": pa.__version__ if pa is not None else None}
+    try:
+        import lxml.etree
+        versions["lxml"] = ".".join(map(str, lxml.etree.LXML_VERSION))
+    except ImportError:
+        versions["lxml"] = None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"platform": platform.platform(), "machine": platform.machine(), "cpu_count": os.cpu_count(),
+            "git_commit": commit, "versions": versions}
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=3, pages=100, workers=8, latency=0.005, database_url=None,
+              seed=42, cases=None) -> dict:
+    """
+    Menjalankan semua kasus benchmark.
+
+    Parameters:
+    sizes (iterable)  : Jumlah produk katalog sintetis untuk kasus transform dan load.
+    repeat (int)      : Jumlah pengulangan per kasus; waktu terbaik yang dicatat. Default = 3.
+    pages (int)       : Jumlah halaman server lokal untuk kasus scrape. Default = 100.
+    workers (int)     : max_workers untuk scrape_all_pages. Default = 8.
+    latency (float)   : Latensi server lokal per respons (detik). Default = 0.005.
+    database_url (str): URL PostgreSQL lokal untuk kasus 'load/postgres_bulk'. None = dilewati.
+    seed (int)        : Seed katalog sintetis. Default = 42.
+    cases (list)      : Prefix nama kasus yang dijalankan, misal ['transform', 'load/csv']. None = semua.
+
+    Returns:
+    dict: Baseline berisi config, environment dan hasil per kasus.
+    """
+    # Log pipeline (termasuk 404 halaman terakhir) hanya mengganggu output dan waktu benchmark
+    logging.disable(logging.ERROR)
+    try:
+        results = {}
+        results.update(bench_startup(repeat, cases))
+        results.update(bench_parse(repeat, cases))
+        results.update(bench_scrape(pages, workers, latency, repeat, cases))
+        # Katalog sintetis hanya dibuat jika ada kasus transform/load yang dipilih
+        needs_catalogue = not cases or any(
+            prefix.startswith(("transform", "load")) or "transform".startswith(prefix) or "load".startswith(prefix)
+            for prefix in cases)
+        for size in sizes if needs_catalogue else ():
+            raw = make_raw_catalogue(size, seed=seed)
+            results.update(bench_transform(raw, repeat, cases))
+            results.update(bench_loaders(clean_and_transform(raw), size, repeat, database_url, cases))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "config": {"sizes": list(sizes), "repeat": repeat, "pages": pages, "workers": workers,
+                   "latency": latency, "seed": seed, "postgres": bool(database_url), "cases": cases},
+        "environment": environment(),
+        "results": results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.2,
+                    noise_floor: float = NOISE_FLOOR_SECONDS) -> list:
+    """
+    Membandingkan dua baseline per kasus.
+
+    Parameters:
+    baseline (dict)    : Hasil `run_suite` sebagai acuan.
+    current (dict)     : Hasil `run_suite` yang dibandingkan.
+    threshold (float)  : Batas kenaikan waktu relatif sebelum dianggap regresi. Default = 0.2 (20%).
+    noise_floor (float): Kasus yang di kedua sisi lebih cepat dari ini tidak pernah dianggap regresi.
+
+    Returns:
+    list: Dictionary per kasus {case, baseline, current, ratio, status}; status salah satu dari
+          'ok', 'regression', 'improved', 'missing' atau 'new'.
+    """
+    old, new = baseline["results"], current["results"]
+    rows = []
+    for case in sorted(set(old) | set(new)):
+        if case not in new or case not in old:
+            rows.append({"case": case, "baseline": old.get(case, {}).get("seconds"),
+                         "current": new.get(case, {}).get("seconds"), "ratio": None,
+                         "status": "missing" if case not in new else "new"})
+            continue
+        before, after = old[case]["seconds"], new[case]["seconds"]
+        ratio = after / before if before else float("inf")
+        if max(before, after) < noise_floor:
+            status = "ok"
+        elif ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"case": case, "baseline": before, "current": after, "ratio": ratio, "status": status})
+    return rows
+
+
+def _format_seconds(seconds):
+    return "-" if seconds is None else f"{seconds:.4f}"
+
+
+def print_comparison(rows):
+    """Mencetak tabel hasil `compare_results`."""
+    width = max([len(row["case"]) for row in rows] + [4])
+    print(f"{'case':<{width}} {'baseline':>10} {'current':>10} {'ratio':>7}  status")
+    for row in rows:
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}x"
+        print(f"{row['case']:<{width}} {_format_seconds(row['baseline']):>10} "
+              f"{_format_seconds(row['current']):>10} {ratio:>7}  {row['status']}")
+
+
+def print_results(report):
+    """Mencetak tabel hasil `run_suite`."""
+    width = max(len(case) for case in report["results"])
+    print(f"{'case':<{width}} {'seconds':>10} {'rows/s':>12}")
+    for case, result in report["results"].items():
+        rate = result.get("rows_per_second")
+        print(f"{case:<{width}} {result['seconds']:>10.4f} {'-' if not rate else f'{rate:,.0f}':>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite benchmark pipeline ETL dengan baseline JSON.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Menjalankan semua benchmark dan menyimpan baseline JSON.")
+    run.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--pages", type=int, default=100, help="Jumlah halaman server lokal untuk kasus scrape.")
+    run.add_argument("--workers", type=int, default=8)
+    run.add_argument("--latency", type=float, default=0.005)
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--cases", nargs="+", default=None,
+                     help="Prefix nama kasus yang dijalankan, misal: transform load/csv. Default = semua.")
+    run.add_argument("--output", default=None,
+                     help="Lokasi file JSON. Default = benchmarks/results/<waktu>.json")
+
+    compare = commands.add_parser("compare", help="Membandingkan dua baseline dan menandai regresi.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.2,
+                         help="Kenaikan waktu relatif yang dianggap regresi. Default = 0.2 (20%%).")
+    compare.add_argument("--noise-floor", type=float, default=NOISE_FLOOR_SECONDS)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.sizes, args.repeat, args.pages, args.workers, args.latency,
+                           os.getenv("BENCH_DATABASE_URL"), args.seed, args.cases)
+        output = Path(args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%dT%H%M%S')}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print_results(report)
+        print(f"\nBaseline disimpan ke {output}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.threshold, args.noise_floor)
+    print_comparison(rows)
+    regressions = [row["case"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} kasus melambat lebih dari {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Generator katalog sintetis untuk benchmark dan test kesetaraan.
+
+Data yang dihasilkan meniru keluaran `scrape_page`, termasuk baris invalid
+(Unknown Product, Price Unavailable, Not Rated, nilai null) dan duplikat.
+"""
+import random
+
+PRODUCT_TYPES = ["T-shirt", "Hoodie", "Pants", "Outerwear", "Jacket", "Shoes", "Sweater", "Dress"]
+SIZES         = ["S", "M", "L", "XL", "XXL"]
+GENDERS       = ["Men", "Women", "Unisex"]
+
+
+def make_raw_product(rng, index, timestamp):
+    """Membuat satu produk mentah seperti hasil scraping, sesekali invalid."""
+    roll = rng.random()
+    product = {
+        "title": f"{rng.choice(PRODUCT_TYPES)} {index}",
+        "price": f"${rng.uniform(10, 500):.2f}",
+        "rating": f"Rating: ⭐ {rng.uniform(1, 5):.1f} / 5",
+        "colors": f"{rng.randint(1, 8)} Colors",
+        "size": f"Size: {rng.choice(SIZES)}",
+        "gender": f"Gender: {rng.choice(GENDERS)}",
+        "timestamp": timestamp
+    }
+    if roll < 0.02:
+        product["title"] = "Unknown Product"
+        product["price"] = "Price Unavailable"
+        product["rating"] = "Rating: ⭐ Invalid Rating / 5"
+    elif roll < 0.03:
+        product["rating"] = "Not Rated"
+    elif roll < 0.04:
+        product["rating"] = "Invalid Rating / 5"
+    elif roll < 0.05:
+        product["price"] = "Price Unavailable"
+    elif roll < 0.06:
+        product[rng.choice(list(product))] = None
+    return product
+
+
+def make_raw_catalogue(n, seed=42, products_per_page=20, duplicate_rate=0.02):
+    """
+    Membuat `n` produk mentah; setiap halaman berbagi satu timestamp seperti scraping asli.
+
+    Parameters:
+    n (int)               : Jumlah produk.
+    seed (int)            : Seed random agar hasil dapat direproduksi.
+    products_per_page (int): Jumlah produk per halaman (per timestamp).
+    duplicate_rate (float): Peluang sebuah produk adalah salinan produk sebelumnya di halaman yang sama.
+
+    Returns:
+    list: List of dictionary produk mentah.
+    """
+    rng = random.Random(seed)
+    products = []
+    for index in range(n):
+        page = index // products_per_page
+        timestamp = f"2025-05-22T10:{page // 60 % 60:02d}:{page % 60:02d}.000000"
+        page_start = page * products_per_page
+        if index > page_start and rng.random() < duplicate_rate:
+            products.append(dict(products[rng.randrange(page_start, index)]))
+        else:
+            products.append(make_raw_product(rng, index, timestamp))
+    return products
@@ -1,16 +1,103 @@
+import argparse
+import functools
+import itertools
 import logging
+import os
+import signal
 import pandas as pd
-from utils.extract import scrape_all_pages
+from utils.extract import scrape_all_pages, iter_product_chunks, enable_page_cache, create_parse_pool
 from utils.transform import clean_and_transform
-from utils.load import save_to_csv, save_to_google_sheets, save_to_postgres
+from utils.validation import load_rules
+from utils.load import save_to_csv, NATURAL_KEY, SITE_KEY
+from utils.dedup import DedupIndex
+from utils.sinks import SINKS, create_sinks, run_sinks, close_sinks
+from utils.cdc import ChangeStore
+from utils.metrics import PipelineMetrics, profile_run
+from utils.checkpoint import RunCheckpoint
 
 # Konfigurasi logging global
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-if __name__ == "__main__":
+CLEAN_PATH      = "products.csv"
+PARQUET_PATH    = "products_parquet"
+SPREADSHEET_ID  = '1e_gNgqKhynGGdQGJNsT48YoTroUaQRzWwMRE0AmYo7U'
+RANGE_NAME      = 'Sheet1!A2:J'
+CREDS_PATH      = 'google-sheets-api.json'
+CDC_STATE_PATH  = '.cache/cdc_state.sqlite'
+SCRAPE_OPTIONS  = {"max_workers": 8, "rate_limit": 10}
+EXTRACT_ENGINE  = "threads"
+SITES           = None  # Daftar SiteConfig untuk scraping multi-situs; None = fashion-studio saja
+RULES           = None  # RuleSet validasi baris (lihat utils/validation.py); None = aturan bawaan
+QUARANTINE_PATH = None  # File CSV untuk baris yang dibuang aturan validasi; None = tidak disimpan
+DEDUP_INDEX_PATH = None  # File indeks dedup lintas run (lihat utils/dedup.py); None = dedup per run saja
+SHARD_OPTIONS   = None  # {"workers": N, "shard_pages": K}: scraping dibagi ke N proses (lihat utils/workqueue.py)
+SINK_OPTIONS    = {
+    "csv": {"filename": CLEAN_PATH},
+    "parquet": {"root_path": PARQUET_PATH},
+    "google_sheets": {"spreadsheet_id": SPREADSHEET_ID, "range_name": RANGE_NAME, "creds_json_path": CREDS_PATH},
+    "postgres": {"table_name": "products", "mode": "bulk"},
+}
+
+
+def run_batch(sink_names, compact=False, incremental=False, metrics=None, checkpoint=None, sinks=None):
+    """
+    Menjalankan pipeline ETL: seluruh katalog di-scrape dulu, lalu ditransformasi dan dimuat sekaligus.
+
+    Dengan `checkpoint`, halaman mentah, DataFrame hasil transformasi dan sink yang sudah commit
+    disimpan ke disk. Jika run yang sama dijalankan lagi (resume), step yang sudah selesai dilewati:
+    halaman tersimpan tidak di-download ulang dan sink yang sudah commit tidak ditulis ulang.
+
+    Parameters:
+    sink_names (list): Nama sink tujuan load (lihat `utils.sinks.SINKS`).
+    compact (bool)   : Pakai skema tipe data ringkas untuk DataFrame hasil transformasi.
+    incremental (bool): Hanya muat produk baru, berubah dan hilang sejak run terakhir.
+    metrics (PipelineMetrics): Pencatat metrik per stage. Default = pencatat baru.
+    checkpoint (RunCheckpoint): Checkpoint run ini. None = tanpa checkpoint.
+    sinks (dict)     : Opsional. Sink yang sudah dibuat per nama dan dipakai ulang antar run (mode
+                       scheduler); tidak ditutup di sini. Default = sink baru yang ditutup setelah load.
+
+    Returns:
+    list: Hasil per sink (sink, rows, seconds, error), kosong jika tidak ada data yang dimuat.
+    """
+    metrics = metrics if metrics is not None else PipelineMetrics()
+    warm_sinks = sinks
+    history = DedupIndex(DEDUP_INDEX_PATH) if DEDUP_INDEX_PATH else None
+
     # Step 1: Extract
-    logging.info("Mulai proses scraping data...")
-    data = scrape_all_pages()
+    if checkpoint is not None and checkpoint.is_done("extract"):
+        logging.info(f"Melanjutkan run {checkpoint.run_id}: memakai halaman mentah dari checkpoint.")
+        data = checkpoint.raw_products()
+    else:
+        logging.info("Mulai proses scraping data...")
+        page_stats = []
+        resume_options = {}
+        if checkpoint is not None:
+            done_pages = checkpoint.pages_by_source() if SITES else checkpoint.pages()
+            resume_options = {"done_pages": done_pages, "on_page": checkpoint.save_page}
+            done_count = sum(map(len, done_pages.values())) if SITES else len(done_pages)
+            if done_count:
+                logging.info(f"Melanjutkan run {checkpoint.run_id}: {done_count} halaman sudah ada di checkpoint.")
+        if SITES:
+            from utils.sites import scrape_sites
+            scrape = functools.partial(scrape_sites, SITES)
+        elif SHARD_OPTIONS:
+            from utils.workqueue import scrape_sharded
+            # Antrian shard disimpan di checkpoint: resume hanya mengambil shard yang belum selesai
+            directory = os.path.join(checkpoint.directory, "shards") if checkpoint is not None else None
+            scrape = functools.partial(scrape_sharded, directory=directory, **SHARD_OPTIONS)
+            resume_options.pop("done_pages", None)
+        elif EXTRACT_ENGINE == "async":
+            # aiohttp hanya dimuat jika engine asyncio dipilih
+            from utils.extract_async import scrape_all_pages_sync as scrape
+        else:
+            scrape = scrape_all_pages
+        with metrics.stage("extract") as record:
+            data = scrape(stats=page_stats, **SCRAPE_OPTIONS, **resume_options)
+            record["rows_out"] = len(data)
+            record["bytes"] = sum(page.get("bytes", 0) for page in page_stats)
+        metrics.add_pages(page_stats)
+        if checkpoint is not None and data:
+            checkpoint.mark_done("extract")
     df_raw = pd.DataFrame(data)
 
     if df_raw.empty:
@@ -21,38 +108,439 @@ if __name__ == "__main__":
         # Step 2: Transform
         logging.info("Mulai membersihkan dan mentransformasi data...")
         try:
-            df_clean = clean_and_transform(data)
+            if checkpoint is not None and checkpoint.is_done("transform"):
+                logging.info(f"Melanjutkan run {checkpoint.run_id}: memakai hasil transformasi dari checkpoint.")
+                df_clean = checkpoint.load_frame()
+                if history is not None:
+                    # Produk hasil transform run sebelumnya belum tercatat di indeks (commit setelah load)
+                    history.add_frame(df_clean)
+            else:
+                transform_stats = {}
+                quarantine = [] if QUARANTINE_PATH else None
+                with metrics.stage("transform") as record:
+                    record["rows_in"] = len(data)
+                    df_clean = clean_and_transform(data, compact=compact, stats=transform_stats, rules=RULES,
+                                                   quarantine=quarantine, history=history)
+                    record["rows_out"] = len(df_clean)
+                metrics.add_transform_stats(transform_stats)
+                save_quarantine(quarantine)
+                if checkpoint is not None:
+                    checkpoint.save_frame(df_clean)
             logging.info("Dataset berhasil dibersihkan dan ditransformasi.")
         except Exception as e:
             logging.error(f"Terjadi kesalahan saat transformasi data: {e}")
         else:
-            # Step 3a: Load ke CSV
-            clean_path = "products.csv"
-            logging.info("Menyimpan data ke file CSV...")
+            # Step 3: Load ke semua sink secara paralel (kecuali yang sudah commit di checkpoint)
+            committed = checkpoint.committed_sinks() if checkpoint is not None else {}
+            pending = [name for name in sink_names if name not in committed]
+            if committed:
+                logging.info(f"Sink yang sudah commit dan dilewati: {', '.join(committed)}")
+            logging.info(f"Menyimpan data ke: {', '.join(pending) or '-'}...")
+            if warm_sinks is None:
+                sinks = create_sinks(pending, SINK_OPTIONS)
+            else:
+                sinks = [warm_sinks[name] for name in pending]
             try:
-                save_to_csv(df_clean, clean_path)
-                logging.info(f"Data berhasil disimpan ke: {clean_path}")
-            except Exception as e:
-                logging.error(f"Gagal menyimpan ke CSV: {e}")
-
-            # Step 3b: Load ke Google Sheets
-            logging.info("Menyimpan data ke Google Sheets...")
-            SPREADSHEET_ID  = '1e_gNgqKhynGGdQGJNsT48YoTroUaQRzWwMRE0AmYo7U'
-            RANGE_NAME      = 'Sheet1!A2:J'
-            CREDS_PATH      = 'google-sheets-api.json'
-            try:
-                save_to_google_sheets(df_clean, SPREADSHEET_ID, RANGE_NAME, CREDS_PATH)
-                logging.info("Data berhasil disimpan ke Google Sheets.")
-            except Exception as e:
-                logging.error(f"Gagal menyimpan ke Google Sheets: {e}")
+                with metrics.stage("load") as record:
+                    record["rows_in"] = len(df_clean)
+                    if not sinks:
+                        results = []
+                    elif incremental:
+                        results = load_changes(df_clean, sinks)
+                    else:
+                        results = run_sinks(df_clean, sinks)
+                    record["rows_out"] = sum(result["rows"] for result in results)
+                metrics.add_sink_results(results)
+            finally:
+                if warm_sinks is None:
+                    close_sinks(sinks)
+            if history is not None and all(result["error"] is None for result in results):
+                history.commit()
 
-            # Step 3c: Load ke PostgreSQL
-            logging.info("Menyimpan data ke database PostgreSQL...")
-            try:
-                save_to_postgres(
-                    df_clean,
-                    table_name='products'
-                )
-                logging.info("Data berhasil disimpan ke database PostgreSQL.")
-            except Exception as e:
-                logging.error(f"Gagal menyimpan ke PostgreSQL: {e}")
+            if checkpoint is not None:
+                if incremental and sinks and not results:
+                    # Tidak ada perubahan: semua sink dianggap sudah up to date
+                    results = [{"sink": name, "rows": 0, "seconds": 0.0, "error": None} for name in pending]
+                for result in results:
+                    if result["error"] is None:
+                        checkpoint.commit_sink(result["sink"], result["rows"])
+                if all(name in checkpoint.committed_sinks() for name in sink_names):
+                    checkpoint.mark_done("load")
+            return results
+    return []
+
+
+def save_quarantine(frames, append=False):
+    """
+    Menulis baris mentah yang dibuang aturan validasi (beserta kolom reject_rule) ke `QUARANTINE_PATH`
+    dalam satu kali tulis.
+
+    Parameters:
+    frames (list) : DataFrame karantina dari `clean_and_transform(quarantine=...)`. None = tidak ada karantina.
+    append (bool) : Tambahkan ke file yang sudah ada (mode streaming, setelah chunk pertama).
+
+    Returns:
+    int: Jumlah baris yang ditulis.
+    """
+    if not frames:
+        return 0
+    df_rejected = pd.concat(frames, ignore_index=True)
+    save_to_csv(df_rejected, QUARANTINE_PATH, append=append)
+    return len(df_rejected)
+
+
+def load_changes(df_clean, sinks):
+    """
+    Mode incremental: hanya mengirim insert, update dan tombstone ke semua sink.
+
+    State CDC baru disimpan setelah semua sink berhasil, sehingga run yang gagal
+    atau crash akan mengirim ulang perubahan yang sama pada run berikutnya.
+
+    Parameters:
+    df_clean (pd.DataFrame): Hasil transformasi lengkap dari run ini.
+    sinks (list)           : Instance Sink tujuan.
+
+    Returns:
+    list: Hasil per sink (sink, rows, seconds, error).
+    """
+    store = ChangeStore(CDC_STATE_PATH, key_columns=SITE_KEY if SITES else NATURAL_KEY)
+    try:
+        changes = store.diff(df_clean)
+        upserts = store.upserts(changes)
+        logging.info(
+            f"Perubahan sejak run terakhir: {len(changes['new'])} baru, {len(changes['changed'])} berubah, "
+            f"{len(changes['unchanged'])} tetap, {len(changes['deleted'])} hilang."
+        )
+        if upserts.empty and changes["deleted"].empty:
+            logging.info("Tidak ada perubahan yang perlu dimuat.")
+            return []
+
+        results = run_sinks(upserts, sinks, deleted=changes["deleted"])
+        if all(result["error"] is None for result in results):
+            store.commit(changes)
+        else:
+            logging.warning("State CDC tidak diperbarui karena ada sink yang gagal; perubahan dikirim ulang pada run berikutnya.")
+        return results
+    finally:
+        store.close()
+
+
+def run_stream(chunk_pages, sink_names, compact=False, metrics=None, sinks=None):
+    """
+    Menjalankan pipeline ETL per chunk: setiap chunk halaman langsung dibersihkan dan dimuat
+    ke semua tujuan selagi scraping halaman berikutnya masih berjalan.
+
+    Parameters:
+    chunk_pages (int): Jumlah halaman per chunk.
+    sink_names (list): Nama sink tujuan load (lihat `utils.sinks.SINKS`).
+    compact (bool)   : Pakai skema tipe data ringkas untuk setiap chunk.
+    metrics (PipelineMetrics): Pencatat metrik per stage dan per chunk. Default = pencatat baru.
+    sinks (dict)     : Opsional. Sink yang dipakai ulang antar run (lihat `run_batch`); tidak ditutup di sini.
+
+    Returns:
+    list: Total per sink (sink, rows, seconds, error) untuk seluruh chunk.
+    """
+    metrics = metrics if metrics is not None else PipelineMetrics()
+    logging.info(f"Mulai pipeline streaming dengan {chunk_pages} halaman per chunk...")
+    page_stats = []
+    if SITES:
+        from utils.sites import iter_site_chunks
+        raw_chunks = iter(iter_site_chunks(SITES, chunk_pages=chunk_pages, stats=page_stats, **SCRAPE_OPTIONS))
+    else:
+        raw_chunks = iter(iter_product_chunks(chunk_pages=chunk_pages, stats=page_stats, **SCRAPE_OPTIONS))
+    history = DedupIndex(DEDUP_INDEX_PATH) if DEDUP_INDEX_PATH else None
+    seen = set() if history is None else None
+    total_rows = 0
+    quarantined = 0
+
+    # Sink dibuat sekali sehingga koneksi / client dipakai ulang untuk semua chunk
+    warm_sinks = sinks
+    if warm_sinks is None:
+        sinks = create_sinks(sink_names, SINK_OPTIONS)
+    else:
+        sinks = [warm_sinks[name] for name in sink_names]
+    totals = {sink.name: {"sink": sink.name, "rows": 0, "seconds": 0.0, "error": None} for sink in sinks}
+    try:
+        for index in itertools.count(1):
+            with metrics.stage("extract", item=index) as record:
+                pages_before = len(page_stats)
+                raw_chunk = next(raw_chunks, None)
+                record["rows_out"] = len(raw_chunk or [])
+                record["bytes"] = sum(page.get("bytes", 0) for page in page_stats[pages_before:])
+            if raw_chunk is None:
+                break
+
+            transform_stats = {}
+            quarantine = [] if QUARANTINE_PATH else None
+            with metrics.stage("transform", item=index) as record:
+                record["rows_in"] = len(raw_chunk)
+                df_chunk = clean_and_transform(raw_chunk, seen=seen, compact=compact, stats=transform_stats,
+                                               rules=RULES, quarantine=quarantine, history=history)
+                record["rows_out"] = len(df_chunk)
+            metrics.add_transform_stats(transform_stats)
+            # Baris karantina chunk pertama menimpa file lama, chunk berikutnya ditambahkan
+            quarantined += save_quarantine(quarantine, append=quarantined > 0)
+            if df_chunk.empty:
+                continue
+
+            active = [sink for sink in sinks if totals[sink.name]["error"] is None]
+            with metrics.stage("load", item=index) as record:
+                record["rows_in"] = len(df_chunk)
+                results = run_sinks(df_chunk, active)
+                record["rows_out"] = sum(result["rows"] for result in results)
+            metrics.add_sink_results(results)
+            for result in results:
+                total = totals[result["sink"]]
+                total["rows"] += result["rows"]
+                total["seconds"] += result["seconds"]
+                if result["error"]:
+                    # Sink yang gagal dilewati untuk chunk berikutnya agar datanya tidak bolong di tengah
+                    total["error"] = f"Chunk {index}: {result['error']}"
+            total_rows += len(df_chunk)
+            logging.info(f"Chunk {index} selesai dimuat: {len(df_chunk)} baris")
+    finally:
+        if warm_sinks is None:
+            close_sinks(sinks)
+        metrics.add_pages(page_stats)
+
+    if history is not None and all(total["error"] is None for total in totals.values()):
+        history.commit()
+    if total_rows == 0:
+        logging.error("Scraping gagal atau tidak menghasilkan data. Proses dihentikan.")
+    else:
+        logging.info(f"Pipeline streaming selesai: {total_rows} baris dimuat.")
+    return list(totals.values())
+
+
+def run_pipeline(args, sink_names, checkpoint=None, sinks=None):
+    """
+    Satu run pipeline sesuai argumen CLI: stage dijalankan dengan pencatat metrik (dan profiler
+    jika diminta), lalu checkpoint dibersihkan dan laporan metrik ditulis.
+
+    Parameters:
+    args (argparse.Namespace): Argumen CLI.
+    sink_names (list)        : Nama sink tujuan load.
+    checkpoint (RunCheckpoint): Checkpoint run batch. None = tanpa checkpoint.
+    sinks (dict)             : Opsional. Sink yang dipakai ulang antar run (lihat `run_batch`).
+
+    Returns:
+    tuple: (PipelineMetrics, list hasil per sink).
+    """
+    metrics = PipelineMetrics(run_id=checkpoint.run_id if checkpoint is not None else args.run_id)
+    metrics_dir = args.metrics_dir or "."
+    cprofile_path = os.path.join(metrics_dir, f"{metrics.run_id}.prof") if args.profile else None
+    results = []
+    try:
+        with profile_run(metrics, cprofile_path=cprofile_path, trace_memory=args.trace_memory):
+            if args.stream:
+                results = run_stream(args.chunk_pages, sink_names, compact=args.compact, metrics=metrics, sinks=sinks)
+            else:
+                results = run_batch(sink_names, compact=args.compact, incremental=args.incremental, metrics=metrics,
+                                    checkpoint=checkpoint, sinks=sinks)
+    finally:
+        if checkpoint is not None:
+            if checkpoint.is_done("load"):
+                checkpoint.remove()
+            else:
+                checkpoint.close()
+                logging.warning(f"Run belum selesai. Lanjutkan dengan: python main.py --resume {checkpoint.run_id}")
+        metrics.finish()
+        metrics.log_summary()
+        if args.metrics_dir:
+            metrics.write_json(os.path.join(args.metrics_dir, f"{metrics.run_id}.json"))
+            metrics.write_prometheus(os.path.join(args.metrics_dir, "metrics.prom"))
+    return metrics, results
+
+
+def run_scheduler(schedule, args, sink_names):
+    """
+    Mode daemon: menjalankan `run_pipeline` berulang sesuai jadwal dalam satu proses.
+
+    Import, sink (engine dan connection pool PostgreSQL, client Google Sheets), session HTTP,
+    cache halaman dan process pool parser dibuat sekali dan dipakai ulang oleh setiap run,
+    sehingga biaya per run tinggal pekerjaan extract/transform/load itu sendiri. Run terjadwal
+    tidak memakai checkpoint; run yang gagal diulang pada jadwal berikutnya. Berhenti dengan
+    SIGINT / SIGTERM setelah run yang sedang berjalan selesai.
+
+    Parameters:
+    schedule         : Jadwal dari `utils.scheduler.parse_schedule`.
+    args (argparse.Namespace): Argumen CLI (jitter, lock_file, health_port, max_runs dan opsi run).
+    sink_names (list): Nama sink tujuan load.
+    """
+    from utils.scheduler import Scheduler, serve_health
+
+    sinks = {sink.name: sink for sink in create_sinks(sink_names, SINK_OPTIONS)}
+    parse_pool = None
+    # Process pool tidak bisa dibagi ke worker shard; setiap worker membuat pool parser sendiri
+    if SCRAPE_OPTIONS.get("parse_workers") and not SHARD_OPTIONS:
+        parse_pool = create_parse_pool(SCRAPE_OPTIONS.pop("parse_workers"))
+        SCRAPE_OPTIONS["parse_pool"] = parse_pool
+
+    def job():
+        for sink in sinks.values():
+            sink.reset()
+        metrics, results = run_pipeline(args, sink_names, sinks=sinks)
+        failed = [result["sink"] for result in results if result["error"]]
+        if failed:
+            raise RuntimeError(f"Sink gagal: {', '.join(failed)}")
+        return metrics
+
+    scheduler = Scheduler(job, schedule, jitter=args.jitter, lock_path=args.lock_file, max_runs=args.max_runs)
+    server = serve_health(scheduler, args.health_port, args.health_host) if args.health_port is not None else None
+    previous_handlers = {signum: signal.signal(signum, lambda *_: scheduler.stop())
+                         for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        scheduler.run_forever()
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        close_sinks(list(sinks.values()))
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline ETL fashion-studio.dicoding.dev")
+    parser.add_argument("--stream", action="store_true",
+                        help="Proses dan muat data per chunk halaman, bukan sekaligus.")
+    parser.add_argument("--chunk-pages", type=int, default=5,
+                        help="Jumlah halaman per chunk pada mode --stream. Default = 5.")
+    parser.add_argument("--compact", action="store_true",
+                        help="Pakai tipe data ringkas (category, datetime64, int8, float32).")
+    parser.add_argument("--sinks", default=",".join(SINK_OPTIONS),
+                        help=f"Daftar sink dipisah koma. Pilihan: {', '.join(SINKS)}. Default = semua.")
+    parser.add_argument("--extract-engine", choices=["threads", "async"], default=EXTRACT_ENGINE,
+                        help="Engine scraping mode batch: thread pool atau asyncio (aiohttp). Default = threads.")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="Jumlah proses untuk parsing HTML (0 = parse di thread fetch). Default = 0.")
+    parser.add_argument("--sites", metavar="PATH",
+                        help="File JSON berisi konfigurasi beberapa situs (lihat utils/sites.py) yang di-scrape "
+                             "bersamaan; hasilnya diberi kolom source.")
+    parser.add_argument("--rules", metavar="PATH",
+                        help="File JSON berisi aturan validasi baris (lihat utils/validation.py). Default = aturan bawaan.")
+    parser.add_argument("--quarantine", metavar="PATH",
+                        help="Simpan baris yang dibuang aturan validasi beserta kolom reject_rule ke file CSV ini.")
+    parser.add_argument("--dedup-index", metavar="PATH",
+                        help="Indeks dedup persisten (.npy): produk yang isinya (tanpa timestamp) sudah pernah "
+                             "dimuat di run sebelumnya dibuang, sehingga sink hanya menerima produk baru.")
+    parser.add_argument("--shard-workers", type=int,
+                        help="Bagi halaman katalog ke sekian proses worker lewat work queue SQLite (lease per shard, "
+                             "shard dari worker yang mati diambil ulang). Hanya mode batch.")
+    parser.add_argument("--shard-pages", type=int, default=10,
+                        help="Jumlah halaman per shard pada --shard-workers. Default = 10.")
+    parser.add_argument("--join-queue", metavar="DIR",
+                        help="Jalankan hanya sebagai worker tambahan untuk work queue shard yang sudah ada "
+                             "(misal dari host lain lewat direktori bersama), lalu keluar.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Hanya muat produk yang baru, berubah atau hilang sejak run terakhir.")
+    parser.add_argument("--resume", nargs="?", const="latest", metavar="RUN_ID",
+                        help="Lanjutkan run batch yang gagal dari checkpoint (default: run terakhir).")
+    parser.add_argument("--schedule", metavar="SPEC",
+                        help="Jalankan sebagai daemon terjadwal: interval ('every 15m', '30s', '2h') atau ekspresi "
+                             "cron ('*/30 * * * *'). Sink, connection pool dan cache tetap hangat antar run.")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Geser waktu mulai setiap run terjadwal secara acak sampai sekian detik. Default = 0.")
+    parser.add_argument("--lock-file", default=".cache/scheduler.lock",
+                        help="File lock agar run terjadwal tidak tumpang tindih dengan proses lain.")
+    parser.add_argument("--health-port", type=int,
+                        help="Aktifkan endpoint /health dan /metrics (Prometheus) di port ini pada mode --schedule.")
+    parser.add_argument("--health-host", default="127.0.0.1", help="Alamat bind endpoint health. Default = 127.0.0.1.")
+    parser.add_argument("--max-runs", type=int, help="Hentikan mode --schedule setelah sekian run. Default = tanpa batas.")
+    parser.add_argument("--run-id", help="ID run untuk checkpoint dan laporan metrik. Default = waktu mulai + id acak.")
+    parser.add_argument("--metrics-dir",
+                        help="Simpan laporan run (<run_id>.json) dan metrik Prometheus (metrics.prom) ke direktori ini.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Aktifkan cProfile; hasilnya disimpan sebagai <run_id>.prof di --metrics-dir.")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Aktifkan tracemalloc dan catat alokasi memori terbesar di laporan run.")
+    args = parser.parse_args()
+    if args.incremental and args.stream:
+        parser.error("--incremental belum bisa digabung dengan --stream.")
+    if args.resume and args.stream:
+        parser.error("--resume hanya didukung untuk mode batch.")
+    if args.extract_engine == "async" and args.stream:
+        parser.error("--extract-engine async hanya didukung untuk mode batch.")
+    if args.extract_engine == "async" and args.sites:
+        parser.error("--extract-engine async belum bisa digabung dengan --sites.")
+    if args.shard_workers is not None and (args.stream or args.sites or args.extract_engine == "async"):
+        parser.error("--shard-workers hanya didukung untuk mode batch satu situs dengan engine threads.")
+    if args.shard_workers is not None and (args.shard_workers < 1 or args.shard_pages < 1):
+        parser.error("--shard-workers dan --shard-pages minimal 1.")
+    if args.join_queue:
+        if not os.path.exists(os.path.join(args.join_queue, "queue.sqlite")):
+            parser.error(f"Work queue tidak ditemukan: {args.join_queue}")
+        from utils.workqueue import run_worker
+        run_worker(args.join_queue)
+        raise SystemExit(0)
+    if args.incremental and args.dedup_index:
+        # Mode incremental butuh katalog lengkap untuk mendeteksi produk yang hilang
+        parser.error("--incremental tidak bisa digabung dengan --dedup-index.")
+    schedule = None
+    if args.schedule:
+        if args.resume or args.run_id:
+            parser.error("--schedule tidak bisa digabung dengan --resume atau --run-id.")
+        from utils.scheduler import parse_schedule
+        try:
+            schedule = parse_schedule(args.schedule)
+        except ValueError as e:
+            parser.error(f"Jadwal tidak valid: {e}")
+    sink_names = [name.strip() for name in args.sinks.split(",") if name.strip()]
+    if args.parse_workers:
+        SCRAPE_OPTIONS["parse_workers"] = args.parse_workers
+    EXTRACT_ENGINE = args.extract_engine
+
+    # Mode batch selalu memakai checkpoint; checkpoint dihapus setelah semua sink commit
+    checkpoint = None
+    if args.resume:
+        checkpoint = RunCheckpoint.latest() if args.resume == "latest" else RunCheckpoint.open(args.resume)
+        if checkpoint is None:
+            parser.error("Tidak ada checkpoint yang bisa dilanjutkan.")
+        # Run dilanjutkan dengan opsi yang sama seperti saat pertama dijalankan
+        options = checkpoint.options
+        sink_names = options.get("sinks", sink_names)
+        args.compact = options.get("compact", args.compact)
+        args.incremental = options.get("incremental", args.incremental)
+        args.sites = options.get("sites", args.sites)
+        args.rules = options.get("rules", args.rules)
+        args.quarantine = options.get("quarantine", args.quarantine)
+        args.dedup_index = options.get("dedup_index", args.dedup_index)
+        args.shard_workers = options.get("shard_workers", args.shard_workers)
+        args.shard_pages = options.get("shard_pages", args.shard_pages)
+        logging.info(f"Melanjutkan run {checkpoint.run_id} dengan sink: {', '.join(sink_names)}")
+    elif not args.stream and schedule is None:
+        checkpoint = RunCheckpoint(args.run_id)
+        checkpoint.save_options({"sinks": sink_names, "compact": args.compact, "incremental": args.incremental,
+                                 "sites": args.sites, "rules": args.rules, "quarantine": args.quarantine,
+                                 "dedup_index": args.dedup_index, "shard_workers": args.shard_workers,
+                                 "shard_pages": args.shard_pages})
+    if checkpoint is not None:
+        # Checkpoint run gagal yang lama tidak pernah dilanjutkan; yang sedang dipakai tidak ikut dihapus
+        RunCheckpoint.prune(keep=checkpoint.run_id)
+    if args.sites:
+        from utils.sites import load_site_configs
+        try:
+            SITES = load_site_configs(args.sites)
+        except (OSError, ValueError) as e:
+            parser.error(f"Konfigurasi situs tidak bisa dibaca: {e}")
+        # Produk yang sama di toko berbeda tidak boleh saling menimpa: kolom source ikut jadi kunci
+        for name in ("postgres", "google_sheets"):
+            SINK_OPTIONS[name] = dict(SINK_OPTIONS[name], key_columns=SITE_KEY)
+        CDC_STATE_PATH = '.cache/cdc_state_sites.sqlite'
+    if args.rules:
+        try:
+            RULES = load_rules(args.rules)
+        except (OSError, ValueError) as e:
+            parser.error(f"Aturan validasi tidak bisa dibaca: {e}")
+    QUARANTINE_PATH = args.quarantine
+    DEDUP_INDEX_PATH = args.dedup_index
+    if args.shard_workers:
+        SHARD_OPTIONS = {"workers": args.shard_workers, "shard_pages": args.shard_pages}
+
+    enable_page_cache('.cache/pages.sqlite')
+    if schedule is not None:
+        run_scheduler(schedule, args, sink_names)
+    else:
+        run_pipeline(args, sink_names, checkpoint=checkpoint)
@@ -0,0 +1,130 @@
+"""
+Tiruan lokal Google Sheets API (spreadsheets().values()) untuk test loader Sheets.
+
+Menyimpan isi sheet di memori, mencatat setiap request yang dikirim, dan bisa
+disetel untuk membalas status error (misal 429) pada beberapa request pertama.
+"""
+import json
+import re
+import httplib2
+from googleapiclient.errors import HttpError
+
+RANGE_RE = re.compile(r"^(?P<sheet>.+)!(?P<c1>[A-Z]+)(?P<r1>\d+)(:(?P<c2>[A-Z]+)(?P<r2>\d+)?)?$")
+
+
+def _column_index(letters):
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def _parse_range(range_name):
+    match = RANGE_RE.match(range_name)
+    if not match:
+        raise ValueError(f"Range tidak valid: {range_name}")
+    first_col = _column_index(match.group("c1"))
+    last_col = _column_index(match.group("c2")) if match.group("c2") else first_col
+    first_row = int(match.group("r1"))
+    last_row = int(match.group("r2")) if match.group("r2") else None
+    return match.group("sheet"), first_row, last_row, first_col, last_col
+
+
+class _Request:
+    def __init__(self, service, method, kwargs, handler):
+        self.service = service
+        self.method = method
+        self.kwargs = kwargs
+        self.handler = handler
+
+    def execute(self):
+        self.service.calls.append((self.method, self.kwargs))
+        if self.service.fail_with:
+            status = self.service.fail_with.pop(0)
+            raise HttpError(httplib2.Response({"status": status}), b"fake error")
+        return self.handler()
+
+
+class _Values:
+    def __init__(self, service):
+        self.service = service
+
+    def get(self, spreadsheetId, range, valueRenderOption=None):
+        return _Request(self.service, "get", {"range": range}, lambda: self.service.read(range))
+
+    def batchUpdate(self, spreadsheetId, body):
+        def handler():
+            for value_range in body["data"]:
+                self.service.write(value_range["range"], value_range["values"])
+            return {"totalUpdatedRows": sum(len(v["values"]) for v in body["data"])}
+        return _Request(self.service, "batchUpdate", {"body": body}, handler)
+
+    def batchClear(self, spreadsheetId, body):
+        def handler():
+            for range_name in body["ranges"]:
+                self.service.clear(range_name)
+            return {}
+        return _Request(self.service, "batchClear", {"body": body}, handler)
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        return _Request(self.service, "update", {"range": range, "body": body},
+                        lambda: self.service.write(range, body["values"]))
+
+
+class _Spreadsheets:
+    def __init__(self, service):
+        self.service = service
+
+    def values(self):
+        return _Values(self.service)
+
+
+class FakeSheetsService:
+    """Pengganti objek hasil `build('sheets', 'v4', ...)` yang menyimpan sel di memori."""
+
+    def __init__(self, fail_with=None):
+        self.cells = {}
+        self.calls = []
+        self.fail_with = list(fail_with or [])
+
+    def spreadsheets(self):
+        return _Spreadsheets(self)
+
+    def write(self, range_name, values):
+        sheet, first_row, _, first_col, _ = _parse_range(range_name)
+        for row_offset, row in enumerate(values):
+            for col_offset, value in enumerate(row):
+                self.cells[(sheet, first_row + row_offset, first_col + col_offset)] = value
+        return {}
+
+    def clear(self, range_name):
+        sheet, first_row, last_row, first_col, last_col = _parse_range(range_name)
+        for key in list(self.cells):
+            cell_sheet, row, col = key
+            if (cell_sheet == sheet and row >= first_row and (last_row is None or row <= last_row)
+                    and first_col <= col <= last_col):
+                del self.cells[key]
+
+    def read(self, range_name):
+        sheet, first_row, last_row, first_col, last_col = _parse_range(range_name)
+        rows = {}
+        for (cell_sheet, row, col), value in self.cells.items():
+            if (cell_sheet == sheet and row >= first_row and (last_row is None or row <= last_row)
+                    and first_col <= col <= last_col and value != ""):
+                rows.setdefault(row, {})[col] = value
+        if not rows:
+            return {}
+        result = []
+        for row in range(first_row, max(rows) + 1):
+            cols = rows.get(row, {})
+            width = max(cols) - first_col + 1 if cols else 0
+            result.append([cols.get(first_col + i, "") for i in range(width)])
+        return {"values": result}
+
+    def rows(self, range_name):
+        """Isi range dalam bentuk list of lists (kosong jika tidak ada data)."""
+        return self.read(range_name).get("values", [])
+
+    def payload_sizes(self, method="batchUpdate"):
+        """Ukuran JSON body setiap request dengan method tertentu."""
+        return [len(json.dumps(kwargs["body"], default=str)) for name, kwargs in self.calls if name == method]
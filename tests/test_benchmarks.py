@@ -0,0 +1,46 @@
+import json
+from benchmarks.suite import compare_results, run_suite, main
+
+
+def _report(**seconds):
+    return {"results": {case.replace("_", "/"): {"seconds": value} for case, value in seconds.items()}}
+
+
+def test_compare_flags_regressions_above_threshold():
+    """Kasus yang melambat lebih dari threshold ditandai regresi; kasus sangat cepat dianggap noise."""
+    baseline = _report(transform_fast=1.0, load_csv=1.0, parse_lxml=0.001, load_parquet=1.0)
+    current = _report(transform_fast=1.3, load_csv=1.1, parse_lxml=0.004, scrape_stub=2.0)
+
+    rows = {row["case"]: row for row in compare_results(baseline, current, threshold=0.2)}
+
+    assert rows["transform/fast"]["status"] == "regression"
+    assert rows["transform/fast"]["ratio"] == 1.3
+    assert rows["load/csv"]["status"] == "ok"
+    assert rows["parse/lxml"]["status"] == "ok"
+    assert rows["load/parquet"]["status"] == "missing"
+    assert rows["scrape/stub"]["status"] == "new"
+    reverse = {row["case"]: row for row in compare_results(current, baseline, threshold=0.2)}
+    assert reverse["transform/fast"]["status"] == "improved"
+
+
+def test_run_suite_and_compare_cli(tmp_path, capsys):
+    """Run kecil terhadap server lokal menghasilkan baseline JSON yang bisa dibandingkan lewat CLI."""
+    report = run_suite(sizes=[200], repeat=1, pages=3, workers=2, latency=0,
+                       cases=["scrape", "transform/fast", "load/csv", "load/google_sheets_fake"])
+
+    results = report["results"]
+    assert set(results) == {"scrape/stub", "transform/fast/200", "load/csv/200", "load/google_sheets_fake/200"}
+    assert results["scrape/stub"]["rows"] == 60
+    assert results["load/csv/200"]["rows"] < 200
+    assert report["environment"]["versions"]["pandas"]
+
+    baseline = tmp_path / "baseline.json"
+    slower = tmp_path / "current.json"
+    baseline.write_text(json.dumps(report))
+    for result in report["results"].values():
+        result["seconds"] = result["seconds"] * 2 + 1
+    slower.write_text(json.dumps(report))
+
+    assert main(["compare", str(baseline), str(baseline)]) == 0
+    assert main(["compare", str(baseline), str(slower), "--threshold", "0.2"]) == 1
+    assert "regression" in capsys.readouterr().out
@@ -0,0 +1,67 @@
+import pytest
+from utils.cache import PageCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """PageCache baru di direktori sementara."""
+    page_cache = PageCache(str(tmp_path / "cache" / "pages.sqlite"), max_bytes=10_000, ttl=60)
+    yield page_cache
+    page_cache.close()
+
+
+def test_put_and_get_strips_timestamp(cache):
+    """Produk disimpan tanpa timestamp beserta validator HTTP-nya."""
+    cache.put("http://site/", '"abc"', "Wed, 21 Oct 2025 07:28:00 GMT",
+              [{"title": "A", "price": "$1.00", "timestamp": "2025-05-22"}])
+
+    entry = cache.get("http://site/")
+
+    assert entry["products"] == [{"title": "A", "price": "$1.00"}]
+    assert cache.conditional_headers(entry) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 21 Oct 2025 07:28:00 GMT"
+    }
+
+
+def test_get_missing_url_returns_none(cache):
+    """URL yang belum pernah disimpan menghasilkan None."""
+    assert cache.get("http://site/page9") is None
+
+
+def test_expired_entry_is_dropped(cache, monkeypatch):
+    """Entri yang lebih tua dari TTL dibuang dan tidak dipakai lagi."""
+    cache.put("http://site/", '"abc"', None, [])
+    real_time = __import__("time").time
+    monkeypatch.setattr("utils.cache.time.time", lambda: real_time() + 120)
+
+    assert cache.get("http://site/") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    """Saat melewati batas ukuran, entri yang paling lama tidak diakses dibuang lebih dulu."""
+    product = [{"title": "x" * 400}]
+    page_cache = PageCache(str(tmp_path / "pages.sqlite"), max_bytes=1_000, ttl=60)
+    page_cache.put("http://site/page1", '"1"', None, product)
+    page_cache.put("http://site/page2", '"2"', None, product)
+    page_cache.get("http://site/page1")
+    page_cache.put("http://site/page3", '"3"', None, product)
+
+    assert page_cache.get("http://site/page1") is not None
+    assert page_cache.get("http://site/page2") is None
+    assert page_cache.get("http://site/page3") is not None
+    assert page_cache.total_size() <= 1_000
+    page_cache.close()
+
+
+def test_cache_survives_reopen(tmp_path):
+    """Isi cache tetap ada setelah file dibuka ulang oleh proses berikutnya."""
+    path = str(tmp_path / "pages.sqlite")
+    first = PageCache(path)
+    first.put("http://site/", '"abc"', None, [{"title": "A"}])
+    first.close()
+
+    second = PageCache(path)
+    assert second.get("http://site/")["products"] == [{"title": "A"}]
+    second.close()
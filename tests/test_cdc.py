@@ -0,0 +1,120 @@
+import pytest
+import pandas as pd
+from utils.cdc import ChangeStore, row_hashes
+from utils.load import SITE_KEY
+from utils.transform import to_compact
+
+
+@pytest.fixture
+def catalogue_df():
+    """Fixture DataFrame berisi beberapa produk unik."""
+    return pd.DataFrame([{
+        "title": f"Product {i}", "price": 100000.0 + i, "rating": 4.5, "colors": 3,
+        "size": "M", "gender": "Men", "timestamp": "2025-05-22T10:00:00"
+    } for i in range(5)])
+
+
+@pytest.fixture
+def store(tmp_path):
+    """State store CDC di direktori sementara."""
+    store = ChangeStore(str(tmp_path / "state" / "cdc.sqlite"))
+    yield store
+    store.close()
+
+
+def test_first_run_marks_everything_new(store, catalogue_df):
+    """Tanpa state sebelumnya semua produk dianggap baru."""
+    changes = store.diff(catalogue_df)
+
+    assert len(changes["new"]) == 5
+    assert changes["changed"].empty and changes["unchanged"].empty and changes["deleted"].empty
+
+
+def test_diff_classifies_rows(store, catalogue_df):
+    """Produk dikelompokkan menjadi new, changed, unchanged dan deleted; timestamp diabaikan."""
+    store.commit(store.diff(catalogue_df))
+
+    next_run = catalogue_df.assign(timestamp="2025-05-23T10:00:00")
+    next_run.loc[1, "price"] = 1.0
+    next_run = next_run.drop(index=4)
+    next_run = pd.concat([next_run, catalogue_df.head(1).assign(title="Product New")], ignore_index=True)
+
+    changes = store.diff(next_run)
+
+    assert list(changes["new"]["title"]) == ["Product New"]
+    assert list(changes["changed"]["title"]) == ["Product 1"]
+    assert list(changes["unchanged"]["title"]) == ["Product 0", "Product 2", "Product 3"]
+    assert changes["deleted"].to_dict("records") == [
+        {"title": "Product 4", "size": "M", "gender": "Men", "colors": 3}
+    ]
+    assert list(store.upserts(changes)["title"]) == ["Product New", "Product 1"]
+
+
+def test_state_survives_reopen_and_uncommitted_runs(tmp_path, catalogue_df):
+    """State tersimpan di disk; diff yang belum di-commit dihitung ulang pada run berikutnya."""
+    path = str(tmp_path / "cdc.sqlite")
+    store = ChangeStore(path)
+    store.commit(store.diff(catalogue_df))
+    store.close()
+
+    changed = catalogue_df.assign(price=1.0)
+    store = ChangeStore(path)
+    assert len(store) == 5
+    assert len(store.diff(changed)["changed"]) == 5
+    store.close()
+
+    # Run sebelumnya "crash" sebelum commit, jadi perubahannya masih terdeteksi
+    store = ChangeStore(path)
+    changes = store.diff(changed)
+    assert len(changes["changed"]) == 5
+    store.commit(changes)
+    assert store.diff(changed)["unchanged"].shape[0] == 5
+    store.close()
+
+
+def test_commit_removes_deleted_keys(store, catalogue_df):
+    """Produk yang hilang dihapus dari state saat commit."""
+    store.commit(store.diff(catalogue_df))
+    store.commit(store.diff(catalogue_df.head(2)))
+
+    assert len(store) == 2
+    assert len(store.diff(catalogue_df)["new"]) == 3
+
+
+def test_duplicate_keys_use_last_row(store, catalogue_df):
+    """Kunci yang muncul dua kali memakai baris terakhir."""
+    duplicated = pd.concat([catalogue_df.head(1), catalogue_df.head(1).assign(price=9.0)], ignore_index=True)
+
+    changes = store.diff(duplicated)
+
+    assert len(changes["new"]) == 1
+    assert changes["new"].iloc[0]["price"] == 9.0
+
+
+def test_compact_schema_hashes_match_default(catalogue_df):
+    """Skema ringkas menghasilkan hash yang sama dengan skema default."""
+    assert list(row_hashes(to_compact(catalogue_df))) == list(row_hashes(catalogue_df))
+
+
+def test_site_key_keeps_same_product_from_each_storefront(tmp_path, catalogue_df):
+    """Dengan SITE_KEY produk yang sama di dua situs dilacak terpisah, bukan 'baris terakhir menang'."""
+    store = ChangeStore(str(tmp_path / "cdc.sqlite"), key_columns=SITE_KEY)
+    two_sites = pd.concat([catalogue_df.assign(source="shop_a"), catalogue_df.assign(source="shop_b", price=1.0)],
+                          ignore_index=True)
+    changes = store.diff(two_sites)
+    assert len(changes["new"]) == 10
+    store.commit(changes)
+
+    next_run = two_sites[two_sites["source"] == "shop_b"].assign(price=2.0)
+    changes = store.diff(next_run)
+    assert len(changes["changed"]) == 5
+    assert changes["deleted"]["source"].tolist() == ["shop_a"] * 5
+    store.close()
+
+
+def test_state_with_other_key_columns_is_rejected(tmp_path):
+    """State CDC yang dibuat dengan kolom kunci lain harus raise ValueError saat dibuka."""
+    path = str(tmp_path / "cdc.sqlite")
+    ChangeStore(path).close()
+    with pytest.raises(ValueError, match="kunci"):
+        ChangeStore(path, key_columns=SITE_KEY)
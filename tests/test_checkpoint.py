@@ -0,0 +1,125 @@
+import os
+import pytest
+import pandas as pd
+import main
+from utils.checkpoint import RunCheckpoint
+from utils.sinks import SINKS, Sink, register_sink
+from utils.transform import to_compact
+
+
+@pytest.fixture
+def raw_pages():
+    """Produk mentah dua halaman seperti hasil scraping."""
+    def product(title):
+        return {"title": title, "price": "$10.00", "rating": "Rating: ⭐ 4.0 / 5", "colors": "3 Colors",
+                "size": "Size: M", "gender": "Gender: Men", "timestamp": "2025-05-22T10:00:00"}
+    return {1: [product("Product 1"), product("Product 2")], 2: [product("Product 3")]}
+
+
+def test_checkpoint_persists_pages_frame_and_sinks(tmp_path, raw_pages):
+    """Halaman, hasil transformasi, step dan sink yang commit tetap ada setelah checkpoint dibuka ulang."""
+    checkpoint = RunCheckpoint("run-1", root=str(tmp_path))
+    checkpoint.save_options({"sinks": ["csv"], "compact": True})
+    for page, products in raw_pages.items():
+        checkpoint.save_page(page, products)
+    checkpoint.save_page(3, [])
+    frame = to_compact(main.clean_and_transform(checkpoint.raw_products()))
+    checkpoint.save_frame(frame)
+    checkpoint.commit_sink("csv", 3)
+    checkpoint.close()
+
+    reopened = RunCheckpoint.open("run-1", root=str(tmp_path))
+    assert reopened.options == {"sinks": ["csv"], "compact": True}
+    assert reopened.pages() == raw_pages
+    assert [p["title"] for p in reopened.raw_products()] == ["Product 1", "Product 2", "Product 3"]
+    assert reopened.is_done("transform") and not reopened.is_done("load")
+    pd.testing.assert_frame_equal(reopened.load_frame(), frame)
+    assert reopened.committed_sinks() == {"csv": 3}
+
+    reopened.remove()
+    assert not os.path.exists(os.path.join(tmp_path, "run-1"))
+    assert RunCheckpoint.open("run-1", root=str(tmp_path)) is None
+
+
+def test_latest_returns_most_recent_run(tmp_path):
+    """--resume tanpa ID memakai checkpoint yang terakhir diperbarui."""
+    assert RunCheckpoint.latest(str(tmp_path)) is None
+    RunCheckpoint("old", root=str(tmp_path)).close()
+    newer = RunCheckpoint("new", root=str(tmp_path))
+    newer.mark_done("extract")
+    newer.close()
+    os.utime(os.path.join(tmp_path, "old", "checkpoint.sqlite"), (0, 0))
+
+    assert RunCheckpoint.latest(str(tmp_path)).run_id == "new"
+
+
+def test_prune_removes_only_stale_runs(tmp_path):
+    """Checkpoint yang tidak diperbarui lebih dari max_age_days dihapus, kecuali run yang dikecualikan."""
+    root = str(tmp_path)
+    assert RunCheckpoint.prune(root=str(tmp_path / "missing")) == []
+    for run_id in ("stale", "current", "fresh"):
+        RunCheckpoint(run_id, root=root).close()
+    os.makedirs(os.path.join(root, "broken"))
+    for run_id in ("stale", "current"):
+        os.utime(os.path.join(root, run_id, "checkpoint.sqlite"), (0, 0))
+    os.utime(os.path.join(root, "broken"), (0, 0))
+
+    assert RunCheckpoint.prune(max_age_days=1, root=root, keep="current") == ["broken", "stale"]
+    assert sorted(os.listdir(root)) == ["current", "fresh"]
+
+
+def test_load_frame_without_transform_raises(tmp_path):
+    """Checkpoint tanpa hasil transformasi tidak bisa dibaca frame-nya."""
+    with RunCheckpoint("run-1", root=str(tmp_path)) as checkpoint:
+        with pytest.raises(FileNotFoundError):
+            checkpoint.load_frame()
+
+
+def test_run_batch_resume_skips_finished_work(tmp_path, monkeypatch, raw_pages):
+    """Setelah sink gagal, resume tidak scrape/transform ulang dan hanya memuat sink yang belum commit."""
+    monkeypatch.setattr("utils.sinks.SINKS", dict(SINKS))
+    loads = {"good": 0, "flaky": 0}
+    failures = [RuntimeError("database down")]
+
+    @register_sink("good")
+    class GoodSink(Sink):
+        def _load(self, df):
+            loads["good"] += 1
+
+    @register_sink("flaky")
+    class FlakySink(Sink):
+        def _load(self, df):
+            loads["flaky"] += 1
+            if failures:
+                raise failures.pop()
+
+    scrapes = []
+
+    def fake_scrape_all_pages(stats=None, done_pages=None, on_page=None, **kwargs):
+        scrapes.append(dict(done_pages))
+        data = []
+        for page, products in raw_pages.items():
+            on_page(page, products)
+            data.extend(products)
+        return data
+
+    transforms = []
+    monkeypatch.setattr(main, "scrape_all_pages", fake_scrape_all_pages)
+    monkeypatch.setattr(main, "clean_and_transform", lambda data, **kwargs: transforms.append(1) or pd.DataFrame(data))
+    monkeypatch.setattr(main, "SINK_OPTIONS", {})
+
+    checkpoint = RunCheckpoint("run-1", root=str(tmp_path))
+    results = main.run_batch(["good", "flaky"], checkpoint=checkpoint)
+    assert [r["error"] is None for r in results] == [True, False]
+    assert not checkpoint.is_done("load")
+    checkpoint.close()
+
+    resumed = RunCheckpoint.open("run-1", root=str(tmp_path))
+    results = main.run_batch(["good", "flaky"], checkpoint=resumed)
+
+    assert [r["sink"] for r in results] == ["flaky"]
+    assert loads == {"good": 1, "flaky": 2}
+    assert len(scrapes) == 1 and len(transforms) == 1
+    assert resumed.is_done("load")
+    assert resumed.committed_sinks() == {"good": 3, "flaky": 3}
+    resumed.close()
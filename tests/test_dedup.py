@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import make_raw_catalogue
+from utils.dedup import DedupIndex, content_fingerprints
+from utils.transform import clean_and_transform, transform_stream, to_compact
+
+
+def make_raw_product(title, timestamp="2025-05-22 10:00:00"):
+    """Membuat satu dictionary produk mentah untuk test."""
+    return {
+        "title": title,
+        "price": "$10.00",
+        "rating": "Rating: ⭐ 4.0 / 5",
+        "colors": "2 Colors",
+        "size": "Size: M",
+        "gender": "Gender: Women",
+        "timestamp": timestamp,
+    }
+
+
+def test_fingerprints_ignore_timestamp_and_schema():
+    """Fingerprint sama untuk produk yang sama pada timestamp, skema dan urutan kolom berbeda."""
+    first = clean_and_transform([make_raw_product("A"), make_raw_product("B")])
+    later = clean_and_transform([make_raw_product("A", timestamp="2025-06-01 08:00:00")])
+
+    assert content_fingerprints(first)[0] == content_fingerprints(later)[0]
+    assert content_fingerprints(first)[0] != content_fingerprints(first)[1]
+    np.testing.assert_array_equal(content_fingerprints(to_compact(first)), content_fingerprints(first))
+    np.testing.assert_array_equal(content_fingerprints(first[first.columns[::-1]]), content_fingerprints(first))
+
+
+def test_index_persists_sorted_fingerprints(tmp_path):
+    """Fingerprint disimpan terurut tanpa duplikat dan commit hanya menghitung yang baru."""
+    path = str(tmp_path / "index" / "dedup.npy")
+    index = DedupIndex(path)
+    index.add([5, -3, 5])
+    assert index.contains([5, 4]).tolist() == [True, False]
+    assert index.commit() == 2
+
+    index = DedupIndex(path)
+    index.add([4, 5, 100])
+    # 5 sudah ada di file: hanya 4 dan 100 yang baru
+    assert len(index) == 4
+    assert index.commit() == 2
+    assert np.load(path).tolist() == [-3, 4, 5, 100]
+    assert DedupIndex(path).contains([100, 7]).tolist() == [True, False]
+    assert list((tmp_path / "index").iterdir()) == [tmp_path / "index" / "dedup.npy"]
+
+
+def test_history_dedups_across_timestamps_and_runs(tmp_path):
+    """Produk yang sama dengan timestamp berbeda dibuang, di run yang sama maupun run berikutnya."""
+    path = str(tmp_path / "dedup.npy")
+    raw = [make_raw_product("A"), make_raw_product("A", timestamp="2025-05-22 10:00:05"), make_raw_product("B")]
+
+    stats = {}
+    df = clean_and_transform(raw, history=DedupIndex(path), stats=stats)
+    assert df["title"].tolist() == ["A", "B"]
+    assert stats["dropped"]["duplicate"] == 1
+
+    # Tanpa commit, run berikutnya belum tahu riwayat ini
+    index = DedupIndex(path)
+    assert len(clean_and_transform(raw, history=index)) == 2
+    index.commit()
+
+    stats = {}
+    next_day = [make_raw_product("A", timestamp="2025-05-23"), make_raw_product("C", timestamp="2025-05-23")]
+    df = clean_and_transform(next_day, history=DedupIndex(path), stats=stats)
+    assert df["title"].tolist() == ["C"]
+    assert stats["dropped"]["seen_before"] == 1
+
+
+def test_history_matches_drop_duplicates_without_timestamp(tmp_path):
+    """Hasilnya sama dengan drop_duplicates pada kolom isi (tanpa timestamp) atas seluruh data."""
+    raw = make_raw_catalogue(3000)
+    raw += [dict(product, timestamp="2025-06-01") for product in raw[:500]]
+    expected = clean_and_transform(raw)
+    content = [column for column in expected.columns if column != "timestamp"]
+    expected = expected.drop_duplicates(subset=content).reset_index(drop=True)
+
+    frames = list(transform_stream([raw[i:i + 400] for i in range(0, len(raw), 400)],
+                                   history=DedupIndex(str(tmp_path / "dedup.npy"))))
+    pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True), expected)
+
+
+def test_history_is_seeded_from_existing_frame(tmp_path):
+    """Indeks yang diisi dari frame lama membuang produk yang sudah pernah dimuat."""
+    path = str(tmp_path / "dedup.npy")
+    index = DedupIndex(path)
+    index.add_frame(to_compact(clean_and_transform([make_raw_product("A")])).assign(scrape_date="2025-05-22"))
+    index.commit()
+    assert clean_and_transform([make_raw_product("A"), make_raw_product("B")],
+                               history=DedupIndex(path))["title"].tolist() == ["B"]
+
+
+def test_history_argument_validation(tmp_path):
+    """history hanya untuk engine 'fast' dan tidak boleh digabung dengan seen."""
+    index = DedupIndex(str(tmp_path / "dedup.npy"))
+    with pytest.raises(ValueError):
+        clean_and_transform([make_raw_product("A")], engine="pandas", history=index)
+    with pytest.raises(ValueError):
+        clean_and_transform([make_raw_product("A")], seen=set(), history=index)
+
+
+def test_run_stream_commits_index_for_next_run(tmp_path, monkeypatch):
+    """run_stream menyimpan indeks sehingga produk yang sama dibuang pada run berikutnya."""
+    import main
+    monkeypatch.setattr(main, "DEDUP_INDEX_PATH", str(tmp_path / "dedup.npy"))
+    monkeypatch.setattr(main, "iter_product_chunks",
+                        lambda **kwargs: iter([[make_raw_product("A")], [make_raw_product("B")]]))
+    main.run_stream(1, [])
+    assert len(DedupIndex(main.DEDUP_INDEX_PATH)) == 2
+
+    monkeypatch.setattr(main, "iter_product_chunks",
+                        lambda **kwargs: iter([[make_raw_product("A", timestamp="2025-05-23")]]))
+    stats = main.PipelineMetrics()
+    main.run_stream(1, [], metrics=stats)
+    assert stats.filter_drops["seen_before"] == 1
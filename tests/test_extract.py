@@ -1,10 +1,22 @@
 import pytest
 import requests
 import requests_mock
-from utils.extract import scrape_page, scrape_all_pages
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.extract import (
+    scrape_page, scrape_all_pages, RateLimiter, fetch_url, get_session, FetchError,
+    enable_page_cache, disable_page_cache, iter_product_chunks
+)
 import logging
 
 
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Hilangkan jeda backoff agar test retry tetap cepat."""
+    monkeypatch.setattr("utils.extract.BACKOFF_FACTOR", 0)
+
+
 @pytest.fixture
 def mock_product_html():
     """Mock HTML untuk product page."""
@@ -109,3 +121,294 @@ def test_scrape_page_price_fallback(mock_fallback_price_html):
     assert results[0]["price"] == "Rp 99.000"
     assert results[0]["title"] == "Fallback Product"
 
+
+CARD_HTML = """
+<div class="collection-card">
+    <h3 class="product-title">Product {page}-{idx}</h3>
+    <div class="price-container"><span class="price">$10.00</span></div>
+    <p>Rating: ⭐ 4.0 / 5</p>
+    <p>3 Colors</p>
+    <p>Size: M</p>
+    <p>Gender: Men</p>
+</div>
+"""
+
+
+@pytest.fixture
+def local_site(monkeypatch):
+    """
+    Server HTTP lokal pengganti fashion-studio dengan 20 halaman dan latensi 50 ms.
+    `max_active` mencatat jumlah request terbanyak yang ditangani bersamaan.
+    """
+    total_pages = 20
+    latency = 0.05
+    hits = []
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            page = 1 if self.path == "/" else int(self.path.strip("/").replace("page", ""))
+            hits.append(page)
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(latency)
+            with lock:
+                active["now"] -= 1
+            if page > total_pages:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = "<html><body>" + "".join(CARD_HTML.format(page=page, idx=i) for i in range(2)) + "</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            self.wfile.write(body.encode())
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 128
+
+    server = Server(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr("utils.extract.BASE_URL", f"http://127.0.0.1:{server.server_port}/")
+    yield {"pages": total_pages, "hits": hits, "active": active}
+    server.shutdown()
+    server.server_close()
+
+
+def test_scrape_all_pages_stops_on_empty(monkeypatch):
+    """Scraping berhenti setelah halaman pertama yang kosong."""
+    calls = []
+
+    def dummy_scrape_page(page_num):
+        calls.append(page_num)
+        return [{"title": f"Dummy Product {page_num}"}] if page_num <= 2 else []
+
+    monkeypatch.setattr("utils.extract.scrape_page", dummy_scrape_page)
+
+    results = scrape_all_pages(max_pages=10)
+
+    assert len(results) == 2
+    assert calls == [1, 2, 3]
+
+
+def test_scrape_all_pages_skips_done_pages_and_reports_each_page(monkeypatch):
+    """Halaman dari checkpoint tidak di-request ulang dan setiap halaman dilaporkan ke on_page."""
+    calls, reported = [], []
+
+    def dummy_scrape_page(page_num):
+        calls.append(page_num)
+        return [{"title": f"Dummy Product {page_num}"}] if page_num <= 3 else []
+
+    monkeypatch.setattr("utils.extract.scrape_page", dummy_scrape_page)
+
+    results = scrape_all_pages(max_pages=10, done_pages={1: [{"title": "Saved 1"}], 2: [{"title": "Saved 2"}]},
+                               on_page=lambda page, data: reported.append((page, len(data))))
+
+    assert calls == [3, 4]
+    assert [p["title"] for p in results] == ["Saved 1", "Saved 2", "Dummy Product 3"]
+    assert reported == [(1, 1), (2, 1), (3, 1), (4, 0)]
+
+
+def test_scrape_all_pages_concurrent_keeps_order(monkeypatch):
+    """Mode paralel tetap mengembalikan produk berurutan sesuai nomor halaman."""
+    def dummy_scrape_page(page_num):
+        time.sleep(0.01 * (10 - page_num))
+        return [{"title": f"Dummy Product {page_num}"}]
+
+    monkeypatch.setattr("utils.extract.scrape_page", dummy_scrape_page)
+
+    results = scrape_all_pages(max_pages=9, max_workers=4)
+
+    assert [r["title"] for r in results] == [f"Dummy Product {i}" for i in range(1, 10)]
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    """RateLimiter memberi jarak antar request ke host yang sama."""
+    limiter = RateLimiter(rate=20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait("http://example.com/page1")
+    limiter.wait("http://other.com/")
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 4 * 0.05 - 0.01
+    assert elapsed < 0.5
+
+
+def test_rate_limiter_invalid_rate():
+    """Rate nol atau negatif harus raise ValueError."""
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_scrape_all_pages_local_site_stops_at_404(local_site):
+    """Scraping ke server lokal berhenti di halaman 404 pertama."""
+    results = scrape_all_pages(max_pages=50, max_workers=8)
+
+    assert len(results) == local_site["pages"] * 2
+    assert results[0]["title"] == "Product 1-0"
+    assert results[-1]["title"] == f"Product {local_site['pages']}-1"
+    assert max(local_site["hits"]) < local_site["pages"] + 8 + 1
+
+
+def test_scrape_all_pages_fetches_pages_concurrently(local_site):
+    """
+    Mode paralel benar-benar mengirim banyak request bersamaan dengan hasil yang sama dengan mode berurutan.
+    Speedup wall-clock diukur di benchmarks/bench_async.py (engine threads, concurrency 1 vs 16), bukan di
+    test, agar tidak flaky di mesin lambat.
+    """
+    sequential = scrape_all_pages(max_pages=local_site["pages"])
+    assert local_site["active"]["max"] == 1
+
+    concurrent = scrape_all_pages(max_pages=local_site["pages"], max_workers=16)
+
+    assert [p["title"] for p in concurrent] == [p["title"] for p in sequential]
+    # Setiap request ditahan 50 ms oleh server, jadi worker yang berjalan bersamaan saling tumpang tindih
+    assert local_site["active"]["max"] >= 8
+
+
+def test_fetch_url_retries_on_5xx_then_succeeds():
+    """fetch_url mencoba ulang saat server membalas 503 lalu berhasil."""
+    with requests_mock.Mocker() as m:
+        m.get("https://fashion-studio.dicoding.dev/", [
+            {"status_code": 503},
+            {"status_code": 429},
+            {"status_code": 200, "text": "ok"}
+        ])
+        response, attempts, elapsed = fetch_url("https://fashion-studio.dicoding.dev/")
+
+    assert response.text == "ok"
+    assert attempts == 3
+    assert elapsed >= 0
+
+
+def test_fetch_url_does_not_retry_404():
+    """Status 404 tidak dicoba ulang."""
+    with requests_mock.Mocker() as m:
+        m.get("https://fashion-studio.dicoding.dev/", status_code=404)
+        with pytest.raises(FetchError) as exc_info:
+            fetch_url("https://fashion-studio.dicoding.dev/")
+
+    assert exc_info.value.attempts == 1
+    assert m.call_count == 1
+
+
+def test_scrape_page_timeout_is_retried():
+    """Timeout dicoba ulang sampai MAX_RETRIES sebelum halaman dianggap gagal."""
+    with requests_mock.Mocker() as m:
+        m.get("https://fashion-studio.dicoding.dev/", exc=requests.exceptions.ConnectTimeout)
+        results = scrape_page(1)
+
+    assert results == []
+    assert results.attempts == 4
+    assert m.call_count == 4
+
+
+def test_scrape_all_pages_reports_page_stats(mock_product_html):
+    """scrape_all_pages mengisi ringkasan attempts, latency dan bytes per halaman."""
+    body = f"<html><body>{mock_product_html}</body></html>"
+    with requests_mock.Mocker() as m:
+        m.get("https://fashion-studio.dicoding.dev/", [{"status_code": 500}, {"text": body}])
+        m.get("https://fashion-studio.dicoding.dev/page2", text=body)
+        m.get("https://fashion-studio.dicoding.dev/page3", status_code=404)
+        stats = []
+        results = scrape_all_pages(max_pages=5, stats=stats)
+
+    assert len(results) == 2
+    assert [s["page"] for s in stats] == [1, 2, 3]
+    assert stats[0]["attempts"] == 2
+    assert stats[0]["bytes"] == len(body.encode())
+    assert stats[0]["parse_seconds"] > 0
+    assert stats[2]["status_code"] == 404
+    assert stats[2]["error"] is not None
+
+
+def test_get_session_is_shared_and_grows_pool():
+    """Session bersama dipakai ulang dan dibuat ulang jika pool perlu lebih besar."""
+    first = get_session(pool_size=2)
+    assert get_session(pool_size=1) is first
+    bigger = get_session(pool_size=64)
+    assert bigger is not first
+    assert bigger.get_adapter("https://example.com")._pool_maxsize == 64
+
+
+def test_scrape_page_conditional_get_uses_cache(tmp_path, monkeypatch, mock_product_html):
+    """Balasan 304 memakai produk dari cache tanpa download dan parse ulang."""
+    body = f"<html><body>{mock_product_html}</body></html>"
+
+    def respond(request, context):
+        if request.headers.get("If-None-Match") == '"v1"':
+            context.status_code = 304
+            return ""
+        context.headers["ETag"] = '"v1"'
+        return body
+
+    enable_page_cache(str(tmp_path / "pages.sqlite"))
+    try:
+        with requests_mock.Mocker() as m:
+            m.get("https://fashion-studio.dicoding.dev/", text=respond)
+            first = scrape_page(1)
+
+            parse_calls = []
+            monkeypatch.setattr("utils.extract.parse_products", lambda *a, **k: parse_calls.append(a) or [])
+            second = scrape_page(1)
+    finally:
+        disable_page_cache()
+
+    assert not first.cache_hit
+    assert second.cache_hit
+    assert second.status_code == 304
+    assert second.bytes == 0
+    assert parse_calls == []
+    assert [dict(p, timestamp=None) for p in second] == [dict(p, timestamp=None) for p in first]
+    assert m.request_history[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_iter_product_chunks_groups_pages(monkeypatch):
+    """Produk dikelompokkan per chunk halaman dan berhenti di halaman kosong."""
+    def dummy_scrape_page(page_num):
+        return [{"title": f"Dummy Product {page_num}"}] if page_num <= 5 else []
+
+    monkeypatch.setattr("utils.extract.scrape_page", dummy_scrape_page)
+
+    stats = []
+    chunks = list(iter_product_chunks(chunk_pages=2, max_pages=10, stats=stats))
+
+    assert [[p["title"] for p in chunk] for chunk in chunks] == [
+        ["Dummy Product 1", "Dummy Product 2"],
+        ["Dummy Product 3", "Dummy Product 4"],
+        ["Dummy Product 5"],
+    ]
+    assert len(stats) == 6
+
+
+def test_scrape_all_pages_parse_pool_keeps_order_and_dicts(local_site):
+    """Parsing di process pool menghasilkan produk dan urutan yang sama dengan parsing di thread."""
+    threaded_stats, pooled_stats = [], []
+    threaded = scrape_all_pages(max_pages=50, max_workers=8, stats=threaded_stats)
+    pooled = scrape_all_pages(max_pages=50, max_workers=8, parse_workers=2, stats=pooled_stats)
+
+    strip = lambda products: [{k: v for k, v in p.items() if k != "timestamp"} for p in products]
+    assert len(pooled) == local_site["pages"] * 2
+    assert strip(pooled) == strip(threaded)
+    assert list(pooled[0]) == ["title", "price", "rating", "colors", "size", "gender", "timestamp"]
+    assert [s["page"] for s in pooled_stats] == [s["page"] for s in threaded_stats]
+    assert all(s["parse_seconds"] > 0 for s in pooled_stats if s["products"])
+
+
+def test_iter_product_chunks_streams_before_scraping_finishes(local_site):
+    """Chunk pertama sudah tersedia sebelum semua halaman selesai di-scrape."""
+    chunks = iter_product_chunks(chunk_pages=1, max_pages=local_site["pages"], max_workers=2)
+    first = next(chunks)
+    hits_after_first = len(local_site["hits"])
+    chunks.close()
+
+    assert first[0]["title"] == "Product 1-0"
+    assert hits_after_first < local_site["pages"]
+
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+import pytest
+from utils.extract import scrape_all_pages
+
+pytest.importorskip("aiohttp")
+from benchmarks.stub_server import AsyncStubServer  # noqa: E402
+from utils.extract_async import (  # noqa: E402
+    AsyncRateLimiter, create_async_session, scrape_all_pages_async, scrape_all_pages_sync, scrape_page_async
+)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Hilangkan jeda backoff agar test retry tetap cepat."""
+    monkeypatch.setattr("utils.extract.BACKOFF_FACTOR", 0)
+
+
+@pytest.fixture
+def async_site(monkeypatch):
+    """Server asyncio lokal dengan 10 halaman fixture dan latensi 50 ms; halaman 3 membalas 503 sekali."""
+    with AsyncStubServer(pages=10, latency=0.05, fail_first={3: [503]}) as server:
+        monkeypatch.setattr("utils.extract.BASE_URL", server.base_url)
+        yield server
+
+
+def _strip_timestamp(products):
+    return [{k: v for k, v in product.items() if k != "timestamp"} for product in products]
+
+
+def test_async_matches_thread_engine(async_site):
+    """Engine asyncio menghasilkan produk dan urutan halaman yang sama dengan engine thread."""
+    async_stats, thread_stats = [], []
+    products = scrape_all_pages_sync(max_pages=50, max_workers=8, stats=async_stats)
+    async_site.fail_first[3] = [503]
+    expected = scrape_all_pages(max_pages=50, max_workers=8, stats=thread_stats)
+
+    assert len(products) == 10 * 20
+    assert _strip_timestamp(products) == _strip_timestamp(expected)
+    assert [page["page"] for page in async_stats] == list(range(1, 12))
+    assert async_stats[2]["attempts"] == 2
+    assert async_stats[-1]["status_code"] == 404
+
+
+def test_semaphore_bounds_concurrency_and_speeds_up(async_site):
+    """Jumlah request bersamaan tidak melebihi max_workers, dan concurrency memangkas waktu total."""
+    start = time.perf_counter()
+    scrape_all_pages_sync(max_pages=50, max_workers=1)
+    sequential = time.perf_counter() - start
+    assert async_site.max_active == 1
+
+    async_site.max_active = 0
+    start = time.perf_counter()
+    scrape_all_pages_sync(max_pages=50, max_workers=4)
+    concurrent = time.perf_counter() - start
+
+    assert async_site.max_active == 4
+    assert concurrent < sequential / 2.5
+
+
+def test_embedded_in_running_loop_with_shared_session(async_site):
+    """Service asyncio bisa memakai session sendiri untuk beberapa panggilan sekaligus."""
+    async def service():
+        session = create_async_session(pool_size=8)
+        try:
+            first, second = await asyncio.gather(
+                scrape_all_pages_async(max_pages=5, max_workers=4, stop_on_empty=False, session=session),
+                scrape_all_pages_async(max_pages=5, max_workers=4, stop_on_empty=False, session=session),
+            )
+            page = await scrape_page_async(12, session)
+            assert not session.closed
+            return first, second, page
+        finally:
+            await session.close()
+
+    first, second, missing = asyncio.run(service())
+    assert len(first) == len(second) == 5 * 20
+    assert missing == [] and missing.status_code == 404
+
+
+def test_parsing_and_cache_io_run_off_the_event_loop(async_site, tmp_path, monkeypatch):
+    """Tanpa parse_pool, parsing dan baca/tulis PageCache berjalan di thread lain, bukan di thread event loop."""
+    import utils.extract_async as extract_async
+    from utils.cache import PageCache
+
+    threads = []
+
+    def recording(function):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return function(*args, **kwargs)
+        return wrapper
+
+    cache = PageCache(str(tmp_path / "pages.sqlite"))
+    monkeypatch.setattr(cache, "get", recording(cache.get))
+    monkeypatch.setattr(cache, "put", recording(cache.put))
+    monkeypatch.setattr("utils.extract.PAGE_CACHE", cache)
+    monkeypatch.setattr(extract_async, "parse_products", recording(extract_async.parse_products))
+
+    async def scrape():
+        session = create_async_session(pool_size=2)
+        try:
+            return await scrape_page_async(1, session), threading.current_thread()
+        finally:
+            await session.close()
+
+    page, loop_thread = asyncio.run(scrape())
+    assert len(page) == 20
+    assert len(threads) >= 2 and loop_thread not in threads
+
+
+def test_done_pages_and_on_page(async_site):
+    """Halaman dari checkpoint tidak di-request ulang dan setiap halaman dilaporkan berurutan."""
+    reported = []
+    products = scrape_all_pages_sync(max_pages=3, max_workers=3, stop_on_empty=False,
+                                     done_pages={2: [{"title": "Saved"}]},
+                                     on_page=lambda page, data: reported.append(page))
+
+    assert 2 not in async_site.hits
+    assert reported == [1, 2, 3]
+    assert products[20] == {"title": "Saved"}
+
+
+def test_async_rate_limiter_spaces_requests():
+    """Request ke host yang sama diberi jarak 1/rate detik tanpa memblokir event loop."""
+    limiter = AsyncRateLimiter(rate=20)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.wait("http://example.com/page") for _ in range(5)))
+        await limiter.wait("http://other.com/")
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.18 <= elapsed < 0.4
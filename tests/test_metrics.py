@@ -0,0 +1,104 @@
+import json
+import time
+import pytest
+from utils.metrics import PipelineMetrics, profile_run
+
+
+def test_stage_records_wall_cpu_and_rows():
+    """Setiap stage mencatat waktu wall, CPU dan jumlah baris yang diisi pemanggil."""
+    metrics = PipelineMetrics(run_id="test")
+    for item in (1, 2):
+        with metrics.stage("transform", item=item) as record:
+            record["rows_in"] = 10
+            sum(i * i for i in range(200_000))
+            time.sleep(0.02)
+            record["rows_out"] = 8
+
+    summary = metrics.stage_summary()["transform"]
+    assert summary["calls"] == 2
+    assert summary["rows_in"] == 20 and summary["rows_out"] == 16
+    assert summary["wall_seconds"] >= 0.04
+    assert 0 < summary["cpu_seconds"] < summary["wall_seconds"]
+    assert [r["item"] for r in metrics.records] == [1, 2]
+
+
+def test_stage_records_errors():
+    """Stage yang gagal tetap tercatat beserta errornya, lalu exception diteruskan."""
+    metrics = PipelineMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.stage("load"):
+            raise RuntimeError("database down")
+
+    assert metrics.records[0]["error"] == "RuntimeError: database down"
+    assert metrics.stage_summary()["load"]["errors"] == 1
+
+
+@pytest.fixture
+def filled_metrics():
+    """PipelineMetrics berisi data dari semua stage."""
+    metrics = PipelineMetrics(run_id="run-1")
+    with metrics.stage("extract") as record:
+        record["rows_out"] = 40
+        record["bytes"] = 2048
+    metrics.add_pages([
+        {"page": 1, "bytes": 1024, "cache_hit": True, "error": None},
+        {"page": 2, "bytes": 1024, "cache_hit": False, "error": "404"},
+    ])
+    metrics.add_transform_stats({"rows_in": 40, "rows_out": 30, "dropped": {"null": 4, "duplicate": 6}})
+    metrics.add_transform_stats({"rows_in": 5, "rows_out": 5, "dropped": {"null": 1}})
+    metrics.add_sink_results([
+        {"sink": "csv", "rows": 30, "seconds": 0.1, "error": None},
+        {"sink": "postgres", "rows": 0, "seconds": 2.0, "error": "Timeout"},
+    ])
+    metrics.finish()
+    return metrics
+
+
+def test_json_report(tmp_path, filled_metrics):
+    """Laporan JSON memuat ringkasan stage, halaman, aturan filter dan sink."""
+    path = tmp_path / "reports" / "run-1.json"
+    filled_metrics.write_json(str(path))
+
+    report = json.loads(path.read_text())
+    assert report["run_id"] == "run-1"
+    assert report["stages"]["extract"]["bytes"] == 2048
+    assert report["filter_drops"] == {"null": 5, "duplicate": 6}
+    assert report["sinks"]["postgres"]["errors"] == 1
+    assert len(report["pages"]) == 2
+
+
+def test_prometheus_text(tmp_path, filled_metrics):
+    """Format teks Prometheus berisi HELP/TYPE dan sampel berlabel."""
+    text = filled_metrics.to_prometheus()
+
+    assert "# TYPE etl_stage_wall_seconds gauge" in text
+    # Semua seri `_total` bertipe counter, sisanya gauge
+    types = dict(line.split()[2:4] for line in text.splitlines() if line.startswith("# TYPE"))
+    assert {name for name, kind in types.items() if kind == "counter"} == {
+        name for name in types if name.endswith("_total")
+    } == {"etl_pages_total", "etl_pages_failed_total", "etl_pages_cache_hits_total", "etl_sink_errors_total"}
+    assert 'etl_stage_bytes{stage="extract"} 2048' in text
+    assert 'etl_filter_dropped_rows{rule="null"} 5' in text
+    assert 'etl_sink_rows_written{sink="csv"} 30' in text
+    assert 'etl_sink_errors_total{sink="postgres"} 1' in text
+    assert "etl_pages_cache_hits_total 1" in text
+    assert "etl_pages_failed_total 1" in text
+
+    path = tmp_path / "metrics.prom"
+    filled_metrics.write_prometheus(str(path))
+    assert path.read_text().startswith("# HELP etl_stage_wall_seconds")
+    assert not (tmp_path / "metrics.prom.tmp").exists()
+
+
+def test_profile_run_cprofile_and_tracemalloc(tmp_path):
+    """profile_run menyimpan file cProfile dan mencatat alokasi memori terbesar."""
+    metrics = PipelineMetrics()
+    path = tmp_path / "run.prof"
+
+    with profile_run(metrics, cprofile_path=str(path), trace_memory=True, top=5):
+        data = [str(i) * 10 for i in range(50_000)]
+
+    assert path.exists() and path.stat().st_size > 0
+    assert metrics.profile["peak_memory_bytes"] > 1_000_000
+    assert len(metrics.profile["top_allocations"]) == 5
+    assert len(data) == 50_000
@@ -0,0 +1,78 @@
+import pytest
+from pathlib import Path
+from utils.parsers import (
+    parse_products, parse_products_bs4, parse_products_lxml, available_backends, parse_product_rows,
+    rows_to_products
+)
+
+FIXTURE_PAGE = Path(__file__).parent / "fixtures" / "fashion_studio_page.html"
+TIMESTAMP = "2025-05-22T10:00:00"
+
+requires_lxml = pytest.mark.skipif("lxml" not in available_backends(), reason="lxml tidak terpasang")
+
+
+@pytest.fixture
+def fixture_html():
+    """HTML halaman katalog yang disimpan sebagai fixture."""
+    return FIXTURE_PAGE.read_text(encoding="utf-8")
+
+
+def test_bs4_parses_fixture_page(fixture_html):
+    """Parser bs4 mengambil semua card beserta produk invalid apa adanya."""
+    products = parse_products_bs4(fixture_html, TIMESTAMP)
+
+    assert len(products) == 20
+    assert products[0]["title"] == "T-shirt 2"
+    assert products[0]["rating"] == "Rating: ⭐ 3.9 / 5"
+    assert products[5]["title"] == "Unknown Product"
+    assert products[5]["price"] == "Price Unavailable"
+    assert all(p["timestamp"] == TIMESTAMP for p in products)
+
+
+@requires_lxml
+def test_lxml_matches_bs4_on_fixture_page(fixture_html):
+    """Backend lxml menghasilkan dictionary produk yang identik dengan bs4."""
+    assert parse_products_lxml(fixture_html, TIMESTAMP) == parse_products_bs4(fixture_html, TIMESTAMP)
+
+
+@requires_lxml
+@pytest.mark.parametrize("html", [
+    # Harga di container kosong, fallback ke p.price
+    '<div class="collection-card"><h3 class="product-title"> A </h3>'
+    '<div class="price-container"><span class="price"> </span></div>'
+    '<p class="price">$1.00</p><p>Size: S</p></div>',
+    # Container kosong dan tidak ada p.price
+    '<div class="collection-card"><div class="price-container"><span class="price"></span></div>'
+    '<p>Rating: 4</p><p>Rating: 5</p></div>',
+    # Field hilang, class ganda, dan komentar HTML
+    '<div class="card collection-card"><!-- note --><h3 class="product-title x">B <b>bold</b></h3>'
+    '<p>2 Colors</p><p>Gender: Men</p></div>',
+    # Tanpa card sama sekali
+    '<html><body><p>Rating: 5</p></body></html>',
+    '',
+])
+def test_lxml_matches_bs4_on_edge_cases(html):
+    """Backend lxml tetap identik dengan bs4 pada kasus tepi."""
+    assert parse_products_lxml(html, TIMESTAMP) == parse_products_bs4(html, TIMESTAMP)
+
+
+def test_parse_products_default_backend(fixture_html):
+    """Tanpa backend eksplisit dipakai backend tercepat yang tersedia."""
+    products = parse_products(fixture_html, TIMESTAMP)
+    assert products == parse_products(fixture_html, TIMESTAMP, backend="bs4")
+
+
+def test_parse_products_unknown_backend():
+    """Backend yang tidak dikenal harus raise ValueError."""
+    with pytest.raises(ValueError, match="Backend parser tidak dikenal"):
+        parse_products("", TIMESTAMP, backend="regex")
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_product_rows_round_trip_to_dicts(fixture_html, backend):
+    """Tuple ringkas dari bytes HTML kembali menjadi dictionary yang identik dengan parse_products."""
+    rows, parse_seconds = parse_product_rows(fixture_html.encode("utf-8"), "utf-8", backend=backend)
+
+    assert all(type(row) is tuple and len(row) == 6 for row in rows)
+    assert parse_seconds > 0
+    assert rows_to_products(rows, TIMESTAMP) == parse_products(fixture_html, TIMESTAMP, backend=backend)
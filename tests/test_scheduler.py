@@ -0,0 +1,185 @@
+import argparse
+import fcntl
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+import pandas as pd
+import pytest
+from benchmarks.stub_server import StubServer
+from utils.metrics import PipelineMetrics
+from utils.scheduler import CronSchedule, IntervalSchedule, Scheduler, parse_schedule, serve_health
+
+
+def timestamp(*args):
+    """Unix timestamp dari tanggal dan waktu lokal."""
+    return datetime(*args).timestamp()
+
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("*/15 * * * *", (2026, 10, 17, 12, 7), (2026, 10, 17, 12, 15)),
+    ("*/15 * * * *", (2026, 10, 17, 12, 15), (2026, 10, 17, 12, 30)),
+    ("0 9-17 * * mon-fri", (2026, 10, 17, 12, 0), (2026, 10, 19, 9, 0)),
+    ("30 2 1 * *", (2026, 12, 5, 0, 0), (2027, 1, 1, 2, 30)),
+    ("@daily", (2026, 10, 17, 23, 59), (2026, 10, 18, 0, 0)),
+    ("0 0 29 feb *", (2026, 3, 1, 0, 0), (2028, 2, 29, 0, 0)),
+    # Tanggal dan hari sama-sama dibatasi: salah satu cukup (tanggal 13 atau hari Jumat)
+    ("0 0 13 * 5", (2026, 10, 17, 0, 0), (2026, 10, 23, 0, 0)),
+    ("0 0 * * 7", (2026, 10, 17, 0, 0), (2026, 10, 18, 0, 0)),
+])
+def test_cron_next_after(expression, after, expected):
+    """Waktu run berikutnya dari ekspresi cron sesuai kalender, termasuk aturan tanggal atau hari."""
+    assert CronSchedule(expression).next_after(timestamp(*after)) == timestamp(*expected)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *", "0 0 * * funday",
+                                        "0 0 30 2 *"])
+def test_invalid_cron(expression):
+    """Ekspresi cron yang salah format atau tidak pernah terjadi harus raise ValueError."""
+    with pytest.raises(ValueError):
+        CronSchedule(expression).next_after(time.time())
+
+
+def test_parse_schedule():
+    """Teks jadwal dibaca sebagai interval (dengan satuan) atau ekspresi cron."""
+    assert parse_schedule("every 15m").seconds == 900
+    assert parse_schedule("30s").seconds == 30
+    assert parse_schedule("2h").seconds == 7200
+    assert parse_schedule("90").seconds == 90
+    assert isinstance(parse_schedule("0 * * * *"), CronSchedule)
+    with pytest.raises(ValueError):
+        parse_schedule("every 0s")
+    with pytest.raises(ValueError):
+        parse_schedule("sometimes")
+
+
+def test_runs_never_overlap_and_missed_slots_are_skipped():
+    """Run yang lebih lama dari interval tidak ditumpuk; jadwal yang terlewat dihitung missed_slots."""
+    active, overlaps, starts = [0], [0], []
+
+    def job():
+        active[0] += 1
+        overlaps[0] = max(overlaps[0], active[0])
+        starts.append(time.monotonic())
+        time.sleep(0.12)
+        active[0] -= 1
+
+    scheduler = Scheduler(job, IntervalSchedule(0.05), max_runs=3)
+    scheduler.run_forever()
+
+    assert scheduler.runs == 3 and overlaps[0] == 1
+    assert scheduler.missed_slots >= 2 and scheduler.lock_skips == 0
+    assert all(later - earlier >= 0.12 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_failed_run_is_recorded_and_scheduler_continues():
+    """Run yang gagal dicatat di failures dan scheduler tetap menjalankan run berikutnya."""
+    outcomes = iter([ValueError("boom"), "ok"])
+
+    def job():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    scheduler = Scheduler(job, IntervalSchedule(0.01), max_runs=2)
+    scheduler.run_forever()
+    assert scheduler.failures == 1 and scheduler.runs == 2
+    assert scheduler.last_result == "ok" and scheduler.status()["status"] == "ok"
+
+
+def test_jitter_delays_start_within_bound(monkeypatch):
+    """Jitter menggeser waktu mulai run secara acak, tidak lebih dari batasnya."""
+    waits = []
+    scheduler = Scheduler(lambda: None, IntervalSchedule(10), jitter=5, max_runs=1, seed=1)
+    monkeypatch.setattr(scheduler._stop, "wait", lambda timeout: waits.append(timeout) or False)
+    scheduler.run_forever()
+    assert 0 < waits[0] <= 5
+
+
+def test_lock_held_by_other_process_skips_run(tmp_path):
+    """Run dilewati dan dihitung lock_skips selama proses lain memegang file lock."""
+    path = tmp_path / "locks" / "scheduler.lock"
+    path.parent.mkdir()
+    calls = []
+    scheduler = Scheduler(lambda: calls.append(1), IntervalSchedule(1), lock_path=str(path))
+    with open(path, "a") as other:
+        fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert scheduler.run_once() is False
+    assert scheduler.run_once() is True
+    assert calls == [1] and scheduler.lock_skips == 1 and scheduler.missed_slots == 0
+
+
+def test_stop_interrupts_wait():
+    """stop() menghentikan scheduler yang sedang menunggu jadwal berikutnya."""
+    scheduler = Scheduler(lambda: None, CronSchedule("0 0 1 1 *"))
+    thread = threading.Thread(target=scheduler.run_forever)
+    thread.start()
+    time.sleep(0.05)
+    scheduler.stop()
+    thread.join(timeout=2)
+    assert not thread.is_alive() and scheduler.runs == 0
+
+
+def test_health_and_metrics_endpoint():
+    """Endpoint /health memberi status JSON (503 saat gagal) dan /metrics teks Prometheus."""
+    metrics = PipelineMetrics(run_id="r1")
+    metrics.add_transform_stats({"dropped": {"null": 3}})
+    scheduler = Scheduler(lambda: metrics, IntervalSchedule(60))
+    scheduler.run_once()
+    server = serve_health(scheduler, 0)
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with urllib.request.urlopen(f"{base}/health") as response:
+            status = json.load(response)
+        assert status["status"] == "ok" and status["runs"] == 1
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            text = response.read().decode()
+        assert "etl_scheduler_runs_total 1" in text
+        assert "# TYPE etl_scheduler_runs_total counter" in text
+        assert "# TYPE etl_scheduler_lock_skips_total counter" in text
+        assert "# TYPE etl_scheduler_missed_slots_total counter" in text
+        assert "# TYPE etl_scheduler_running gauge" in text
+        assert 'etl_filter_dropped_rows{rule="null"} 3' in text
+
+        scheduler.job = lambda: 1 / 0
+        scheduler.run_once()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/health")
+        assert error.value.code == 503
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_run_scheduler_reuses_warm_sinks(tmp_path, monkeypatch):
+    """Daemon memakai sink yang sama di setiap run; setiap run tetap menulis ulang CSV dari awal."""
+    import main
+    import utils.extract as extract
+    from utils.sinks import CsvSink
+
+    created = []
+    original_init = CsvSink.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        created.append(self)
+        original_init(self, *args, **kwargs)
+
+    csv_path = tmp_path / "products.csv"
+    monkeypatch.setattr(CsvSink, "__init__", tracking_init)
+    monkeypatch.setattr(main, "SINK_OPTIONS", {"csv": {"filename": str(csv_path)}})
+    monkeypatch.setattr(main, "SCRAPE_OPTIONS", {"max_workers": 2})
+    args = argparse.Namespace(stream=False, compact=False, incremental=False, chunk_pages=5, run_id=None,
+                              metrics_dir=None, profile=False, trace_memory=False, jitter=0.0,
+                              lock_file=str(tmp_path / "scheduler.lock"), health_port=None, health_host="127.0.0.1",
+                              max_runs=2)
+    with StubServer(pages=2) as server:
+        monkeypatch.setattr(extract, "BASE_URL", server.base_url)
+        main.run_scheduler(IntervalSchedule(0.01), args, ["csv"])
+        assert server.hits.count(1) == 2
+
+    assert len(created) == 1
+    # Satu run saja: 2 halaman x 19 produk valid, bukan ditambahkan ke hasil run pertama
+    assert len(pd.read_csv(csv_path)) == 38
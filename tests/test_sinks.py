@@ -0,0 +1,162 @@
+import time
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from utils.sinks import Sink, SINKS, register_sink, create_sinks, run_sinks, close_sinks, GoogleSheetsSink
+from tests.fake_sheets import FakeSheetsService
+
+
+@pytest.fixture
+def sample_df():
+    """Fixture sample DataFrame untuk testing."""
+    return pd.DataFrame([{
+        "title": f"Product {i}", "price": 7802560.0, "rating": 4.5, "colors": 2,
+        "size": "M", "gender": "Men", "timestamp": "2025-05-22T10:00:00"
+    } for i in range(3)])
+
+
+class SlowSink(Sink):
+    """Sink tiruan yang menunggu sebentar lalu menyimpan DataFrame yang diterima."""
+
+    def __init__(self, name, delay=0.0, error=None, timeout=5):
+        super().__init__(timeout)
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.received = []
+
+    def _load(self, df):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.received.append(df)
+
+
+def test_run_sinks_runs_in_parallel(sample_df):
+    """Semua sink berjalan bersamaan sehingga total waktu mendekati sink paling lambat."""
+    sinks = [SlowSink(f"slow{i}", delay=0.3) for i in range(3)]
+
+    start = time.perf_counter()
+    results = run_sinks(sample_df, sinks)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6
+    assert [r["sink"] for r in results] == ["slow0", "slow1", "slow2"]
+    assert all(r["rows"] == 3 and r["error"] is None and r["seconds"] >= 0.3 for r in results)
+
+
+def test_run_sinks_isolates_failures_and_timeouts(sample_df):
+    """Sink yang gagal atau melewati timeout tidak memengaruhi hasil sink lain."""
+    ok = SlowSink("ok", delay=0.05)
+    broken = SlowSink("broken", error=RuntimeError("database down"))
+    hung = SlowSink("hung", delay=2, timeout=0.2)
+
+    start = time.perf_counter()
+    results = {r["sink"]: r for r in run_sinks(sample_df, [hung, broken, ok])}
+
+    assert time.perf_counter() - start < 1
+    assert results["ok"] == {"sink": "ok", "rows": 3, "seconds": results["ok"]["seconds"], "error": None}
+    assert results["broken"]["rows"] == 0
+    assert results["broken"]["error"] == "RuntimeError: database down"
+    assert "Timeout" in results["hung"]["error"]
+    assert len(ok.received) == 1
+
+
+
+def test_run_sinks_skips_sink_while_timed_out_call_is_running(sample_df):
+    """Chunk berikutnya tidak masuk ke sink yang pemanggilan sebelumnya masih berjalan setelah timeout."""
+    slow = SlowSink("slow", delay=0.5, timeout=0.1)
+    ok = SlowSink("ok")
+
+    first = {r["sink"]: r for r in run_sinks(sample_df, [slow, ok])}
+    second = {r["sink"]: r for r in run_sinks(sample_df.head(1), [slow, ok])}
+
+    assert "Timeout" in first["slow"]["error"]
+    assert "Dilewati" in second["slow"]["error"] and second["slow"]["rows"] == 0
+    assert second["ok"]["error"] is None and len(ok.received) == 2
+
+    # Setelah pemanggilan lama selesai, sink dipakai lagi seperti biasa
+    slow.inflight.join()
+    slow.delay = 0.0
+    third = run_sinks(sample_df.head(2), [slow])[0]
+    assert third["error"] is None and slow.inflight is None
+    assert [len(df) for df in slow.received] == [3, 2]
+
+
+def test_create_sinks_uses_registry(monkeypatch, sample_df):
+    """Sink baru yang didaftarkan lewat register_sink langsung bisa dipakai."""
+    monkeypatch.setattr("utils.sinks.SINKS", dict(SINKS))
+
+    @register_sink("memory")
+    class MemorySink(Sink):
+        def __init__(self, store, timeout=5):
+            super().__init__(timeout)
+            self.store = store
+
+        def _load(self, df):
+            self.store.append(len(df))
+
+    store = []
+    sinks = create_sinks(["memory"], {"memory": {"store": store}})
+    run_sinks(sample_df, sinks)
+    run_sinks(sample_df, sinks)
+
+    assert store == [3, 3]
+    assert sinks[0].rows_loaded == 6
+
+
+def test_create_sinks_unknown_name():
+    """Nama sink yang tidak terdaftar harus raise ValueError."""
+    with pytest.raises(ValueError, match="Sink tidak dikenal"):
+        create_sinks(["csv", "ftp"])
+
+
+def test_csv_sink_overwrites_then_appends(tmp_path, sample_df):
+    """Load pertama menimpa file CSV lama, load berikutnya menambahkan baris."""
+    path = tmp_path / "products.csv"
+    path.write_text("old,data\n1,2\n")
+    sinks = create_sinks(["csv"], {"csv": {"filename": str(path)}})
+
+    run_sinks(sample_df, sinks)
+    run_sinks(sample_df, sinks)
+
+    assert len(pd.read_csv(path)) == 6
+
+
+def test_google_sheets_sink_writes_chunks_consecutively(sample_df):
+    """Chunk berikutnya ditulis tepat di bawah chunk sebelumnya."""
+    service = FakeSheetsService()
+    sink = GoogleSheetsSink("spreadsheet_id", "Sheet1!A2:J", service=service)
+
+    run_sinks(sample_df, [sink])
+    run_sinks(sample_df.assign(title="Next"), [sink])
+
+    rows = service.rows("Sheet1!A2:G")
+    assert [row[0] for row in rows] == ["Product 0", "Product 1", "Product 2", "Next", "Next", "Next"]
+
+
+@patch("utils.sinks.PostgresLoader")
+def test_postgres_sink_reuses_loader_and_closes(mock_loader, sample_df):
+    """PostgresSink membuat satu loader untuk semua load dan menutupnya di akhir."""
+    sinks = create_sinks(["postgres"], {"postgres": {"table_name": "products"}})
+
+    run_sinks(sample_df, sinks)
+    run_sinks(sample_df, sinks)
+    close_sinks(sinks)
+
+    mock_loader.assert_called_once_with(table_name="products", mode="bulk")
+    assert mock_loader.return_value.load.call_count == 2
+    mock_loader.return_value.close.assert_called_once()
+
+
+def test_parquet_sink_appends_every_chunk(tmp_path, sample_df):
+    """Setiap load menulis file baru sehingga chunk dan run berikutnya tidak menimpa data lama."""
+    pytest.importorskip("pyarrow")
+    from utils.load import read_parquet_history
+
+    sinks = create_sinks(["parquet"], {"parquet": {"root_path": str(tmp_path)}})
+    run_sinks(sample_df, sinks)
+    run_sinks(sample_df, sinks)
+    run_sinks(sample_df.head(1), create_sinks(["parquet"], {"parquet": {"root_path": str(tmp_path)}}))
+
+    assert len(read_parquet_history(str(tmp_path))) == 7
@@ -0,0 +1,150 @@
+import json
+import pickle
+import time
+import pytest
+from benchmarks.stub_server import FIXTURE_PAGE, StubServer
+from utils.parsers import available_backends, parse_products, parse_product_rows
+from utils.sites import (
+    FASHION_STUDIO, SiteConfig, css_to_xpath, load_site_configs, scrape_sites, iter_site_chunks, iter_site_pages
+)
+
+FIXTURE_HTML = FIXTURE_PAGE.read_text(encoding="utf-8")
+
+# Toko kedua dengan markup dan kata kunci berbeda, isi produknya sama dengan fixture
+OTHER_HTML = (
+    FIXTURE_HTML.replace('class="collection-card"', 'class="tile item"')
+    .replace('class="product-title"', 'class="name"')
+    .replace('class="price-container"', 'class="cost"')
+    .replace("Size:", "Ukuran:")
+)
+OTHER_CONFIG = {
+    "name": "other-store",
+    "base_url": "http://placeholder/",
+    "selectors": {"card": "div.tile.item", "title": "h3.name", "price": [".cost .price", "p.price"], "text": "p"},
+    "keywords": {"size": "Ukuran:"},
+}
+
+
+def strip_timestamp(products):
+    return [{k: v for k, v in p.items() if k != "timestamp"} for p in products]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_default_site_matches_builtin_parser(backend):
+    """Konfigurasi fashion-studio menghasilkan produk yang identik dengan parser bawaan."""
+    expected = parse_products(FIXTURE_HTML, "ts", backend=backend)
+    assert FASHION_STUDIO.parse(FIXTURE_HTML, "ts", backend=backend) == expected
+    assert len(expected) == 20
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_custom_selectors_and_keywords_are_normalized(backend):
+    """Selector dan kata kunci situs lain menghasilkan produk dengan format bawaan."""
+    site = SiteConfig.from_dict(OTHER_CONFIG)
+    assert site.parse(OTHER_HTML, "ts", backend=backend) == parse_products(FIXTURE_HTML, "ts", backend=backend)
+
+
+def test_site_config_survives_process_pool_pickling():
+    """SiteConfig bisa dikirim ke process pool parser."""
+    site = pickle.loads(pickle.dumps(SiteConfig.from_dict(OTHER_CONFIG)))
+    rows, _ = parse_product_rows(OTHER_HTML.encode(), "utf-8", site=site)
+    assert rows == parse_product_rows(FIXTURE_HTML.encode(), "utf-8")[0]
+
+
+def test_css_to_xpath_subset():
+    """Subset selector CSS diterjemahkan ke XPath; combinator lain ditolak."""
+    assert css_to_xpath("p") == "descendant::p"
+    assert " | " in css_to_xpath(".a .b, p.c")
+    with pytest.raises(ValueError):
+        css_to_xpath("div > p")
+
+
+def test_unsupported_selector_falls_back_to_bs4():
+    """Selector di luar subset XPath tetap berjalan lewat soupsieve."""
+    site = SiteConfig("child", "http://x/", card_selector="div.collection-grid > div.collection-card")
+    assert strip_timestamp(site.parse(FIXTURE_HTML, "ts", backend="lxml")) == \
+        strip_timestamp(parse_products(FIXTURE_HTML, "ts"))
+
+
+def test_site_config_validation(tmp_path):
+    """Selector tidak valid, konfigurasi tidak lengkap dan nama situs ganda harus raise ValueError."""
+    with pytest.raises(ValueError):
+        SiteConfig("bad", "http://x/", card_selector="div[")
+    with pytest.raises(ValueError):
+        SiteConfig.from_dict({"name": "bad", "base_url": "http://x/", "keywords": {"brand": "Brand:"}})
+    with pytest.raises(ValueError):
+        SiteConfig.from_dict({"name": "bad", "base_url": "http://x/", "selectors": {"image": "img"}})
+
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps([OTHER_CONFIG, OTHER_CONFIG]))
+    with pytest.raises(ValueError, match="ganda"):
+        load_site_configs(str(path))
+
+
+def test_build_page_url_pattern():
+    """Halaman pertama memakai base_url; halaman berikutnya mengikuti page_pattern."""
+    site = SiteConfig("q", "http://shop/", page_pattern="{base_url}catalog?page={page}")
+    assert site.build_page_url(1) == "http://shop/"
+    assert site.build_page_url(3) == "http://shop/catalog?page=3"
+
+
+@pytest.fixture
+def two_sites():
+    """Dua server lokal dengan jumlah halaman dan markup berbeda."""
+    with StubServer(pages=3, latency=0.02) as fashion, StubServer(pages=5, latency=0.02, html=OTHER_HTML) as other:
+        sites = [
+            SiteConfig("fashion-studio", fashion.base_url),
+            SiteConfig.from_dict(dict(OTHER_CONFIG, base_url=other.base_url)),
+        ]
+        yield sites, fashion, other
+
+
+def test_scrape_sites_tags_source_and_keeps_site_order(two_sites):
+    """Semua situs di-scrape dalam satu proses; produk diberi kolom source dan berurutan per situs."""
+    sites, fashion, other = two_sites
+    stats, saved = [], []
+    data = scrape_sites(sites, max_pages=10, max_workers=2, stats=stats,
+                        on_page=lambda page, products, source: saved.append((source, page)))
+
+    assert len(data) == (3 + 5) * 20
+    assert [p["source"] for p in data] == ["fashion-studio"] * 60 + ["other-store"] * 100
+    assert list(data[0]) == ["title", "price", "rating", "colors", "size", "gender", "timestamp", "source"]
+    assert strip_timestamp(data[60:80]) == [dict(p, source="other-store") for p in strip_timestamp(data[:20])]
+    assert sorted(page for source, page in saved if source == "other-store") == [1, 2, 3, 4, 5, 6]
+    assert {s["source"] for s in stats} == {"fashion-studio", "other-store"}
+    assert max(fashion.hits) <= 5 and max(other.hits) <= 7
+
+
+def test_scrape_sites_skips_done_pages(two_sites):
+    """Halaman yang sudah selesai per situs tidak diambil ulang dan hasilnya tetap disertakan."""
+    sites, fashion, other = two_sites
+    done = {"other-store": {1: [{"title": "cached", "source": "other-store"}]}}
+    data = scrape_sites(sites, max_pages=10, done_pages=done)
+    assert 1 not in other.hits
+    assert 1 in fashion.hits
+    assert {"title": "cached", "source": "other-store"} in data
+
+
+def test_iter_site_chunks_with_shared_parse_pool(two_sites):
+    """iter_site_chunks dengan pool parsing bersama menghasilkan semua produk dari kedua situs."""
+    sites, _, _ = two_sites
+    chunks = list(iter_site_chunks(sites, chunk_pages=2, max_pages=10, max_workers=2, parse_workers=1))
+    products = [p for chunk in chunks for p in chunk]
+    assert len(products) == 160
+    assert {p["source"] for p in products} == {"fashion-studio", "other-store"}
+
+
+def test_iter_site_pages_does_not_run_ahead_of_consumer():
+    """Antrian hasil dibatasi: thread situs menunggu konsumen, dan berhenti begitu generator ditutup."""
+    with StubServer(pages=50) as first, StubServer(pages=50) as second:
+        sites = [SiteConfig("first", first.base_url), SiteConfig("second", second.base_url)]
+        pages = iter_site_pages(sites, max_pages=50, max_workers=1)
+        next(pages)
+        time.sleep(0.3)
+        # Antrian 2 item + satu halaman yang menunggu di put per situs + satu halaman yang sedang diambil
+        assert len(first.hits) + len(second.hits) <= 8
+
+        start = time.perf_counter()
+        pages.close()
+        assert time.perf_counter() - start < 2
+        assert len(first.hits) < 50 and len(second.hits) < 50
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import pytest
+from unittest.mock import patch
+from benchmarks.bench_import import HEAVY_MODULES, PROJECT_ROOT, heavy_imports, import_profile, import_seconds
+
+
+@pytest.mark.parametrize("module", ["main", "utils.load", "utils.sinks", "utils.extract"])
+def test_import_does_not_load_sink_backends(module):
+    """Import modul pipeline tidak memuat SQLAlchemy, Google API client, aiohttp, pyarrow.dataset atau dotenv."""
+    assert heavy_imports(import_profile(f"import {module}")) == []
+
+
+def test_csv_only_run_does_not_load_other_backends():
+    """Membuat dan menjalankan sink CSV saja tidak memuat backend sink lain."""
+    code = (
+        "import sys, tempfile, os\n"
+        "import pandas as pd\n"
+        "from utils.sinks import create_sinks, run_sinks\n"
+        "path = os.path.join(tempfile.mkdtemp(), 'products.csv')\n"
+        "sinks = create_sinks(['csv'], {'csv': {'filename': path}})\n"
+        "run_sinks(pd.DataFrame({'title': ['a'], 'price': [1.0]}), sinks)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                               check=True)
+    assert completed.stdout.strip() == ""
+
+
+def test_backends_are_not_module_attributes():
+    """Backend tidak ada di namespace utils.load, sehingga patch lama seperti utils.load.create_engine gagal keras."""
+    import utils.load as load
+    for name in ("create_engine", "Credentials", "build", "MetaData", "pa"):
+        assert not hasattr(load, name)
+    with pytest.raises(AttributeError):
+        with patch("utils.load.create_engine"):
+            pass
+
+
+def test_main_import_time_is_dominated_by_required_dependencies():
+    """
+    Import main tidak lebih dari dua kali biaya pandas + requests (yang dibutuhkan setiap run) di proses yang sama.
+    Backend sink yang di-import saat startup (sqlalchemy, googleapiclient, pyarrow.dataset) melewati batas ini.
+    """
+    profile = min((import_profile("import main") for _ in range(3)), key=lambda modules: modules["main"])
+    required = profile["pandas"] + profile["requests"]
+    assert profile["main"] < 2 * required
+    assert 0 < import_seconds("utils.parsers", repeat=1) < profile["main"]
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
-from utils.transform import clean_and_transform
+from utils.transform import clean_and_transform, transform_stream, raw_row_hashes, COMPACT_DTYPES
+from benchmarks.synthetic import make_raw_catalogue
 
 
 def test_valid_data_transformation():
@@ -119,3 +120,158 @@ def test_transformation_error_handling(monkeypatch):
 
     with pytest.raises(Exception, match="Simulated error"):
         clean_and_transform(raw_data)
+
+
+def make_raw_product(title, price="$10.00", rating="Rating: ⭐ 4.0 / 5", timestamp="2025-05-22"):
+    """Membuat satu dictionary produk mentah untuk test."""
+    return {
+        "title": title,
+        "price": price,
+        "rating": rating,
+        "colors": "2 Colors",
+        "size": "Size: M",
+        "gender": "Gender: Women",
+        "timestamp": timestamp
+    }
+
+
+def test_transform_stream_matches_batch_with_cross_chunk_duplicates():
+    """Hasil streaming per chunk sama dengan clean_and_transform pada seluruh data."""
+    chunks = [
+        [make_raw_product("A"), make_raw_product("B"), make_raw_product("A")],
+        [make_raw_product("Unknown Product"), make_raw_product("B"), make_raw_product("C")],
+        [make_raw_product("A"), make_raw_product("A", timestamp="2025-05-23")],
+        [make_raw_product("D", price="Price Unavailable")],
+        [],
+    ]
+
+    streamed = pd.concat(list(transform_stream(chunks)), ignore_index=True)
+    batch = clean_and_transform([row for chunk in chunks for row in chunk])
+
+    pd.testing.assert_frame_equal(streamed, batch)
+    assert list(streamed["title"]) == ["A", "B", "C", "A"]
+
+
+def test_transform_stream_skips_chunks_without_valid_rows():
+    """Chunk yang habis terfilter tidak di-yield."""
+    chunks = [[make_raw_product("Unknown Product")], [make_raw_product("E")]]
+
+    results = list(transform_stream(chunks))
+
+    assert len(results) == 1
+    assert results[0].iloc[0]["title"] == "E"
+
+
+def test_fast_engine_matches_pandas_engine_on_synthetic_catalogue():
+    """Engine 'fast' menghasilkan DataFrame identik dengan engine 'pandas' versi awal."""
+    raw_data = make_raw_catalogue(20_000, seed=7)
+
+    fast = clean_and_transform(raw_data, engine="fast")
+    expected = clean_and_transform(raw_data, engine="pandas")
+
+    pd.testing.assert_frame_equal(fast, expected)
+    assert 0 < len(fast) < len(raw_data)
+
+
+def test_fast_engine_matches_pandas_engine_on_edge_cases():
+    """Kesetaraan engine juga berlaku untuk rating tanpa angka, prefix ganda dan spasi."""
+    raw_data = [
+        make_raw_product("UNKNOWN PRODUCT 7"),
+        make_raw_product("Hat", rating="Rating: ⭐ Invalid Rating / 5"),
+        make_raw_product("Cap", rating="Rating: no score"),
+        dict(make_raw_product("Scarf"), size="Size:  Size: XL ", gender=" Gender: Men"),
+        dict(make_raw_product("Belt"), price="Rp 1.000"),
+    ]
+
+    pd.testing.assert_frame_equal(
+        clean_and_transform(raw_data, engine="fast"),
+        clean_and_transform(raw_data, engine="pandas")
+    )
+
+
+def test_fast_engine_raises_like_pandas_engine_on_missing_colors():
+    """Kolom colors tanpa angka gagal di kedua engine."""
+    raw_data = [dict(make_raw_product("Sock"), colors="Many Colors")]
+
+    with pytest.raises(ValueError):
+        clean_and_transform(raw_data, engine="pandas")
+    with pytest.raises(ValueError):
+        clean_and_transform(raw_data, engine="fast")
+
+
+def test_filter_rule_stats_match_between_engines():
+    """stats mencatat baris yang dibuang per aturan filter, sama untuk kedua engine."""
+    raw_data = [
+        make_raw_product("A"),
+        make_raw_product("A"),
+        make_raw_product("Unknown Product"),
+        make_raw_product("B", rating="Not Rated"),
+        make_raw_product("C", price="Price Unavailable"),
+        dict(make_raw_product("D"), size=None),
+        make_raw_product("E"),
+    ]
+    seen = set(raw_row_hashes(pd.DataFrame([make_raw_product("E")])).tolist())
+
+    fast_stats, pandas_stats = {}, {}
+    clean_and_transform(raw_data, seen=set(seen), engine="fast", stats=fast_stats)
+    clean_and_transform(raw_data, seen=set(seen), engine="pandas", stats=pandas_stats)
+
+    assert fast_stats == pandas_stats
+    assert fast_stats["rows_in"] == 7 and fast_stats["rows_out"] == 1
+    assert fast_stats["dropped"] == {
+        "null": 1, "unknown_product": 1, "invalid_rating": 1, "invalid_price": 1, "duplicate": 1, "seen_before": 1
+    }
+
+
+def test_transform_stream_collects_chunk_stats():
+    """transform_stream mengisi statistik per chunk."""
+    stats = []
+    list(transform_stream([[make_raw_product("A")], [make_raw_product("A"), make_raw_product("B")]], stats=stats))
+
+    assert [s["rows_out"] for s in stats] == [1, 1]
+    assert stats[1]["dropped"]["seen_before"] == 1
+
+
+def test_seen_stores_fixed_size_row_hashes():
+    """`seen` hanya menyimpan hash 64-bit per baris yang lolos, bukan tuple baris mentah."""
+    seen = set()
+    clean_and_transform([make_raw_product("A"), make_raw_product("B" * 1000)], seen=seen)
+
+    assert len(seen) == 2 and all(isinstance(value, int) and value < 2 ** 64 for value in seen)
+    assert clean_and_transform([make_raw_product("B" * 1000), make_raw_product("C")], seen=seen)["title"].tolist() == ["C"]
+
+
+def test_unknown_engine():
+    """Engine yang tidak dikenal harus raise ValueError."""
+    with pytest.raises(ValueError, match="Engine transformasi tidak dikenal"):
+        clean_and_transform([make_raw_product("A")], engine="numba")
+
+
+def test_compact_schema_dtypes():
+    """compact=True menghasilkan kategori, datetime64, int8 dan float32 sesuai COMPACT_DTYPES."""
+    raw_data = [make_raw_product("A", timestamp="2025-05-22T10:00:00.123456"), make_raw_product("B")]
+
+    df = clean_and_transform(raw_data, compact=True)
+
+    assert {column: str(dtype) for column, dtype in df.dtypes.items()} == COMPACT_DTYPES
+    assert df.iloc[0]["timestamp"] == pd.Timestamp("2025-05-22T10:00:00.123456")
+    assert df.iloc[0]["rating"] == pytest.approx(4.0)
+
+
+def test_compact_schema_validation_has_no_warnings(caplog):
+    """Validasi tipe data mengenali skema ringkas tanpa peringatan."""
+    with caplog.at_level("WARNING"):
+        clean_and_transform([make_raw_product("A")], compact=True)
+
+    assert "TIDAK SESUAI" not in caplog.text
+
+
+def test_compact_schema_reduces_memory():
+    """Skema ringkas memakai memori jauh lebih kecil dari skema default."""
+    raw_data = make_raw_catalogue(10_000, seed=3)
+
+    default = clean_and_transform(raw_data).memory_usage(deep=True).sum()
+    compact = clean_and_transform(raw_data, compact=True).memory_usage(deep=True).sum()
+
+    assert compact * 2 < default
+
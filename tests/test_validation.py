@@ -0,0 +1,187 @@
+import json
+import pandas as pd
+import pytest
+from utils.transform import clean_and_transform, transform_stream, raw_row_hashes, FILTER_RULES
+from utils.validation import DEFAULT_RULES, Rule, RuleSet, load_rules
+
+
+def make_raw_product(title, price="$10.00", rating="Rating: ⭐ 4.0 / 5", gender="Gender: Women"):
+    """Membuat satu dictionary produk mentah untuk test."""
+    return {
+        "title": title,
+        "price": price,
+        "rating": rating,
+        "colors": "2 Colors",
+        "size": "Size: M",
+        "gender": gender,
+        "timestamp": "2025-05-22",
+    }
+
+
+RAW_DATA = [
+    make_raw_product("A"),
+    make_raw_product("A"),
+    make_raw_product("Unknown Product"),
+    make_raw_product("B", rating="Not Rated"),
+    make_raw_product("C", price="Price Unavailable"),
+    dict(make_raw_product("D"), size=None),
+    make_raw_product("Sample Jacket"),
+    make_raw_product("E", gender="Gender: Unisex"),
+]
+
+CUSTOM_RULES = [
+    {"name": "null", "not_null": True},
+    {"name": "sample", "column": "title", "matches": "^Sample "},
+    {"name": "unisex", "column": "gender", "in": ["Gender: Unisex"]},
+    {"name": "unknown_product", "column": "title", "contains": "UNKNOWN product"},
+    {"name": "unparsable", "column": "price", "not_matches": "[0-9]"},
+    {"name": "invalid_rating", "column": "rating", "in": ["Invalid Rating / 5", "Not Rated"]},
+]
+
+
+def test_default_rules_names():
+    """Nama aturan bawaan berurutan sesuai urutan penerapannya."""
+    assert FILTER_RULES == ("null", "unknown_product", "invalid_rating", "invalid_price", "duplicate", "seen_before")
+
+
+def test_evaluate_records_first_matching_rule():
+    """Baris yang melanggar beberapa aturan dicatat pada aturan pertama saja."""
+    df = pd.DataFrame([
+        make_raw_product("ok"),
+        dict(make_raw_product("Unknown Product", rating="Not Rated"), size=None),
+        make_raw_product("Unknown Product", rating="Not Rated"),
+        make_raw_product("x", rating="Not Rated", price="Price Unavailable"),
+    ])
+    assert DEFAULT_RULES.evaluate(df).tolist() == [-1, 0, 1, 2]
+
+
+def test_rules_from_json_file(tmp_path):
+    """Aturan dari file JSON dipakai transform dan setiap aturan punya hitungan sendiri."""
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(CUSTOM_RULES))
+    rules = load_rules(str(path))
+
+    stats = {}
+    df = clean_and_transform(RAW_DATA, rules=rules, stats=stats)
+
+    assert df["title"].tolist() == ["A"]
+    assert stats["dropped"] == {"null": 1, "sample": 1, "unisex": 1, "unknown_product": 1, "unparsable": 1,
+                                "invalid_rating": 1, "duplicate": 1, "seen_before": 0}
+
+
+def test_quarantine_collects_rejected_rows_with_rule_name():
+    """Baris yang dibuang masuk karantina sebagai data mentah beserta nama aturan yang menolaknya."""
+    quarantine = []
+    df = clean_and_transform(RAW_DATA, seen=set(raw_row_hashes(pd.DataFrame([make_raw_product("E", gender="Gender: Unisex")])).tolist()),
+                             quarantine=quarantine)
+
+    assert len(quarantine) == 1
+    rejected = quarantine[0]
+    assert len(rejected) + len(df) == len(RAW_DATA)
+    assert rejected["reject_rule"].tolist() == [
+        "duplicate", "unknown_product", "invalid_rating", "invalid_price", "null", "seen_before"
+    ]
+    # Baris karantina adalah data mentah, belum ditransformasi
+    assert rejected.iloc[0]["price"] == "$10.00"
+    assert list(rejected.columns) == list(RAW_DATA[0]) + ["reject_rule"]
+
+
+def test_quarantine_is_empty_when_nothing_is_rejected():
+    """Karantina tidak ditambah apa pun jika tidak ada baris yang dibuang."""
+    quarantine = []
+    clean_and_transform([make_raw_product("A")], quarantine=quarantine)
+    assert quarantine == []
+
+
+def test_transform_stream_with_rules_and_quarantine():
+    """transform_stream dengan aturan kustom sama dengan satu kali transform atas seluruh data."""
+    rules = RuleSet.from_list(CUSTOM_RULES)
+    quarantine = []
+    chunks = [RAW_DATA[:4], RAW_DATA[4:]]
+    frames = list(transform_stream(chunks, rules=rules, quarantine=quarantine))
+
+    expected = clean_and_transform(RAW_DATA, rules=rules)
+    assert pd.concat(frames, ignore_index=True).equals(expected)
+    assert sum(map(len, quarantine)) == len(RAW_DATA) - len(expected)
+
+
+def test_default_rules_match_pandas_engine_on_synthetic_catalogue():
+    """Dengan aturan bawaan, hasil dan hitungan per aturan sama dengan engine pandas."""
+    from benchmarks.synthetic import make_raw_catalogue
+    raw = make_raw_catalogue(5000)
+    fast_stats, pandas_stats = {}, {}
+    fast = clean_and_transform(raw, engine="fast", stats=fast_stats, rules=DEFAULT_RULES)
+    expected = clean_and_transform(raw, engine="pandas", stats=pandas_stats)
+    pd.testing.assert_frame_equal(fast, expected)
+    assert fast_stats == pandas_stats
+
+
+@pytest.mark.parametrize("config", [
+    {"name": "x", "column": "title"},
+    {"name": "x", "column": "title", "in": ["a"], "contains": "a"},
+    {"name": "x", "column": "title", "startswith": "a"},
+    {"name": "x", "in": ["a"]},
+    {"column": "title", "in": ["a"]},
+    {"name": "duplicate", "column": "title", "in": ["a"]},
+    {"name": "x", "column": "title", "matches": "("},
+])
+def test_invalid_rule_config(config):
+    """Konfigurasi satu aturan yang tidak lengkap, ambigu atau salah harus raise ValueError."""
+    with pytest.raises(ValueError):
+        Rule.from_dict(config)
+
+
+def test_invalid_rule_sets(tmp_path):
+    """Nama aturan ganda atau file aturan yang bukan list harus raise ValueError."""
+    with pytest.raises(ValueError, match="ganda"):
+        RuleSet.from_list([{"name": "x", "not_null": True}, {"name": "x", "column": "title", "in": ["a"]}])
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"name": "x", "not_null": True}))
+    with pytest.raises(ValueError):
+        load_rules(str(path))
+
+
+def test_rule_on_missing_column_raises():
+    """Aturan pada kolom yang tidak ada di data harus raise ValueError yang menyebut kolomnya."""
+    rules = RuleSet([Rule("brand", "in", "brand", ["Acme"])])
+    with pytest.raises(ValueError, match="brand"):
+        clean_and_transform(RAW_DATA, rules=rules)
+
+
+def test_nulls_stay_null_without_not_null_rule():
+    """Tanpa aturan not_null, nilai null tetap null dan tidak diisi nilai hasil parse lain."""
+    raw = [make_raw_product("A"), dict(make_raw_product("B"), size=None, colors=None, rating=None),
+           dict(make_raw_product("C"), size="Size: XL")]
+    rules = RuleSet([Rule("unknown_product", "contains", "title", "unknown product")])
+
+    df = clean_and_transform(raw, rules=rules)
+
+    assert df["size"].tolist() == ["M", None, "XL"]
+    assert df["colors"].isna().tolist() == [False, True, False]
+    assert df["colors"].dropna().tolist() == [2, 2]
+    assert df["rating"].isna().tolist() == [False, True, False]
+
+
+def test_rules_require_fast_engine():
+    """Aturan kustom dan karantina hanya didukung engine 'fast'."""
+    with pytest.raises(ValueError):
+        clean_and_transform(RAW_DATA, engine="pandas", rules=DEFAULT_RULES)
+    with pytest.raises(ValueError):
+        clean_and_transform(RAW_DATA, engine="pandas", quarantine=[])
+
+
+def test_run_stream_writes_quarantine_once_per_chunk(tmp_path, monkeypatch):
+    """Mode streaming menulis karantina per chunk ke satu file CSV dengan satu header."""
+    import main
+    path = tmp_path / "quarantine.csv"
+    path.write_text("sisa run lama\n")
+    monkeypatch.setattr(main, "iter_product_chunks", lambda **kwargs: iter([RAW_DATA[:4], RAW_DATA[4:]]))
+    monkeypatch.setattr(main, "QUARANTINE_PATH", str(path))
+    monkeypatch.setattr(main, "RULES", RuleSet.from_list(CUSTOM_RULES))
+    main.run_stream(4, [])
+
+    # keep_default_na=False: nama aturan "null" jangan dibaca sebagai NaN
+    rejected = pd.read_csv(path, keep_default_na=False)
+    assert len(rejected) == len(RAW_DATA) - 1
+    assert sorted(rejected["reject_rule"]) == sorted(name for name in main.RULES.names if name != "seen_before")
@@ -0,0 +1,129 @@
+import time
+import pandas as pd
+import pytest
+import utils.extract as extract
+from benchmarks.stub_server import StubServer
+from utils.checkpoint import RunCheckpoint
+from utils.extract import scrape_all_pages
+from utils.workqueue import PageQueue, scrape_sharded
+
+
+def without_timestamp(products):
+    return [{key: value for key, value in product.items() if key != "timestamp"} for product in products]
+
+
+def page_result(page, titles=("A",)):
+    return {"page": page, "products": [{"title": title} for title in titles], "stats": {"page": page}}
+
+
+def test_queue_splits_pages_and_claims_each_shard_once(tmp_path):
+    """Rentang halaman dibagi menjadi shard dan setiap shard hanya bisa di-claim satu worker."""
+    with PageQueue(str(tmp_path / "queue")) as queue:
+        queue.create(max_pages=25, shard_pages=10)
+        leases = [queue.claim(f"w{index}") for index in range(4)]
+        assert [(lease.first_page, lease.last_page) for lease in leases[:3]] == [(1, 10), (11, 20), (21, 25)]
+        assert leases[3] is None and not queue.finished()
+        for lease in leases[:3]:
+            assert queue.complete(lease, [page_result(lease.first_page)])
+        assert queue.finished() and queue.counts() == {"done": 3}
+        assert [page["page"] for page in queue.results()] == [1, 11, 21]
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    """Shard milik worker yang macet diambil worker lain; hasil pemilik lama tidak dipakai."""
+    with PageQueue(str(tmp_path)) as queue:
+        queue.create(max_pages=5, shard_pages=5, lease_seconds=0.05)
+        stale = queue.claim("stale")
+        assert queue.claim("other") is None
+        time.sleep(0.1)
+        fresh = queue.claim("other")
+        assert fresh.shard == stale.shard and fresh.attempts == 2
+
+        assert not queue.heartbeat(stale)
+        assert not queue.complete(stale, [page_result(1, ["stale"])])
+        assert queue.complete(fresh, [page_result(1, ["fresh"])])
+        assert [page["products"] for page in queue.results()] == [[{"title": "fresh"}]]
+
+
+def test_failed_shard_is_retried_until_max_attempts(tmp_path):
+    """Shard gagal dicoba ulang sampai max_attempts, lalu dicatat sebagai gagal."""
+    with PageQueue(str(tmp_path)) as queue:
+        queue.create(max_pages=4, shard_pages=2, max_attempts=2)
+        queue.fail(queue.claim("w"), "boom")
+        lease = queue.claim("w")
+        assert lease.shard == 1 and lease.attempts == 2
+        queue.fail(lease, "boom again")
+        assert queue.failed() == {1: "boom again"}
+        with pytest.raises(RuntimeError):
+            list(queue.results())
+
+        # Run berikutnya dengan antrian yang sama memberi shard gagal kesempatan baru
+        queue.create(max_pages=4, shard_pages=2, max_attempts=2)
+        assert queue.claim("w").shard == 1 and queue.failed() == {}
+
+
+def test_end_of_catalogue_skips_later_shards(tmp_path):
+    """Akhir katalog yang ditemukan satu shard membuat shard setelahnya dilewati."""
+    with PageQueue(str(tmp_path)) as queue:
+        queue.create(max_pages=30, shard_pages=5)
+        first = queue.claim("w")
+        assert queue.complete(first, [page_result(page) for page in range(1, 5)], end_page=4)
+        assert queue.end_page == 4 and queue.finished()
+        assert queue.counts() == {"done": 1, "skipped": 5}
+        assert [page["page"] for page in queue.results()] == [1, 2, 3, 4]
+
+
+def test_scrape_sharded_matches_single_process(monkeypatch):
+    """Beberapa proses worker menghasilkan produk dan ringkasan halaman yang sama dengan satu proses."""
+    with StubServer(pages=7) as server:
+        monkeypatch.setattr(extract, "BASE_URL", server.base_url)
+        stats = []
+        sharded = scrape_sharded(max_pages=20, workers=3, shard_pages=2, stats=stats, max_workers=2)
+        # Tanpa lease yang kedaluwarsa, setiap halaman katalog hanya diambil sekali
+        assert sorted(page for page in server.hits if page <= 7) == list(range(1, 8))
+        server.hits.clear()
+        single_stats = []
+        single = scrape_all_pages(max_pages=20, max_workers=2, stats=single_stats)
+
+    assert len(sharded) == 7 * 20
+    assert without_timestamp(sharded) == without_timestamp(single)
+    assert [page["page"] for page in stats] == [page["page"] for page in single_stats] == list(range(1, 9))
+    assert stats[-1]["status_code"] == 404
+
+
+def test_scrape_sharded_takes_over_lease_of_dead_worker(tmp_path, monkeypatch):
+    """Shard yang di-lease worker yang mati diambil ulang setelah lease-nya kedaluwarsa."""
+    directory = str(tmp_path / "queue")
+    with PageQueue(directory) as queue:
+        queue.create(max_pages=6, shard_pages=2, lease_seconds=0.3)
+        assert queue.claim("dead-worker").first_page == 1
+
+    with StubServer(pages=5) as server:
+        monkeypatch.setattr(extract, "BASE_URL", server.base_url)
+        products = scrape_sharded(max_pages=6, workers=2, shard_pages=2, directory=directory, lease_seconds=0.3)
+        assert server.hits.count(1) == 1
+
+    assert len(products) == 5 * 20
+    with PageQueue(directory) as queue:
+        assert queue.counts() == {"done": 3} and queue.end_page == 6
+
+
+def test_run_batch_with_shards_keeps_queue_in_checkpoint(tmp_path, monkeypatch):
+    """run_batch dengan shard menyimpan antrian di direktori checkpoint run."""
+    import main
+
+    csv_path = tmp_path / "products.csv"
+    monkeypatch.setattr(main, "SHARD_OPTIONS", {"workers": 2, "shard_pages": 1})
+    monkeypatch.setattr(main, "SCRAPE_OPTIONS", {"max_pages": 4})
+    monkeypatch.setattr(main, "SINK_OPTIONS", {"csv": {"filename": str(csv_path)}})
+    checkpoint = RunCheckpoint("sharded", root=str(tmp_path / "checkpoints"))
+    with StubServer(pages=2) as server:
+        monkeypatch.setattr(extract, "BASE_URL", server.base_url)
+        main.run_batch(["csv"], checkpoint=checkpoint)
+
+    # 2 halaman x 19 produk valid; halaman juga tersimpan di checkpoint untuk resume
+    assert len(pd.read_csv(csv_path)) == 38
+    assert sorted(checkpoint.pages()) == [1, 2]
+    with PageQueue(str(tmp_path / "checkpoints" / "sharded" / "shards")) as queue:
+        assert queue.end_page == 3
+    checkpoint.close()
@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class PageCache:
+    """
+    Cache halaman hasil scraping di disk (SQLite) untuk conditional GET.
+
+    Setiap URL menyimpan validator HTTP (ETag / Last-Modified) dan daftar produk
+    yang sudah di-parse (tanpa timestamp), sehingga balasan 304 tidak perlu
+    di-download maupun di-parse ulang. Ukuran total dibatasi dengan eviksi LRU,
+    dan entri yang lebih tua dari `ttl` sejak download penuh terakhir dibuang.
+
+    Parameters:
+    path (str)     : Lokasi file SQLite cache.
+    max_bytes (int): Batas total ukuran produk yang disimpan. Default = 50 MB.
+    ttl (float)    : Umur maksimum entri dalam detik. Default = 7 hari.
+    """
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024, ttl=7 * 24 * 3600):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url           TEXT PRIMARY KEY,
+                etag          TEXT,
+                last_modified TEXT,
+                products      TEXT NOT NULL,
+                size          INTEGER NOT NULL,
+                stored_at     REAL NOT NULL,
+                accessed_at   REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, url):
+        """
+        Mengambil entri cache untuk URL, atau None jika tidak ada / sudah kedaluwarsa.
+
+        Returns:
+        dict: Berisi etag, last_modified dan products.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, products, stored_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            etag, last_modified, products, stored_at = row
+            if now - stored_at > self.ttl:
+                self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+
+        return {"etag": etag, "last_modified": last_modified, "products": json.loads(products)}
+
+    def conditional_headers(self, entry):
+        """Header If-None-Match / If-Modified-Since untuk revalidasi sebuah entri."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url, etag, last_modified, products):
+        """
+        Menyimpan validator dan produk hasil parse untuk sebuah URL, lalu menjalankan eviksi LRU.
+
+        Parameters:
+        url (str)          : URL halaman.
+        etag (str)         : Nilai header ETag dari server (boleh None).
+        last_modified (str): Nilai header Last-Modified dari server (boleh None).
+        products (list)    : Produk hasil parse. Field `timestamp` tidak disimpan.
+        """
+        stripped = [{k: v for k, v in product.items() if k != "timestamp"} for product in products]
+        payload = json.dumps(stripped, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, payload, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Membuang entri yang paling lama tidak diakses sampai total ukuran di bawah batas."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at ASC").fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            logging.info(f"Cache evicted: {url}")
+
+    def total_size(self):
+        """Total ukuran produk yang tersimpan di cache (bytes)."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def clear(self):
+        """Menghapus semua entri cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+    def close(self):
+        """Menutup koneksi SQLite."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,188 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import pandas as pd
+from utils.load import NATURAL_KEY, _to_plain_frame
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Kolom yang tidak ikut dihitung dalam hash isi baris (berubah setiap run)
+CDC_IGNORE_COLUMNS = ("timestamp",)
+
+
+def _hash_rows(df: pd.DataFrame) -> pd.Series:
+    """Hash 64-bit (int64) per baris dari semua kolom `df`."""
+    hashes = pd.util.hash_pandas_object(df, index=False)
+    return pd.Series(hashes.values.view('int64'), index=df.index)
+
+
+def row_hashes(df: pd.DataFrame, key_columns: tuple = NATURAL_KEY,
+               ignore_columns: tuple = CDC_IGNORE_COLUMNS) -> pd.Series:
+    """
+    Menghitung hash 64-bit isi setiap baris (semua kolom selain kunci dan `ignore_columns`).
+
+    DataFrame dinormalisasi dulu ke skema default agar skema ringkas dan default
+    menghasilkan hash yang sama.
+
+    Returns:
+    pd.Series: Hash int64 per baris dengan index yang sama dengan `df`.
+    """
+    plain = _to_plain_frame(df)
+    content_columns = [c for c in plain.columns if c not in key_columns and c not in ignore_columns]
+    return _hash_rows(plain[content_columns])
+
+
+class ChangeStore:
+    """
+    State store lokal (SQLite) untuk mode incremental / change-data-capture.
+
+    Menyimpan satu hash isi baris per identitas produk (`key_columns`). Identitas juga
+    di-hash menjadi integer 64-bit sebagai primary key, sehingga `diff()` cukup membaca
+    pasangan integer dari disk dan mencocokkannya tanpa join string. `diff()`
+    membandingkan hasil scraping dengan state dan mengelompokkan produk menjadi
+    new, changed, unchanged dan deleted (hilang dari katalog). State baru disimpan
+    lewat `commit()` dalam satu transaksi SQLite, dan sebaiknya dipanggil hanya setelah
+    semua sink berhasil: jika run gagal atau crash sebelum itu, run berikutnya
+    menghitung ulang perubahan yang sama terhadap state lama.
+
+    Parameters:
+    path (str)          : Lokasi file SQLite state.
+    key_columns (tuple) : Kolom identitas produk. Default = NATURAL_KEY; SITE_KEY untuk multi-situs.
+    ignore_columns (tuple): Kolom yang tidak memengaruhi hash. Default = ('timestamp',).
+
+    Raises:
+    ValueError: Jika state di `path` dibuat dengan kolom identitas yang berbeda.
+    """
+
+    def __init__(self, path: str, key_columns: tuple = NATURAL_KEY, ignore_columns: tuple = CDC_IGNORE_COLUMNS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.key_columns = tuple(key_columns)
+        self.ignore_columns = tuple(ignore_columns)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS state (
+                key_hash   INTEGER PRIMARY KEY,
+                {", ".join(f'"{column}"' for column in self.key_columns)},
+                hash       INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        stored_keys = tuple(row[1] for row in self._conn.execute("PRAGMA table_info(state)"))[1:-2]
+        if stored_keys != self.key_columns:
+            self._conn.close()
+            raise ValueError(
+                f"State CDC {path} memakai kunci {stored_keys}, bukan {self.key_columns}. "
+                f"Pakai file state lain, atau hapus file ini sehingga run berikutnya menganggap semua produk baru."
+            )
+
+    def _key_hashes(self, df: pd.DataFrame) -> pd.Series:
+        """Hash identitas produk (kolom kunci dalam skema default)."""
+        return _hash_rows(_to_plain_frame(df[list(self.key_columns)]))
+
+    def _read_keys(self, key_hashes: list) -> pd.DataFrame:
+        """Membaca kolom kunci untuk daftar key_hash tertentu (dipakai untuk produk yang hilang)."""
+        columns = ", ".join(f'"{column}"' for column in self.key_columns)
+        rows = []
+        with self._lock:
+            for start in range(0, len(key_hashes), 500):
+                batch = key_hashes[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                rows.extend(self._conn.execute(
+                    f"SELECT {columns} FROM state WHERE key_hash IN ({placeholders}) ORDER BY rowid", batch
+                ).fetchall())
+        return pd.DataFrame(rows, columns=list(self.key_columns))
+
+    def diff(self, df: pd.DataFrame) -> dict:
+        """
+        Mengelompokkan baris `df` terhadap state tersimpan.
+
+        Jika satu kunci muncul lebih dari sekali, baris terakhir yang dipakai.
+
+        Parameters:
+        df (pd.DataFrame): Hasil transformasi lengkap dari satu run.
+
+        Returns:
+        dict: new, changed dan unchanged (DataFrame dengan kolom `df`), deleted (DataFrame
+              berisi kolom kunci produk yang hilang), serta hashes (kunci + hash untuk commit).
+        """
+        key = list(self.key_columns)
+        key_hashes = self._key_hashes(df)
+        last = ~key_hashes.duplicated(keep='last').to_numpy()
+        current, key_hashes = df[last], key_hashes[last]
+        hashes = row_hashes(current, self.key_columns, self.ignore_columns)
+
+        with self._lock:
+            state = self._conn.execute("SELECT key_hash, hash FROM state").fetchall()
+        stored = pd.Series([h for _, h in state], index=pd.Index([k for k, _ in state], dtype='int64'),
+                           dtype='int64')
+
+        stored_hashes = stored.reindex(key_hashes.to_numpy())
+        is_new = stored_hashes.isna().to_numpy()
+        is_changed = ~is_new & (stored_hashes.to_numpy() != hashes.to_numpy())
+
+        deleted_hashes = stored.index.difference(pd.Index(key_hashes.to_numpy())).tolist()
+        deleted = self._read_keys(deleted_hashes) if deleted_hashes else pd.DataFrame(columns=key)
+
+        upserted = is_new | is_changed
+        return {
+            "new": current[is_new],
+            "changed": current[is_changed],
+            "unchanged": current[~upserted],
+            "deleted": deleted,
+            "hashes": _to_plain_frame(current.loc[upserted, key]).assign(
+                _key_hash=key_hashes[upserted], _hash=hashes[upserted]
+            ),
+        }
+
+    def upserts(self, changes: dict) -> pd.DataFrame:
+        """Baris new dan changed yang perlu di-insert / di-update di sink."""
+        return pd.concat([changes["new"], changes["changed"]])
+
+    def commit(self, changes: dict):
+        """
+        Menyimpan hash baris new/changed dan menghapus kunci deleted dalam satu transaksi.
+
+        Parameters:
+        changes (dict): Hasil `diff()` yang sudah berhasil dimuat ke semua sink.
+        """
+        key_placeholders = ", ".join("?" for _ in self.key_columns)
+        now = time.time()
+        hashes = changes["hashes"]
+        upsert_rows = [(key_hash,) + tuple(row) + (now,) for key_hash, row in zip(
+            hashes["_key_hash"].tolist(),
+            hashes[list(self.key_columns) + ["_hash"]].astype(object).itertuples(index=False, name=None)
+        )]
+        deleted = changes["deleted"]
+        deleted_rows = [(key_hash,) for key_hash in self._key_hashes(deleted).tolist()] if len(deleted) else []
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO state VALUES (?, {key_placeholders}, ?, ?)", upsert_rows
+            )
+            self._conn.executemany("DELETE FROM state WHERE key_hash = ?", deleted_rows)
+        logging.info(f"State CDC diperbarui: {len(upsert_rows)} baris di-upsert, {len(deleted_rows)} dihapus.")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM state").fetchone()[0]
+
+    def clear(self):
+        """Menghapus seluruh state sehingga run berikutnya menganggap semua produk baru."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM state")
+
+    def close(self):
+        """Menutup koneksi SQLite."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+import pandas as pd
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CHECKPOINT_DIR = '.cache/checkpoints'
+# Checkpoint run gagal yang tidak diperbarui selama ini dianggap ditinggalkan (lihat `RunCheckpoint.prune`)
+CHECKPOINT_MAX_AGE_DAYS = 7
+
+# Urutan step pipeline batch yang dicatat di checkpoint
+RUN_STEPS = ('extract', 'transform', 'load')
+
+
+def new_run_id() -> str:
+    """Run ID baru dengan format yang sama seperti `PipelineMetrics`."""
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class RunCheckpoint:
+    """
+    Checkpoint satu run pipeline batch agar run yang gagal di tengah bisa dilanjutkan.
+
+    Disimpan per run ID di `<root>/<run_id>/`:
+    - checkpoint.sqlite: produk mentah per situs dan halaman yang sudah diambil, step yang sudah selesai,
+      sink yang sudah commit, dan opsi run (sink, compact, incremental)
+    - clean.pkl        : DataFrame hasil transformasi (pickle, sehingga skema ringkas tetap utuh)
+
+    Setiap perubahan langsung di-commit ke disk, jadi proses yang mati mendadak kehilangan
+    paling banyak satu halaman atau satu sink.
+
+    Parameters:
+    run_id (str): Penanda run. Default = run ID baru.
+    root (str)  : Direktori induk semua checkpoint. Default = CHECKPOINT_DIR.
+    """
+
+    def __init__(self, run_id: str = None, root: str = CHECKPOINT_DIR):
+        self.run_id = run_id or new_run_id()
+        self.directory = os.path.join(root, self.run_id)
+        os.makedirs(self.directory, exist_ok=True)
+        self._frame_path = os.path.join(self.directory, 'clean.pkl')
+        self._conn = sqlite3.connect(os.path.join(self.directory, 'checkpoint.sqlite'))
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                source   TEXT NOT NULL DEFAULT '',
+                page     INTEGER NOT NULL,
+                products TEXT NOT NULL,
+                PRIMARY KEY (source, page)
+            );
+            CREATE TABLE IF NOT EXISTS steps (
+                name        TEXT PRIMARY KEY,
+                finished_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sinks (
+                name         TEXT PRIMARY KEY,
+                rows         INTEGER NOT NULL,
+                committed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    @classmethod
+    def open(cls, run_id: str, root: str = CHECKPOINT_DIR):
+        """
+        Membuka checkpoint run yang sudah ada.
+
+        Returns:
+        RunCheckpoint: Checkpoint run tersebut, atau None jika tidak ditemukan.
+        """
+        if not os.path.exists(os.path.join(root, run_id, 'checkpoint.sqlite')):
+            return None
+        return cls(run_id, root=root)
+
+    @classmethod
+    def latest(cls, root: str = CHECKPOINT_DIR):
+        """
+        Membuka checkpoint run yang belum selesai paling baru.
+
+        Returns:
+        RunCheckpoint: Checkpoint terbaru, atau None jika tidak ada.
+        """
+        if not os.path.isdir(root):
+            return None
+        candidates = [
+            entry for entry in os.scandir(root)
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'checkpoint.sqlite'))
+        ]
+        if not candidates:
+            return None
+        newest = max(candidates, key=lambda entry: os.path.getmtime(os.path.join(entry.path, 'checkpoint.sqlite')))
+        return cls(newest.name, root=root)
+
+    @classmethod
+    def prune(cls, max_age_days: float = CHECKPOINT_MAX_AGE_DAYS, root: str = CHECKPOINT_DIR, keep: str = None) -> list:
+        """
+        Menghapus checkpoint run yang belum selesai dan tidak diperbarui lebih dari `max_age_days` hari,
+        sehingga run gagal yang tidak pernah dilanjutkan tidak menumpuk di disk.
+
+        Parameters:
+        max_age_days (float): Umur maksimum sejak checkpoint terakhir diperbarui. Default = 7.
+        root (str)          : Direktori induk semua checkpoint. Default = CHECKPOINT_DIR.
+        keep (str)          : Run ID yang tidak boleh dihapus, misal run yang sedang berjalan.
+
+        Returns:
+        list: Run ID yang dihapus.
+        """
+        if not os.path.isdir(root):
+            return []
+        cutoff = time.time() - max_age_days * 86400
+        removed = []
+        for entry in os.scandir(root):
+            if not entry.is_dir() or entry.name == keep:
+                continue
+            # Setiap halaman, step dan sink ditulis ke checkpoint.sqlite, jadi mtime-nya = aktivitas terakhir
+            database = os.path.join(entry.path, 'checkpoint.sqlite')
+            if os.path.getmtime(database if os.path.exists(database) else entry.path) < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed.append(entry.name)
+        if removed:
+            logging.info(f"Checkpoint lebih tua dari {max_age_days} hari dihapus: {', '.join(sorted(removed))}")
+        return sorted(removed)
+
+    @property
+    def options(self) -> dict:
+        """Opsi run yang disimpan saat run dimulai (kosong jika belum ada)."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'options'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_options(self, options: dict):
+        """Menyimpan opsi run agar `--resume` memakai konfigurasi yang sama."""
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('options', ?)",
+                               (json.dumps(options),))
+
+    def save_page(self, page: int, products: list, source: str = ''):
+        """
+        Menyimpan produk mentah sebuah halaman. Halaman kosong atau gagal tidak disimpan
+        sehingga diambil ulang saat run dilanjutkan. `source` diisi nama situs pada run multi-situs.
+        """
+        if not products:
+            return
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO pages (source, page, products) VALUES (?, ?, ?)",
+                               (source, page, json.dumps(list(products))))
+
+    def pages(self, source: str = '') -> dict:
+        """Produk mentah per halaman yang sudah tersimpan untuk satu situs: {page: list of dict}."""
+        rows = self._conn.execute("SELECT page, products FROM pages WHERE source = ? ORDER BY page",
+                                  (source,)).fetchall()
+        return {page: json.loads(products) for page, products in rows}
+
+    def pages_by_source(self) -> dict:
+        """Produk mentah per situs lalu per halaman: {source: {page: list of dict}}."""
+        by_source = {}
+        for source, page, products in self._conn.execute(
+                "SELECT source, page, products FROM pages ORDER BY source, page"):
+            by_source.setdefault(source, {})[page] = json.loads(products)
+        return by_source
+
+    def raw_products(self) -> list:
+        """Seluruh produk mentah yang tersimpan, berurutan sesuai situs lalu nomor halaman."""
+        return [product for pages in self.pages_by_source().values() for products in pages.values()
+                for product in products]
+
+    def is_done(self, step: str) -> bool:
+        """True jika step sudah selesai pada run ini."""
+        return self._conn.execute("SELECT 1 FROM steps WHERE name = ?", (step,)).fetchone() is not None
+
+    def mark_done(self, step: str):
+        """Menandai step selesai."""
+        if step not in RUN_STEPS:
+            raise ValueError(f"Step tidak dikenal: {step}")
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO steps (name, finished_at) VALUES (?, ?)", (step, time.time()))
+
+    def save_frame(self, df: pd.DataFrame):
+        """Menyimpan DataFrame hasil transformasi (ditulis atomik) lalu menandai step transform selesai."""
+        tmp_path = f"{self._frame_path}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, self._frame_path)
+        self.mark_done('transform')
+
+    def load_frame(self) -> pd.DataFrame:
+        """
+        Membaca DataFrame hasil transformasi yang tersimpan.
+
+        Raises:
+        FileNotFoundError: Jika step transform belum pernah selesai.
+        """
+        if not self.is_done('transform') or not os.path.exists(self._frame_path):
+            raise FileNotFoundError(f"Checkpoint {self.run_id} belum memiliki hasil transformasi.")
+        return pd.read_pickle(self._frame_path)
+
+    def commit_sink(self, name: str, rows: int):
+        """Mencatat bahwa sink sudah selesai dimuat sehingga tidak ditulis ulang saat resume."""
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sinks (name, rows, committed_at) VALUES (?, ?, ?)",
+                               (name, rows, time.time()))
+
+    def committed_sinks(self) -> dict:
+        """Sink yang sudah commit beserta jumlah barisnya: {name: rows}."""
+        return dict(self._conn.execute("SELECT name, rows FROM sinks").fetchall())
+
+    def close(self):
+        """Menutup koneksi SQLite checkpoint."""
+        self._conn.close()
+
+    def remove(self):
+        """Menghapus checkpoint dari disk (dipanggil setelah run selesai seluruhnya)."""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,116 +1,549 @@
 import requests
 import logging
-from bs4 import BeautifulSoup
+import multiprocessing
+import random
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlparse
+from utils.cache import PageCache
+from utils.parsers import parse_products, parse_product_rows, rows_to_products
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+BASE_URL = 'https://fashion-studio.dicoding.dev/'
 
-def scrape_page(page_num):
+# Backend parser HTML: 'lxml', 'bs4', atau None untuk memilih yang tercepat
+PARSER_BACKEND = None
+
+# Konfigurasi koneksi HTTP
+REQUEST_TIMEOUT = 10
+POOL_SIZE       = 10
+MAX_RETRIES     = 3
+BACKOFF_FACTOR  = 0.5
+BACKOFF_MAX     = 30
+RETRY_STATUS    = {429, 500, 502, 503, 504}
+
+# Cache conditional GET (None = nonaktif), diaktifkan lewat enable_page_cache()
+PAGE_CACHE = None
+
+_session = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+class PageResult(list):
     """
-    Mengambil data produk dari 1 halaman website fashion-studio.dicoding.dev.
+    List produk hasil scraping 1 halaman, ditambah status HTTP-nya.
+
+    Tetap berperilaku seperti list biasa sehingga pemanggil lama tidak berubah,
+    tetapi `scrape_all_pages` bisa membedakan halaman kosong/404 (akhir katalog)
+    dari kegagalan request sementara.
+    """
+
+    def __init__(self, products=(), status_code=None, error=None, attempts=0, elapsed=0.0, bytes=0,
+                 cache_hit=False, parse_seconds=0.0):
+        super().__init__(products)
+        self.status_code = status_code
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.bytes = bytes
+        self.cache_hit = cache_hit
+        self.parse_seconds = parse_seconds
+
+    def outcome(self, page_num):
+        """Ringkasan hasil request halaman ini dalam bentuk dictionary."""
+        return {
+            "page": page_num,
+            "status_code": self.status_code,
+            "products": len(self),
+            "attempts": self.attempts,
+            "elapsed": self.elapsed,
+            "bytes": self.bytes,
+            "parse_seconds": self.parse_seconds,
+            "cache_hit": self.cache_hit,
+            "error": self.error
+        }
+
+
+class FetchError(requests.RequestException):
+    """RequestException yang juga mencatat jumlah percobaan dan durasinya."""
+
+    def __init__(self, cause, attempts, elapsed):
+        super().__init__(str(cause), response=getattr(cause, 'response', None))
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+
+class RateLimiter:
+    """
+    Pembatas laju request per host yang aman dipakai dari banyak thread.
+
+    Parameters:
+    rate (float): Jumlah request maksimum per detik untuk setiap host.
+    """
+
+    def __init__(self, rate):
+        if rate <= 0:
+            raise ValueError("rate harus lebih besar dari 0.")
+        self.interval = 1.0 / rate
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Menunggu sampai slot request berikutnya untuk host dari `url` tersedia."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def create_session(pool_size=POOL_SIZE):
+    """
+    Membuat requests.Session dengan connection pool yang menjaga koneksi tetap hidup (keep-alive).
 
     Parameters:
-    page_num (int): Nomor halaman yang ingin di-scrape (contoh: 1, 2, ..., dst).
+    pool_size (int): Jumlah koneksi maksimum per host yang disimpan di pool.
 
     Returns:
-    list: Daftar data produk dalam bentuk dictionary, yang masing-masing berisi title, price, rating, colors, size, gender, dan timestamp waktu scraping.
+    requests.Session: Session siap pakai.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(pool_size=POOL_SIZE):
+    """
+    Mengambil session bersama milik modul, dibuat ulang jika pool yang diminta lebih besar.
+
+    Parameters:
+    pool_size (int): Ukuran pool minimum yang dibutuhkan pemanggil.
+
+    Returns:
+    requests.Session: Session bersama.
+    """
+    global _session, _session_pool_size
+    with _session_lock:
+        if _session is None or pool_size > _session_pool_size:
+            if _session is not None:
+                _session.close()
+            _session = create_session(pool_size)
+            _session_pool_size = pool_size
+        return _session
+
+
+def _retry_delay(attempt, response=None):
+    """Menghitung jeda sebelum percobaan berikutnya (exponential backoff + jitter)."""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+    delay = min(BACKOFF_FACTOR * (2 ** (attempt - 1)), BACKOFF_MAX)
+    return random.uniform(delay / 2, delay)
+
+
+def enable_page_cache(path, max_bytes=50 * 1024 * 1024, ttl=7 * 24 * 3600):
+    """
+    Mengaktifkan cache conditional GET (ETag / Last-Modified) untuk `scrape_page`.
+
+    Parameters:
+    path (str)     : Lokasi file SQLite cache.
+    max_bytes (int): Batas ukuran cache sebelum eviksi LRU.
+    ttl (float)    : Umur maksimum entri cache dalam detik.
+
+    Returns:
+    PageCache: Cache yang sedang aktif.
+    """
+    global PAGE_CACHE
+    disable_page_cache()
+    PAGE_CACHE = PageCache(path, max_bytes=max_bytes, ttl=ttl)
+    return PAGE_CACHE
+
+
+def disable_page_cache():
+    """Menonaktifkan dan menutup cache conditional GET jika sedang aktif."""
+    global PAGE_CACHE
+    if PAGE_CACHE is not None:
+        PAGE_CACHE.close()
+        PAGE_CACHE = None
+
+
+def fetch_url(url, session=None, max_retries=None, headers=None):
+    """
+    Melakukan GET dengan retry untuk timeout, error koneksi, 429 dan 5xx.
+
+    Parameters:
+    url (str)               : URL yang diminta.
+    session (requests.Session): Session yang dipakai. Default = session bersama modul.
+    max_retries (int)       : Jumlah percobaan ulang maksimum. Default = MAX_RETRIES.
+    headers (dict)          : Header tambahan, misalnya untuk conditional GET.
+
+    Returns:
+    tuple: (response, attempts, elapsed) untuk response yang berhasil.
 
     Raises:
-    AttributeError           : Jika elemen HTML produk tidak lengkap saat parsing.
-    requests.RequestException: Jika terjadi kesalahan saat melakukan permintaan HTTP.
+    FetchError: Jika semua percobaan gagal atau server membalas status error lain.
     """
+    session = session or get_session()
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+    start = time.perf_counter()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        response = None
+        try:
+            response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return response, attempt, time.perf_counter() - start
+        except requests.RequestException as e:
+            retryable = (
+                isinstance(e, (requests.Timeout, requests.ConnectionError))
+                or (response is not None and response.status_code in RETRY_STATUS)
+            )
+            if not retryable or attempt > max_retries:
+                raise FetchError(e, attempt, time.perf_counter() - start) from e
+            delay = _retry_delay(attempt, response)
+            logging.warning(f"[WARNING] Retry {attempt}/{max_retries} for {url} in {delay:.2f}s: {e}")
+            time.sleep(delay)
+
+
+def build_page_url(page_num, site=None):
+    """
+    Membentuk URL halaman katalog berdasarkan nomor halaman.
+
+    Parameters:
+    page_num (int)  : Nomor halaman (1, 2, ..., dst).
+    site (SiteConfig): Opsional. Situs dengan pola URL sendiri (lihat `utils.sites`).
+
+    Returns:
+    str: URL halaman tersebut.
+    """
+    if site is not None:
+        return site.build_page_url(page_num)
     if page_num == 1:
-        url = 'https://fashion-studio.dicoding.dev/'
-    else:
-        url = f'https://fashion-studio.dicoding.dev/page{page_num}'
+        return BASE_URL
+    return f'{BASE_URL}page{page_num}'
+
+
+def is_last_page(page_data):
+    """
+    Mengecek apakah hasil scraping menandakan katalog sudah habis.
+
+    Halaman dianggap terakhir jika server membalas 404, atau membalas sukses
+    tetapi tanpa produk. Kegagalan request lain (timeout, 5xx) tidak dihitung.
+
+    Parameters:
+    page_data (list): Hasil `scrape_page`.
+
+    Returns:
+    bool: True jika scraping sebaiknya berhenti di halaman ini.
+    """
+    if page_data:
+        return False
+    if getattr(page_data, 'status_code', None) == 404:
+        return True
+    return getattr(page_data, 'error', None) is None
+
+
+def fetch_page(page_num, site=None):
+    """
+    Stage fetch: mengambil 1 halaman katalog tanpa mem-parse HTML-nya.
+
+    Parameters:
+    page_num (int)  : Nomor halaman yang ingin diambil.
+    site (SiteConfig): Opsional. Situs yang diambil. Default = fashion-studio (BASE_URL).
+
+    Returns:
+    tuple: (page_data, response). page_data adalah PageResult yang sudah berisi status request;
+           untuk cache hit produknya sudah terisi dan response bernilai None. Jika request
+           gagal, page_data kosong dengan error terisi dan response juga None.
+    """
+    url = build_page_url(page_num, site)
 
     logging.info(f"Scraping page: {url}")
-    
+
+    cache = PAGE_CACHE
+    cached = cache.get(url) if cache is not None else None
+    headers = cache.conditional_headers(cached) if cached else None
+
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
+        response, attempts, elapsed = fetch_url(url, headers=headers)
+    except FetchError as e:
         logging.error(f"[ERROR] Request failed on page {page_num}: {e}")
-        return []
+        status_code = e.response.status_code if e.response is not None else None
+        return PageResult(status_code=status_code, error=str(e), attempts=e.attempts, elapsed=e.elapsed), None
+
+    page_data = PageResult(
+        status_code=response.status_code,
+        attempts=attempts,
+        elapsed=elapsed,
+        bytes=len(response.content)
+    )
+    if cached is not None and response.status_code == 304:
+        # Halaman tidak berubah: pakai produk hasil parse yang tersimpan
+        timestamp = datetime.now().isoformat()
+        page_data.extend(dict(product, timestamp=timestamp) for product in cached["products"])
+        page_data.cache_hit = True
+        return page_data, None
+    return page_data, response
+
 
-    soup = BeautifulSoup(response.text, 'html.parser')
-    product_cards = soup.find_all('div', class_='collection-card')
+def parse_page(page_num, page_data, response, parse_pool=None, site=None):
+    """
+    Stage parse: mengisi `page_data` dengan produk dari HTML `response` dan menyimpannya ke cache.
+
+    Dengan `parse_pool` (ProcessPoolExecutor, lihat `create_parse_pool`) bytes HTML dikirim ke
+    proses lain dan yang kembali hanya tuple ringkas, sehingga parsing berjalan di banyak core
+    tanpa tertahan GIL. Hasilnya tetap dictionary produk yang sama seperti tanpa pool.
+
+    Parameters:
+    page_num (int)          : Nomor halaman, untuk pesan log.
+    page_data (PageResult)  : Hasil `fetch_page`, diisi di tempat.
+    response (requests.Response): Response hasil `fetch_page`.
+    parse_pool (Executor)   : Process pool untuk parsing. None = parse di thread pemanggil.
+    site (SiteConfig)       : Opsional. Selector situs yang dipakai. Default = parser fashion-studio.
 
-    page_data = []
+    Returns:
+    PageResult: `page_data` yang sudah berisi produk.
+    """
     timestamp = datetime.now().isoformat()
+    if parse_pool is None:
+        parse_start = time.perf_counter()
+        products = parse_products(response.text, timestamp, backend=PARSER_BACKEND, page_num=page_num, site=site)
+        page_data.parse_seconds = time.perf_counter() - parse_start
+    else:
+        # Encoding ditentukan di sini agar hasil decode sama dengan response.text
+        encoding = response.encoding or response.apparent_encoding
+        rows, page_data.parse_seconds = parse_pool.submit(
+            parse_product_rows, response.content, encoding, PARSER_BACKEND, page_num, site).result()
+        products = rows_to_products(rows, timestamp)
+    page_data.extend(products)
 
-    for card in product_cards:
-        try:
-            # Title
-            title_tag = card.find(class_='product-title')
-            title = title_tag.text.strip() if title_tag else None
-            
-            # Price (ambil dari dalam .price-container .price atau p.price)
-            price = None
-            price_container = card.find(class_='price-container')
-            if price_container:
-                price_tag = price_container.find(class_='price')
-                if price_tag:
-                    price = price_tag.text.strip()
-            if not price:
-                price_tag = card.find('p', class_='price')
-                if price_tag:
-                    price = price_tag.text.strip()
-            
-            # Inisialisasi field lain dulu
-            rating  = None
-            colors  = None
-            size    = None
-            gender  = None
-            
-            # Cari <p> yang mengandung kata kunci
-            for p in card.find_all('p'):
-                text = p.text.strip()
-                if 'Rating:' in text:
-                    rating = text
-                elif 'Colors' in text:
-                    colors = text
-                elif 'Size:' in text:
-                    size = text
-                elif 'Gender:' in text:
-                    gender = text
-            
-            product = {
-                "title": title,
-                "price": price,
-                "rating": rating,
-                "colors": colors,
-                "size": size,
-                "gender": gender,
-                "timestamp": timestamp
-            }
-
-            page_data.append(product)
-
-        except AttributeError as e:
-            logging.warning(f"[WARNING] Missing field in product on page {page_num}: {e}")
-        except Exception as e:
-            logging.error(f"[ERROR] Unexpected error on page {page_num}: {e}")
-    
+    cache = PAGE_CACHE
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if cache is not None and (etag or last_modified):
+        cache.put(build_page_url(page_num, site), etag, last_modified, products)
     return page_data
 
 
-def scrape_all_pages(max_pages=50):
+def scrape_page(page_num, parse_pool=None, site=None):
+    """
+    Mengambil data produk dari 1 halaman website fashion-studio.dicoding.dev.
+
+    Parameters:
+    page_num (int)       : Nomor halaman yang ingin di-scrape (contoh: 1, 2, ..., dst).
+    parse_pool (Executor): Opsional. Process pool untuk stage parse (lihat `parse_page`).
+    site (SiteConfig)    : Opsional. Situs yang di-scrape (lihat `utils.sites`). Default = fashion-studio.
+
+    Returns:
+    list: Daftar data produk dalam bentuk dictionary, yang masing-masing berisi title, price, rating, colors, size, gender, dan timestamp waktu scraping.
+
+    Raises:
+    AttributeError           : Jika elemen HTML produk tidak lengkap saat parsing.
+    requests.RequestException: Jika terjadi kesalahan saat melakukan permintaan HTTP
+                               (dicatat di log, halaman dikembalikan kosong).
+    """
+    page_data, response = fetch_page(page_num, site)
+    if response is None:
+        return page_data
+    return parse_page(page_num, page_data, response, parse_pool=parse_pool, site=site)
+
+
+def create_parse_pool(workers):
+    """
+    Membuat process pool untuk stage parse.
+
+    Proses baru dibuat dengan 'forkserver' (atau 'spawn' jika tidak tersedia), bukan 'fork',
+    karena pool dipakai dari thread fetch yang sedang berjalan.
+
+    Parameters:
+    workers (int): Jumlah proses parser.
+
+    Returns:
+    ProcessPoolExecutor: Pool siap pakai; tutup dengan `shutdown()`.
+    """
+    if workers < 1:
+        raise ValueError("parse_workers minimal 1.")
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+def iter_pages(max_pages=50, max_workers=1, rate_limit=None, stop_on_empty=True, pool_size=None,
+               parse_workers=0, done_pages=None, site=None, parse_pool=None, start_page=1):
+    """
+    Generator yang menghasilkan hasil scraping per halaman, berurutan, segera setelah halaman tersedia.
+
+    Dengan `max_workers` > 1 halaman diambil secara paralel memakai thread pool;
+    request yang sedang berjalan tetap diproses selagi pemanggil mengolah halaman sebelumnya.
+    Dengan `parse_workers` > 0 HTML di-parse di process pool terpisah sehingga parsing ikut
+    paralel di banyak core; jumlah parse yang berjalan bersamaan dibatasi `max_workers`.
+
+    Parameters:
+    max_pages (int)    : Jumlah maksimum halaman yang akan di-scrape. Default = 50.
+    max_workers (int)  : Jumlah request yang boleh berjalan bersamaan. Default = 1 (berurutan).
+    rate_limit (float) : Batas request per detik per host. None = tanpa batas.
+    stop_on_empty (bool): Berhenti setelah halaman kosong atau 404 ditemukan. Default = True.
+    pool_size (int)    : Ukuran connection pool session bersama. Default = max(max_workers, POOL_SIZE).
+    parse_workers (int): Jumlah proses parser. Default = 0 (parse di thread fetch).
+    done_pages (dict)  : Produk per halaman yang sudah diambil sebelumnya (misal dari checkpoint);
+                         halaman ini tidak di-request ulang.
+    site (SiteConfig)  : Opsional. Situs yang di-scrape (lihat `utils.sites`). Default = fashion-studio.
+    parse_pool (Executor): Opsional. Process pool milik pemanggil (misal dibagi beberapa situs);
+                         tidak dimatikan di sini. Jika diberikan, `parse_workers` diabaikan.
+    start_page (int)   : Halaman pertama yang diambil, misal awal shard (lihat `utils.workqueue`). Default = 1.
+
+    Yields:
+    tuple: (page_num, page_data) dengan page_data hasil `scrape_page`.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers minimal 1.")
+
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+    get_session(pool_size or max(max_workers, POOL_SIZE))
+    own_pool = parse_pool is None and bool(parse_workers)
+    if own_pool:
+        parse_pool = create_parse_pool(parse_workers)
+    scrape_kwargs = {}
+    if parse_pool is not None:
+        scrape_kwargs['parse_pool'] = parse_pool
+    if site is not None:
+        scrape_kwargs['site'] = site
+
+    def scrape(page):
+        if done_pages and page in done_pages:
+            return PageResult(done_pages[page], status_code=200)
+        if limiter:
+            limiter.wait(build_page_url(page, site))
+        return scrape_page(page, **scrape_kwargs)
+
+    last_page = max_pages
+
+    try:
+        if max_workers == 1:
+            for page in range(start_page, max_pages + 1):
+                page_data = scrape(page)
+                yield page, page_data
+                if stop_on_empty and is_last_page(page_data):
+                    last_page = page
+                    break
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                in_flight = {}
+                next_page = start_page
+                try:
+                    while in_flight or next_page <= last_page:
+                        # Jaga agar jumlah request yang berjalan tidak melebihi max_workers
+                        while len(in_flight) < max_workers and next_page <= last_page:
+                            in_flight[next_page] = executor.submit(scrape, next_page)
+                            next_page += 1
+
+                        page = min(in_flight)
+                        page_data = in_flight.pop(page).result()
+                        if stop_on_empty and is_last_page(page_data):
+                            # Halaman setelah ini tidak perlu diambil lagi
+                            last_page = page
+                            for future in in_flight.values():
+                                future.cancel()
+                            in_flight.clear()
+                        yield page, page_data
+                finally:
+                    for future in in_flight.values():
+                        future.cancel()
+    finally:
+        if own_pool:
+            parse_pool.shutdown(cancel_futures=True)
+
+    if last_page < max_pages:
+        logging.info(f"Scraping stopped early at page {last_page} (empty or not found).")
+
+
+def iter_product_chunks(chunk_pages=5, stats=None, **scrape_kwargs):
+    """
+    Generator yang mengelompokkan produk dari beberapa halaman menjadi satu chunk.
+
+    Parameters:
+    chunk_pages (int)    : Jumlah halaman per chunk. Default = 5.
+    stats (list)         : Jika diberikan, diisi ringkasan per halaman seperti pada `scrape_all_pages`.
+    **scrape_kwargs      : Argumen yang diteruskan ke `iter_pages`.
+
+    Yields:
+    list: Produk mentah dari maksimal `chunk_pages` halaman berurutan (chunk kosong dilewati).
     """
-    Mengambil data produk dari beberapa halaman secara berurutan dari website fashion-studio.dicoding.dev.
+    if chunk_pages < 1:
+        raise ValueError("chunk_pages minimal 1.")
+
+    chunk = []
+    pages_in_chunk = 0
+    for page, page_data in iter_pages(**scrape_kwargs):
+        _record_stats(stats, page, page_data)
+        chunk.extend(page_data)
+        pages_in_chunk += 1
+        if pages_in_chunk == chunk_pages:
+            if chunk:
+                yield chunk
+            chunk = []
+            pages_in_chunk = 0
+    if chunk:
+        yield chunk
+
+
+def _record_stats(stats, page, page_data):
+    """Menambahkan ringkasan hasil sebuah halaman ke list `stats` jika diminta."""
+    if stats is None:
+        return
+    if isinstance(page_data, PageResult):
+        stats.append(page_data.outcome(page))
+    else:
+        stats.append({"page": page, "products": len(page_data)})
+
+
+def scrape_all_pages(max_pages=50, max_workers=1, rate_limit=None, stop_on_empty=True,
+                     pool_size=None, stats=None, parse_workers=0, done_pages=None, on_page=None, site=None,
+                     parse_pool=None):
+    """
+    Mengambil data produk dari beberapa halaman website fashion-studio.dicoding.dev
+    (atau situs lain lewat `site`).
+
+    Dengan `max_workers` > 1 halaman diambil secara paralel memakai thread pool,
+    namun hasil akhirnya tetap berurutan sesuai nomor halaman.
 
     Parameters:
-    max_pages (int): Jumlah maksimum halaman yang akan di-scrape. Default = 50.
+    max_pages (int)    : Jumlah maksimum halaman yang akan di-scrape. Default = 50.
+    max_workers (int)  : Jumlah request yang boleh berjalan bersamaan. Default = 1 (berurutan).
+    rate_limit (float) : Batas request per detik per host. None = tanpa batas.
+    stop_on_empty (bool): Berhenti setelah halaman kosong atau 404 ditemukan. Default = True.
+    pool_size (int)    : Ukuran connection pool session bersama. Default = max(max_workers, POOL_SIZE).
+    stats (list)       : Jika diberikan, diisi ringkasan per halaman (status, attempts, elapsed, bytes).
+    parse_workers (int): Jumlah proses parser (lihat `iter_pages`). Default = 0.
+    done_pages (dict)  : Produk per halaman yang sudah diambil sebelumnya (lihat `iter_pages`).
+    on_page (callable) : Dipanggil dengan (page_num, page_data) setelah setiap halaman, misal untuk checkpoint.
+    site (SiteConfig)  : Opsional. Situs yang di-scrape (lihat `utils.sites`). Default = fashion-studio.
+    parse_pool (Executor): Opsional. Process pool milik pemanggil yang dipakai ulang antar run
+                         (lihat `iter_pages`).
 
     Returns:
     list: Gabungan seluruh data produk dari setiap halaman.
     """
     all_data = []
-    for page in range(1, max_pages + 1):
-        data = scrape_page(page)
-        all_data.extend(data)
-    
+    for page, page_data in iter_pages(max_pages, max_workers, rate_limit, stop_on_empty, pool_size, parse_workers,
+                                      done_pages, site=site, parse_pool=parse_pool):
+        all_data.extend(page_data)
+        _record_stats(stats, page, page_data)
+        if on_page is not None:
+            on_page(page, page_data)
+
     logging.info(f"Total products scraped: {len(all_data)}")
     return all_data
@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+import utils.extract as extract
+from utils.extract import PageResult, build_page_url, is_last_page, _record_stats, _retry_delay
+from utils.parsers import parse_products, parse_product_rows, rows_to_products
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp opsional, hanya dibutuhkan oleh engine extract asyncio
+    aiohttp = None
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class AsyncFetchError(Exception):
+    """Request yang gagal setelah semua percobaan, beserta status HTTP, jumlah percobaan dan durasinya."""
+
+    def __init__(self, message, status_code=None, attempts=0, elapsed=0.0):
+        super().__init__(message)
+        self.status_code = status_code
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+
+class AsyncRateLimiter:
+    """
+    Pembatas laju request per host untuk asyncio. Task yang harus menunggu hanya `await asyncio.sleep`,
+    sehingga event loop tetap melayani request lain selama menunggu (kooperatif).
+
+    Parameters:
+    rate (float): Jumlah request maksimum per detik untuk setiap host.
+    """
+
+    def __init__(self, rate):
+        if rate <= 0:
+            raise ValueError("rate harus lebih besar dari 0.")
+        self.interval = 1.0 / rate
+        self._next_slot = {}
+
+    async def wait(self, url):
+        """Menunggu sampai slot request berikutnya untuk host dari `url` tersedia."""
+        host = urlparse(url).netloc
+        # Tanpa await di antara baca dan tulis slot, jadi aman tanpa lock di satu event loop
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class _HeadersOnly:
+    """Pembungkus header agar `_retry_delay` bisa membaca Retry-After seperti pada response requests."""
+
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def create_async_session(pool_size=extract.POOL_SIZE):
+    """
+    Membuat aiohttp.ClientSession dengan connection pool keep-alive bersama.
+
+    Session ini bisa dibuat sekali oleh service asyncio dan dipakai ulang untuk banyak
+    panggilan `scrape_all_pages_async(session=...)`. Harus dibuat di dalam event loop yang berjalan.
+
+    Parameters:
+    pool_size (int): Jumlah koneksi maksimum yang dibuka bersamaan.
+
+    Returns:
+    aiohttp.ClientSession: Session siap pakai; tutup dengan `await session.close()`.
+
+    Raises:
+    ImportError: Jika aiohttp tidak terpasang.
+    """
+    if aiohttp is None:
+        raise ImportError("Engine extract asyncio membutuhkan paket aiohttp.")
+    connector = aiohttp.TCPConnector(limit=pool_size, limit_per_host=pool_size)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=extract.REQUEST_TIMEOUT))
+
+
+async def fetch_url_async(session, url, max_retries=None, headers=None):
+    """
+    Versi asyncio dari `fetch_url`: GET dengan retry untuk timeout, error koneksi, 429 dan 5xx.
+
+    Parameters:
+    session (aiohttp.ClientSession): Session yang dipakai.
+    url (str)        : URL yang diminta.
+    max_retries (int): Jumlah percobaan ulang maksimum. Default = MAX_RETRIES.
+    headers (dict)   : Header tambahan, misalnya untuk conditional GET.
+
+    Returns:
+    tuple: (status, headers, body, charset, attempts, elapsed) untuk response yang berhasil (termasuk 304).
+
+    Raises:
+    AsyncFetchError: Jika semua percobaan gagal atau server membalas status error lain.
+    """
+    max_retries = extract.MAX_RETRIES if max_retries is None else max_retries
+    start = time.perf_counter()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        status = None
+        response_headers = None
+        try:
+            async with session.get(url, headers=headers) as response:
+                status = response.status
+                response_headers = response.headers
+                if status < 400:
+                    body = await response.read()
+                    return status, response_headers, body, response.charset, attempt, time.perf_counter() - start
+                error = f"{status} {response.reason} for url: {url}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = f"{type(e).__name__}: {e}"
+
+        retryable = status is None or status in extract.RETRY_STATUS
+        if not retryable or attempt > max_retries:
+            raise AsyncFetchError(error, status_code=status, attempts=attempt, elapsed=time.perf_counter() - start)
+        delay = _retry_delay(attempt, _HeadersOnly(response_headers) if response_headers is not None else None)
+        logging.warning(f"[WARNING] Retry {attempt}/{max_retries} for {url} in {delay:.2f}s: {error}")
+        await asyncio.sleep(delay)
+
+
+async def scrape_page_async(page_num, session, parse_pool=None, site=None):
+    """
+    Versi asyncio dari `scrape_page` dengan format hasil yang sama (PageResult berisi dictionary produk).
+
+    Parsing dan baca/tulis `PageCache` (SQLite, sinkron) tidak pernah berjalan di event loop agar
+    coroutine lain (termasuk service asyncio yang memakai engine ini) tidak tertahan: parsing di
+    process pool jika `parse_pool` (lihat `create_parse_pool`) diberikan, selain itu keduanya di
+    thread pool default lewat `asyncio.to_thread`.
+
+    Parameters:
+    page_num (int)                 : Nomor halaman yang ingin di-scrape.
+    session (aiohttp.ClientSession): Session yang dipakai.
+    parse_pool (Executor)          : Opsional. Process pool untuk parsing.
+    site (SiteConfig)              : Opsional. Situs yang di-scrape (lihat `utils.sites`).
+
+    Returns:
+    PageResult: Daftar produk halaman tersebut beserta status request-nya.
+    """
+    url = build_page_url(page_num, site)
+    logging.info(f"Scraping page: {url}")
+
+    cache = extract.PAGE_CACHE
+    cached = await asyncio.to_thread(cache.get, url) if cache is not None else None
+    headers = cache.conditional_headers(cached) if cached else None
+
+    try:
+        status, response_headers, body, charset, attempts, elapsed = await fetch_url_async(
+            session, url, headers=headers)
+    except AsyncFetchError as e:
+        logging.error(f"[ERROR] Request failed on page {page_num}: {e}")
+        return PageResult(status_code=e.status_code, error=str(e), attempts=e.attempts, elapsed=e.elapsed)
+
+    timestamp = datetime.now().isoformat()
+    page_data = PageResult(status_code=status, attempts=attempts, elapsed=elapsed, bytes=len(body))
+    if cached is not None and status == 304:
+        # Halaman tidak berubah: pakai produk hasil parse yang tersimpan
+        page_data.extend(dict(product, timestamp=timestamp) for product in cached["products"])
+        page_data.cache_hit = True
+        return page_data
+
+    if parse_pool is None:
+        parse_start = time.perf_counter()
+        products = await asyncio.to_thread(
+            parse_products, body.decode(charset or 'utf-8', errors='replace'), timestamp,
+            backend=extract.PARSER_BACKEND, page_num=page_num, site=site)
+        page_data.parse_seconds = time.perf_counter() - parse_start
+    else:
+        rows, page_data.parse_seconds = await asyncio.get_running_loop().run_in_executor(
+            parse_pool, parse_product_rows, body, charset, extract.PARSER_BACKEND, page_num, site)
+        products = rows_to_products(rows, timestamp)
+    page_data.extend(products)
+
+    etag = response_headers.get('ETag')
+    last_modified = response_headers.get('Last-Modified')
+    if cache is not None and (etag or last_modified):
+        await asyncio.to_thread(cache.put, url, etag, last_modified, products)
+    return page_data
+
+
+async def scrape_all_pages_async(max_pages=50, max_workers=8, rate_limit=None, stop_on_empty=True,
+                                 pool_size=None, stats=None, parse_workers=0, done_pages=None, on_page=None,
+                                 session=None, site=None, parse_pool=None):
+    """
+    Versi asyncio dari `scrape_all_pages` dengan argumen dan hasil yang sama.
+
+    Setiap halaman dijalankan sebagai task di satu asyncio.TaskGroup; semaphore membatasi
+    jumlah request bersamaan sebesar `max_workers`, semua task memakai satu connection pool,
+    dan rate limit ditunggu secara kooperatif. Hasil tetap berurutan sesuai nomor halaman.
+
+    Bisa dipanggil langsung dari service asyncio (`await scrape_all_pages_async(...)`), atau dari
+    kode sinkron lewat `scrape_all_pages_sync`.
+
+    Parameters:
+    max_pages (int)    : Jumlah maksimum halaman yang akan di-scrape. Default = 50.
+    max_workers (int)  : Jumlah request yang boleh berjalan bersamaan (ukuran semaphore). Default = 8.
+    rate_limit (float) : Batas request per detik per host. None = tanpa batas.
+    stop_on_empty (bool): Berhenti setelah halaman kosong atau 404 ditemukan. Default = True.
+    pool_size (int)    : Ukuran connection pool jika session dibuat di sini. Default = max(max_workers, POOL_SIZE).
+    stats (list)       : Jika diberikan, diisi ringkasan per halaman seperti pada `scrape_all_pages`.
+    parse_workers (int): Jumlah proses parser. Default = 0 (parse di event loop).
+    done_pages (dict)  : Produk per halaman yang sudah diambil sebelumnya; tidak di-request ulang.
+    on_page (callable) : Dipanggil dengan (page_num, page_data) untuk setiap halaman, berurutan.
+    session (aiohttp.ClientSession): Session milik pemanggil untuk dipakai ulang. Default = session baru.
+    site (SiteConfig)  : Opsional. Situs yang di-scrape (lihat `utils.sites`). Default = fashion-studio.
+    parse_pool (Executor): Opsional. Process pool milik pemanggil; tidak dimatikan di sini.
+                         Jika diberikan, `parse_workers` diabaikan.
+
+    Returns:
+    list: Gabungan seluruh data produk dari setiap halaman.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers minimal 1.")
+
+    limiter = AsyncRateLimiter(rate_limit) if rate_limit else None
+    semaphore = asyncio.Semaphore(max_workers)
+    own_pool = parse_pool is None and bool(parse_workers)
+    if own_pool:
+        parse_pool = extract.create_parse_pool(parse_workers)
+    own_session = session is None
+    if own_session:
+        session = create_async_session(pool_size or max(max_workers, extract.POOL_SIZE))
+
+    results = {}
+    all_data = []
+    last_page = max_pages
+    next_page = 1
+
+    def flush():
+        """Melaporkan halaman yang sudah selesai secara berurutan (seperti urutan `iter_pages`)."""
+        nonlocal next_page, last_page
+        while next_page <= last_page and next_page in results:
+            page_data = results.pop(next_page)
+            all_data.extend(page_data)
+            _record_stats(stats, next_page, page_data)
+            if on_page is not None:
+                on_page(next_page, page_data)
+            if stop_on_empty and is_last_page(page_data):
+                last_page = next_page
+            next_page += 1
+
+    async def scrape(page):
+        nonlocal last_page
+        try:
+            if page > last_page:
+                return
+            if done_pages and page in done_pages:
+                page_data = PageResult(done_pages[page], status_code=200)
+            else:
+                if limiter:
+                    await limiter.wait(build_page_url(page, site))
+                page_data = await scrape_page_async(page, session, parse_pool, site)
+            if stop_on_empty and is_last_page(page_data):
+                # Halaman setelah ini tidak perlu diminta lagi
+                last_page = min(last_page, page)
+            results[page] = page_data
+            flush()
+        finally:
+            semaphore.release()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for page in range(1, max_pages + 1):
+                # Task baru hanya dibuat jika ada slot kosong, jadi halaman setelah akhir katalog tidak diminta
+                await semaphore.acquire()
+                if page > last_page:
+                    semaphore.release()
+                    break
+                group.create_task(scrape(page))
+    finally:
+        if own_session:
+            await session.close()
+        if own_pool:
+            parse_pool.shutdown(cancel_futures=True)
+
+    if last_page < max_pages:
+        logging.info(f"Scraping stopped early at page {last_page} (empty or not found).")
+    logging.info(f"Total products scraped: {len(all_data)}")
+    return all_data
+
+
+def scrape_all_pages_sync(**kwargs):
+    """
+    Menjalankan `scrape_all_pages_async` dari kode sinkron (misal main.py) di event loop baru.
+
+    Parameters:
+    **kwargs: Argumen yang diteruskan ke `scrape_all_pages_async`.
+
+    Returns:
+    list: Gabungan seluruh data produk dari setiap halaman.
+    """
+    return asyncio.run(scrape_all_pages_async(**kwargs))
@@ -1,24 +1,91 @@
+import io
+import json
 import os
 import logging
+import random
+import re
+import time
+import uuid
 import pandas as pd
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from sqlalchemy import create_engine, Table, Column, String, Float, Integer, MetaData, insert
-from dotenv import load_dotenv
+from pandas.api.types import union_categoricals
 
 # Setup logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
-load_dotenv()
 
+# Dependensi berat tiap sink di-import di dalam fungsi yang memakainya, sehingga run yang hanya
+# menulis CSV tidak memuat Google API client, SQLAlchemy maupun pyarrow. Nama-nama itu sengaja tidak
+# ada di namespace modul: patch di test ditujukan ke modul asalnya (misal `sqlalchemy.create_engine`),
+# dan patch lama seperti `utils.load.create_engine` gagal dengan AttributeError, bukan diam-diam tidak terpakai.
 
-def save_to_csv(df: pd.DataFrame, filename: str):
+# Kunci natural produk untuk upsert pada mode bulk
+NATURAL_KEY = ("title", "size", "gender", "colors")
+# Scraping multi-situs (lihat utils/sites.py): produk yang sama di toko berbeda adalah baris berbeda
+SOURCE_COLUMN = "source"
+SITE_KEY      = NATURAL_KEY + (SOURCE_COLUMN,)
+COPY_CHUNK_SIZE = 50_000
+COPY_NULL       = '\\N'
+
+# Batas request Google Sheets API (payload yang disarankan maksimal sekitar 2 MB per request)
+SHEETS_SCOPES          = ['https://www.googleapis.com/auth/spreadsheets']
+SHEETS_MAX_REQUEST_BYTES = 1_500_000
+SHEETS_MAX_ROWS_PER_REQUEST = 10_000
+SHEETS_RETRY_STATUS    = {429, 500, 502, 503}
+
+# Skema yang dideklarasikan saat membaca products.csv, agar pandas tidak perlu menebak tipe data
+CSV_READ_DTYPES = {
+    'title'    : 'object',
+    'price'    : 'float64',
+    'rating'   : 'float64',
+    'colors'   : 'int64',
+    'size'     : 'object',
+    'gender'   : 'object',
+    'timestamp': 'object'
+}
+# size/gender sebagai category hanya pada skema ringkas; kategori tiap chunk disatukan di `_concat_chunks`
+CSV_READ_COMPACT_DTYPES = {**CSV_READ_DTYPES, 'rating': 'float32', 'colors': 'int8',
+                           'size': 'category', 'gender': 'category'}
+CSV_CHUNK_SIZE   = 100_000
+CSV_AGGREGATIONS = ("sum", "count", "min", "max", "mean")
+COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.zip', '.xz', '.zst')
+
+# Dataset Parquet: dipartisi per tanggal scraping, size/gender di-dictionary-encode
+PARQUET_PARTITION_COLUMN = "scrape_date"
+PARQUET_DICTIONARY_COLUMNS = ("size", "gender")
+PARQUET_COMPRESSION      = "zstd"
+
+
+def _to_plain_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Menyamakan DataFrame berskema ringkas (lihat `utils.transform.COMPACT_DTYPES`) dengan
+    skema default sebelum ditulis: kategori menjadi string, datetime menjadi string ISO,
+    dan float32/int kecil menjadi float64/int64 tanpa noise presisi.
+    DataFrame berskema default dikembalikan apa adanya.
+    """
+    converted = {}
+    for column, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            converted[column] = df[column].astype(object).where(df[column].notna(), None)
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            converted[column] = df[column].map(lambda value: value.isoformat() if pd.notna(value) else None)
+        elif dtype == 'float32':
+            # Lewat representasi string agar 3.9 tetap 3.9, bukan 3.9000000953674316
+            converted[column] = df[column].astype(str).astype('float64')
+        elif pd.api.types.is_integer_dtype(dtype) and dtype != 'int64':
+            converted[column] = df[column].astype('int64')
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def save_to_csv(df: pd.DataFrame, filename: str, append: bool = False):
     """
     Menyimpan DataFrame ke dalam file CSV.
 
     Parameters:
     df (pd.DataFrame): Data yang akan disimpan.
     filename (str): Nama file .csv yang ingin dibuat.
+    append (bool): Jika True, baris ditambahkan ke akhir file tanpa header (untuk mode streaming).
 
     Returns:
     None
@@ -27,14 +94,318 @@ def save_to_csv(df: pd.DataFrame, filename: str):
     Exception: Jika terjadi kegagalan saat menyimpan ke CSV.
     """
     try:
-        df.to_csv(filename, index=False)
+        df = _to_plain_frame(df)
+        if append:
+            df.to_csv(filename, mode='a', header=False, index=False)
+        else:
+            df.to_csv(filename, index=False)
         logging.info(f"Data berhasil disimpan ke {filename}")
     except Exception as e:
         logging.error("Gagal menyimpan data ke CSV.")
         raise e
 
 
-def save_to_google_sheets(df: pd.DataFrame, spreadsheet_id: str, range_name: str, creds_json_path: str):
+def read_csv_chunks(filename: str, chunksize: int = CSV_CHUNK_SIZE, columns: list = None,
+                    compact: bool = False, memory_map: bool = True):
+    """
+    Membaca snapshot products.csv (atau arsipnya, boleh terkompresi) per chunk dengan skema tetap.
+
+    Tipe data dideklarasikan lewat `CSV_READ_DTYPES` sehingga tidak ada tahap inferensi,
+    dan file yang tidak terkompresi di-memory-map sehingga memori yang dipakai hanya
+    sebesar satu chunk.
+
+    Parameters:
+    filename (str)  : Path file CSV.
+    chunksize (int) : Jumlah baris per chunk. Default = CSV_CHUNK_SIZE.
+    columns (list)  : Kolom yang dibaca. Default = semua.
+    compact (bool)  : Pakai tipe ringkas (float32, int8, size/gender category, timestamp sebagai
+                      datetime64). Default = False.
+    memory_map (bool): Memory-map file yang tidak terkompresi. Default = True.
+
+    Yields:
+    pd.DataFrame: Satu chunk data.
+    """
+    dtypes = dict(CSV_READ_COMPACT_DTYPES if compact else CSV_READ_DTYPES)
+    options = {}
+    if compact and (columns is None or 'timestamp' in columns):
+        del dtypes['timestamp']
+        options['parse_dates'] = ['timestamp']
+        options['date_format'] = 'ISO8601'
+
+    reader = pd.read_csv(
+        filename,
+        usecols=columns,
+        dtype={column: dtype for column, dtype in dtypes.items() if columns is None or column in columns},
+        chunksize=chunksize,
+        memory_map=memory_map and not str(filename).endswith(COMPRESSED_SUFFIXES),
+        **options
+    )
+    with reader:
+        yield from reader
+
+
+def _concat_chunks(parts: list) -> pd.DataFrame:
+    """
+    Menggabungkan chunk hasil `read_csv_chunks`. Setiap chunk punya kategori sendiri, dan `pd.concat`
+    mengubah kolom category yang kategorinya berbeda menjadi object; kategorinya disatukan lebih dulu.
+    """
+    for column, dtype in parts[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            categories = union_categoricals([part[column] for part in parts]).categories
+            parts = [part.assign(**{column: part[column].cat.set_categories(categories)}) for part in parts]
+    return pd.concat(parts, ignore_index=True)
+
+
+def filter_csv(filename: str, predicate, columns: list = None, **read_options) -> pd.DataFrame:
+    """
+    Menyaring snapshot CSV chunk demi chunk; hanya baris yang lolos yang disimpan di memori.
+
+    Parameters:
+    filename (str)     : Path file CSV.
+    predicate          : Fungsi yang menerima satu chunk dan mengembalikan mask boolean.
+    columns (list)     : Kolom yang dibaca dan dikembalikan. Default = semua.
+    read_options       : Argumen tambahan untuk `read_csv_chunks` (chunksize, compact, memory_map).
+
+    Returns:
+    pd.DataFrame: Gabungan baris yang lolos filter.
+    """
+    parts = [chunk[predicate(chunk)] for chunk in read_csv_chunks(filename, columns=columns, **read_options)]
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    return _concat_chunks(parts)
+
+
+def aggregate_csv(filename: str, aggregations: dict, by=None, **read_options) -> pd.DataFrame:
+    """
+    Menghitung agregasi (sum, count, min, max, mean) atas snapshot CSV chunk demi chunk.
+
+    Setiap chunk hanya menyisakan hasil parsial per grup, lalu hasil parsial digabung
+    di akhir (mean dihitung dari total sum / total count), sehingga memori tetap kecil
+    walaupun file berukuran sangat besar.
+
+    Parameters:
+    filename (str)     : Path file CSV.
+    aggregations (dict): Nama kolom hasil -> (kolom sumber, fungsi), misal {'avg_price': ('price', 'mean')}.
+    by                 : Kolom (atau list kolom) pengelompokan. Default = None (satu baris total).
+    read_options       : Argumen tambahan untuk `read_csv_chunks` (chunksize, compact, memory_map).
+
+    Returns:
+    pd.DataFrame: Hasil agregasi dengan index kolom `by`.
+
+    Raises:
+    ValueError: Jika fungsi agregasi tidak didukung.
+    """
+    unsupported = [func for _, func in aggregations.values() if func not in CSV_AGGREGATIONS]
+    if unsupported:
+        raise ValueError(f"Fungsi agregasi tidak didukung: {unsupported}. Pilihan: {list(CSV_AGGREGATIONS)}")
+
+    keys = [] if by is None else ([by] if isinstance(by, str) else list(by))
+    sources = {source for source, _ in aggregations.values()}
+    columns = list(dict.fromkeys(keys + sorted(sources)))
+
+    # Agregasi parsial per chunk: mean dipecah menjadi sum + count
+    partial_specs = {}
+    for source, func in aggregations.values():
+        for part in (("sum", "count") if func == "mean" else (func,)):
+            partial_specs[f"{source}__{part}"] = (source, part)
+
+    partials = []
+    for chunk in read_csv_chunks(filename, columns=columns, **read_options):
+        grouped = chunk.groupby(keys, observed=True, sort=False) if keys else chunk.groupby(lambda _: 0)
+        partials.append(grouped.agg(**partial_specs))
+
+    combine = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+    if partials:
+        merged = pd.concat(partials)
+        merged = merged.groupby(level=list(range(merged.index.nlevels)), observed=True).agg(
+            {name: combine[part] for name, (_, part) in partial_specs.items()}
+        )
+    else:
+        merged = pd.DataFrame(columns=list(partial_specs))
+
+    result = pd.DataFrame(index=merged.index)
+    for name, (source, func) in aggregations.items():
+        if func == "mean":
+            result[name] = merged[f"{source}__sum"] / merged[f"{source}__count"]
+        else:
+            result[name] = merged[f"{source}__{func}"]
+    if not keys:
+        result = result.reset_index(drop=True)
+    return result
+
+
+def _drop_keys(df: pd.DataFrame, keys: pd.DataFrame, key_columns: tuple = NATURAL_KEY) -> pd.DataFrame:
+    """Membuang baris `df` yang kuncinya ada di `keys`."""
+    if df.empty or keys.empty:
+        return df
+    index = pd.MultiIndex.from_frame(df[list(key_columns)].astype(object))
+    drop = pd.MultiIndex.from_frame(keys[list(key_columns)].astype(object))
+    return df[~index.isin(drop)]
+
+
+def save_changes_to_csv(upserts: pd.DataFrame, deleted: pd.DataFrame, filename: str):
+    """
+    Menerapkan perubahan (mode incremental) ke file CSV yang sudah ada.
+
+    Baris dengan kunci yang ada di `upserts` diganti, baris dengan kunci di `deleted`
+    dibuang, lalu baris baru ditambahkan di akhir. Jika file belum ada, `upserts`
+    ditulis sebagai file baru.
+
+    Parameters:
+    upserts (pd.DataFrame): Baris baru dan baris yang berubah.
+    deleted (pd.DataFrame): Kolom NATURAL_KEY dari produk yang hilang (ditambah `source` pada multi-situs).
+    filename (str): Nama file .csv tujuan.
+
+    Returns:
+    None
+
+    Raises:
+    Exception: Jika terjadi kegagalan saat menyimpan ke CSV.
+    """
+    try:
+        upserts = _to_plain_frame(upserts)
+        key_columns = SITE_KEY if SOURCE_COLUMN in upserts.columns else NATURAL_KEY
+        if os.path.exists(filename):
+            existing = pd.read_csv(filename)
+            existing = _drop_keys(existing, deleted, key_columns)
+            existing = _drop_keys(existing, upserts, key_columns)
+            upserts = pd.concat([existing, upserts], ignore_index=True)
+        upserts.to_csv(filename, index=False)
+        logging.info(f"Perubahan berhasil disimpan ke {filename}: {len(upserts)} baris.")
+    except Exception as e:
+        logging.error("Gagal menyimpan perubahan ke CSV.")
+        raise e
+
+
+def _parquet_schema(with_source: bool = False):
+    """
+    Skema Arrow untuk dataset Parquet produk (tanpa kolom partisi); `with_source` menambah kolom
+    nama situs (multi-situs), di-dictionary-encode seperti size/gender.
+    """
+    import pyarrow as pa
+    fields = [
+        ("title", pa.string()),
+        ("price", pa.float64()),
+        ("rating", pa.float64()),
+        ("colors", pa.int64()),
+        ("size", pa.dictionary(pa.int8(), pa.string())),
+        ("gender", pa.dictionary(pa.int8(), pa.string())),
+        ("timestamp", pa.timestamp("us")),
+    ]
+    if with_source:
+        fields.append((SOURCE_COLUMN, pa.dictionary(pa.int8(), pa.string())))
+    return pa.schema(fields)
+
+
+def _parquet_partitioning():
+    """Partisi gaya Hive `scrape_date=YYYY-MM-DD/`."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    return ds.partitioning(pa.schema([(PARQUET_PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+
+def save_to_parquet(df: pd.DataFrame, root_path: str, compression: str = PARQUET_COMPRESSION,
+                    run_id: str = None) -> list:
+    """
+    Menambahkan DataFrame ke dataset Parquet yang dipartisi per tanggal scraping.
+
+    Setiap pemanggilan menulis file baru `scrape_date=<tanggal>/part-<run_id>-<i>.parquet`
+    tanpa menyentuh file lama, sehingga riwayat run sebelumnya tetap tersimpan.
+    Timestamp disimpan sebagai tipe timestamp (bukan string ISO), size/gender sebagai
+    kolom dictionary. Kolom `source` (run multi-situs) ikut disimpan jika ada.
+
+    Parameters:
+    df (pd.DataFrame): Data yang akan disimpan (skema default maupun ringkas).
+    root_path (str): Direktori root dataset.
+    compression (str): Codec kompresi Parquet. Default = 'zstd'.
+    run_id (str): Penanda file yang unik per pemanggilan. Default = waktu sekarang + id acak.
+
+    Returns:
+    list: Path file Parquet yang ditulis.
+
+    Raises:
+    ImportError: Jika pyarrow tidak terpasang.
+    Exception: Jika terjadi kegagalan saat menyimpan ke Parquet.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("Sink Parquet membutuhkan paket pyarrow.") from e
+
+    run_id = run_id or f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    try:
+        with_source = SOURCE_COLUMN in df.columns
+        schema = _parquet_schema(with_source)
+        plain_df = _to_plain_frame(df)
+        timestamps = pd.to_datetime(plain_df["timestamp"], format="ISO8601")
+        frame = plain_df[schema.names].assign(timestamp=timestamps)
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        table = table.append_column(PARQUET_PARTITION_COLUMN, pa.array(timestamps.dt.strftime("%Y-%m-%d")))
+
+        written = []
+        file_format = ds.ParquetFileFormat()
+        ds.write_dataset(
+            table,
+            root_path,
+            format=file_format,
+            file_options=file_format.make_write_options(
+                compression=compression,
+                use_dictionary=list(PARQUET_DICTIONARY_COLUMNS) + ([SOURCE_COLUMN] if with_source else [])
+            ),
+            partitioning=_parquet_partitioning(),
+            basename_template=f"part-{run_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_visitor=lambda written_file: written.append(written_file.path)
+        )
+        logging.info(f"Data berhasil disimpan ke dataset Parquet {root_path}: {len(df)} baris, {len(written)} file.")
+        return written
+    except Exception as e:
+        logging.error("Gagal menyimpan data ke Parquet.")
+        raise e
+
+
+def read_parquet_history(root_path: str, columns: list = None, filters=None) -> pd.DataFrame:
+    """
+    Membaca dataset Parquet hasil `save_to_parquet` dengan proyeksi kolom dan predicate pushdown.
+
+    Filter pada `scrape_date` memangkas partisi sebelum file dibuka, dan filter kolom
+    lain dievaluasi memakai statistik row group sehingga data yang tidak cocok tidak di-decode.
+
+    Parameters:
+    root_path (str): Direktori root dataset.
+    columns (list) : Kolom yang dibaca (termasuk 'scrape_date' jika perlu). Default = semua.
+    filters        : Ekspresi pyarrow, atau list tuple seperti [('scrape_date', '>=', '2025-05-01')].
+
+    Returns:
+    pd.DataFrame: Data yang cocok; size/gender (dan source pada run multi-situs) sebagai kolom category.
+
+    Raises:
+    ImportError: Jika pyarrow tidak terpasang.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Pembacaan Parquet membutuhkan paket pyarrow.") from e
+
+    if filters is not None and not isinstance(filters, ds.Expression):
+        filters = pq.filters_to_expression(filters)
+    dataset = ds.dataset(root_path, format="parquet", partitioning=_parquet_partitioning())
+    if SOURCE_COLUMN not in dataset.schema.names:
+        # Skema dataset diambil dari satu file saja; file run multi-situs mungkin punya kolom source.
+        # Footer semua file dibaca (bukan datanya) agar kolom itu tidak hilang; baris lama bernilai null.
+        # Filter belum bisa dipakai di sini karena bisa merujuk kolom source yang belum ada di skema.
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        if any(SOURCE_COLUMN in schema.names for schema in schemas):
+            schema = pa.unify_schemas([dataset.schema] + schemas)
+            dataset = ds.dataset(root_path, schema=schema, format="parquet", partitioning=_parquet_partitioning())
+    return dataset.to_table(columns=columns, filter=filters).to_pandas()
+
+
+def save_to_google_sheets(df: pd.DataFrame, spreadsheet_id: str, range_name: str, creds_json_path: str,
+                          append: bool = False):
     """
     Menyimpan DataFrame ke Google Sheets menggunakan Google Sheets API.
 
@@ -43,6 +414,7 @@ def save_to_google_sheets(df: pd.DataFrame, spreadsheet_id: str, range_name: str
     spreadsheet_id (str): ID Google Sheets yang menjadi target penulisan.
     range_name (str): Range lokasi data di Sheets (misal: 'Sheet1!A2').
     creds_json_path (str): Path ke file service account JSON.
+    append (bool): Jika True, baris ditambahkan setelah data yang sudah ada (untuk mode streaming).
 
     Returns:
     None
@@ -50,6 +422,9 @@ def save_to_google_sheets(df: pd.DataFrame, spreadsheet_id: str, range_name: str
     Raises:
     Exception: Jika terjadi kegagalan saat menyimpan ke Google Sheets.
     """
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import build
+
     try:
         # Setup credentials dan Sheets API client
         scopes      = ['https://www.googleapis.com/auth/spreadsheets']
@@ -58,18 +433,27 @@ def save_to_google_sheets(df: pd.DataFrame, spreadsheet_id: str, range_name: str
         sheet       = service.spreadsheets()
 
         # Siapkan data dalam format list of lists
-        values  = df.values.tolist()
+        values  = _to_plain_frame(df).values.tolist()
         body    = {
             'values': values
         }
 
         # Kirim data ke Sheets
-        result = sheet.values().update(
-            spreadsheetId=spreadsheet_id,
-            range=range_name,
-            valueInputOption='RAW',
-            body=body
-        ).execute()
+        if append:
+            result = sheet.values().append(
+                spreadsheetId=spreadsheet_id,
+                range=range_name,
+                valueInputOption='RAW',
+                insertDataOption='INSERT_ROWS',
+                body=body
+            ).execute()
+        else:
+            result = sheet.values().update(
+                spreadsheetId=spreadsheet_id,
+                range=range_name,
+                valueInputOption='RAW',
+                body=body
+            ).execute()
 
         logging.info(f"Menulis data tanpa header ke range {range_name}, jumlah baris: {len(values)}")
         logging.info("Data berhasil ditulis ke Google Sheets.")
@@ -78,67 +462,711 @@ def save_to_google_sheets(df: pd.DataFrame, spreadsheet_id: str, range_name: str
         raise e
 
 
-def save_to_postgres(df: pd.DataFrame, table_name: str):
+def _column_letter(index: int) -> str:
+    """Mengubah indeks kolom (0 = A) menjadi huruf kolom A1 notation."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _column_index(letters: str) -> int:
+    """Mengubah huruf kolom A1 notation menjadi indeks kolom (A = 0)."""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def _parse_a1_start(range_name: str):
+    """
+    Mengambil nama sheet, indeks kolom awal dan nomor baris awal dari range seperti 'Sheet1!A2:J'.
+
+    Raises:
+    ValueError: Jika range tidak berformat '<sheet>!<kolom><baris>...'.
+    """
+    match = re.match(r"^(?P<sheet>.+)!(?P<column>[A-Za-z]+)(?P<row>\d+)", range_name)
+    if not match:
+        raise ValueError(f"Range Google Sheets tidak valid: {range_name}")
+    return match.group('sheet'), _column_index(match.group('column')), int(match.group('row'))
+
+
+def _sheet_cell(value):
+    """Menyamakan nilai sel agar hasil baca Sheets bisa dibandingkan dengan baris DataFrame."""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return value
+
+
+def _merge_blocks(changed: dict) -> list:
+    """Menggabungkan baris {offset: row} dengan offset berurutan menjadi blok [(offset, rows), ...]."""
+    blocks = []
+    for offset in sorted(changed):
+        if blocks and blocks[-1][0] + len(blocks[-1][1]) == offset:
+            blocks[-1][1].append(changed[offset])
+        else:
+            blocks.append((offset, [changed[offset]]))
+    return blocks
+
+
+class GoogleSheetsLoader:
     """
-    Menyimpan DataFrame ke PostgreSQL menggunakan SQLAlchemy Table dan insert statement.
+    Loader Google Sheets yang dipakai ulang untuk banyak pemanggilan `load()`.
+
+    Client Sheets API dibuat sekali lalu di-cache. Data dikirim lewat `values().batchUpdate`
+    yang dipecah agar tiap request tetap di bawah batas ukuran payload API, dan request yang
+    dibalas 429/5xx dicoba ulang dengan exponential backoff. Mode incremental membaca isi sheet,
+    membandingkannya per kunci baris, lalu hanya menulis range baris yang berubah atau baru.
 
     Parameters:
-    df (pd.DataFrame): Data yang akan disimpan.
-    table_name (str): Nama tabel tujuan di database.
+    spreadsheet_id (str)     : ID Google Sheets yang menjadi target penulisan.
+    range_name (str)         : Range awal data, misal 'Sheet1!A2:J'.
+    creds_json_path (str)    : Path ke file service account JSON.
+    service                  : Client Sheets API yang sudah jadi (opsional, misal untuk test).
+    key_columns (tuple)      : Kolom kunci baris untuk mode incremental. Default = NATURAL_KEY;
+                               SITE_KEY untuk multi-situs.
+    max_request_bytes (int)  : Perkiraan ukuran payload maksimum per request.
+    max_rows_per_request (int): Jumlah baris maksimum per request.
+    max_retries (int)        : Jumlah percobaan ulang untuk 429/5xx. Default = 5.
+    backoff_factor (float)   : Jeda dasar backoff dalam detik. Default = 1.0.
+    """
+
+    def __init__(self, spreadsheet_id: str, range_name: str, creds_json_path: str = None, service=None,
+                 key_columns: tuple = NATURAL_KEY, max_request_bytes: int = SHEETS_MAX_REQUEST_BYTES,
+                 max_rows_per_request: int = SHEETS_MAX_ROWS_PER_REQUEST, max_retries: int = 5,
+                 backoff_factor: float = 1.0):
+        if service is None and creds_json_path is None:
+            raise ValueError("creds_json_path atau service harus diberikan.")
+
+        self.spreadsheet_id = spreadsheet_id
+        self.range_name = range_name
+        self.sheet_name, self.start_column, self.start_row = _parse_a1_start(range_name)
+        self.creds_json_path = creds_json_path
+        self.key_columns = key_columns
+        self.max_request_bytes = max_request_bytes
+        self.max_rows_per_request = max_rows_per_request
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.history = []
+        self.requests_sent = 0
+        self._service = service
+
+    @property
+    def service(self):
+        """Client Sheets API, dibuat sekali saat pertama kali dibutuhkan."""
+        if self._service is None:
+            from google.oauth2.service_account import Credentials
+            from googleapiclient.discovery import build
+
+            credentials = Credentials.from_service_account_file(self.creds_json_path, scopes=SHEETS_SCOPES)
+            self._service = build('sheets', 'v4', credentials=credentials, cache_discovery=False)
+        return self._service
+
+    def _execute(self, request):
+        """Menjalankan request API dengan retry + exponential backoff untuk 429 dan 5xx."""
+        from googleapiclient.errors import HttpError
+
+        attempt = 0
+        while True:
+            try:
+                self.requests_sent += 1
+                return request.execute()
+            except HttpError as e:
+                status = getattr(e.resp, 'status', None)
+                if status not in SHEETS_RETRY_STATUS or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                delay = self.backoff_factor * (2 ** (attempt - 1))
+                delay = random.uniform(delay / 2, delay)
+                logging.warning(f"Google Sheets membalas {status}, mencoba ulang ({attempt}/{self.max_retries}) dalam {delay:.2f} detik.")
+                time.sleep(delay)
+
+    def _row_range(self, row_offset: int, n_rows: int, n_columns: int) -> str:
+        """Range A1 untuk `n_rows` baris mulai dari offset baris data ke-`row_offset`."""
+        first_row = self.start_row + row_offset
+        first_column = _column_letter(self.start_column)
+        last_column = _column_letter(self.start_column + n_columns - 1)
+        return f"{self.sheet_name}!{first_column}{first_row}:{last_column}{first_row + n_rows - 1}"
+
+    def _write_blocks(self, blocks, n_columns: int):
+        """
+        Menulis blok baris berurutan [(row_offset, rows), ...] lewat batchUpdate yang dipecah
+        agar setiap request tetap di bawah batas ukuran dan jumlah baris.
+        """
+        batch, batch_bytes, batch_rows = [], 0, 0
+
+        def send():
+            if batch:
+                self._execute(self.service.spreadsheets().values().batchUpdate(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={'valueInputOption': 'RAW', 'data': list(batch)}
+                ))
+                batch.clear()
+
+        for row_offset, rows in blocks:
+            piece_offset, piece = row_offset, []
+            for index, row in enumerate(rows):
+                row_bytes = len(json.dumps(row, default=str))
+                if batch_rows and (batch_bytes + row_bytes > self.max_request_bytes
+                                   or batch_rows >= self.max_rows_per_request):
+                    if piece:
+                        batch.append({'range': self._row_range(piece_offset, len(piece), n_columns), 'values': piece})
+                    send()
+                    batch_bytes, batch_rows = 0, 0
+                    piece_offset, piece = row_offset + index, []
+                piece.append(row)
+                batch_bytes += row_bytes
+                batch_rows += 1
+            if piece:
+                batch.append({'range': self._row_range(piece_offset, len(piece), n_columns), 'values': piece})
+        send()
+
+    def read_rows(self) -> list:
+        """Membaca semua baris data yang saat ini ada di range sheet."""
+        result = self._execute(self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=self.range_name,
+            valueRenderOption='UNFORMATTED_VALUE'
+        ))
+        return result.get('values', [])
+
+    def load(self, df: pd.DataFrame, incremental: bool = False, offset: int = 0) -> dict:
+        """
+        Menulis DataFrame ke sheet.
+
+        Mode penuh menulis semua baris mulai dari baris data ke-`offset` lalu mengosongkan
+        sisa baris lama di bawahnya, sehingga chunk berikutnya bisa ditulis tepat setelah
+        chunk sebelumnya. Mode incremental hanya menulis baris yang berubah (kunci sama,
+        nilai beda) dan baris baru (ditambahkan di bawah data yang ada).
+
+        Parameters:
+        df (pd.DataFrame): Data yang akan disimpan.
+        incremental (bool): Aktifkan penulisan berbasis diff. Default = False.
+        offset (int): Posisi baris data awal untuk mode penuh. Default = 0.
+
+        Returns:
+        dict: Ringkasan berisi rows, written_rows, requests dan seconds.
+
+        Raises:
+        Exception: Jika terjadi kegagalan saat menyimpan ke Google Sheets.
+        """
+        start = time.perf_counter()
+        requests_before = self.requests_sent
+        try:
+            values = [[_sheet_cell(value) for value in row] for row in _to_plain_frame(df).values.tolist()]
+            n_columns = len(df.columns)
+
+            if incremental:
+                blocks = self._diff_blocks(df, values, n_columns)
+            else:
+                blocks = [(offset, values)] if values else []
+
+            written_rows = sum(len(rows) for _, rows in blocks)
+            self._write_blocks(blocks, n_columns)
+
+            if not incremental:
+                # Kosongkan baris lama yang tersisa di bawah data baru
+                first_column = _column_letter(self.start_column)
+                last_column = _column_letter(self.start_column + n_columns - 1)
+                self._execute(self.service.spreadsheets().values().batchClear(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={'ranges': [f"{self.sheet_name}!{first_column}{self.start_row + offset + len(values)}:{last_column}"]}
+                ))
+
+            requests_sent = self.requests_sent - requests_before
+            logging.info(f"Google Sheets: {written_rows} dari {len(values)} baris ditulis dengan {requests_sent} request.")
+        except Exception as e:
+            logging.error(f"Gagal menulis data ke Google Sheets: {e}")
+            raise e
+
+        result = {
+            "rows": len(values),
+            "written_rows": written_rows,
+            "requests": requests_sent,
+            "seconds": time.perf_counter() - start
+        }
+        self.history.append(result)
+        return result
+
+    def apply_changes(self, upserts: pd.DataFrame, deleted: pd.DataFrame) -> dict:
+        """
+        Menerapkan perubahan (mode incremental) ke sheet.
+
+        Baris dengan kunci di `upserts` diganti di tempat, baris baru ditambahkan di bawah,
+        dan baris dengan kunci di `deleted` dibuang sehingga baris di bawahnya naik.
+        Hanya range baris yang isinya berbeda dari sheet saat ini yang ditulis.
+
+        Parameters:
+        upserts (pd.DataFrame): Baris baru dan baris yang berubah.
+        deleted (pd.DataFrame): Kolom kunci dari produk yang hilang.
+
+        Returns:
+        dict: Ringkasan berisi rows, written_rows, requests dan seconds.
+
+        Raises:
+        Exception: Jika terjadi kegagalan saat menyimpan ke Google Sheets.
+        """
+        start = time.perf_counter()
+        requests_before = self.requests_sent
+        try:
+            values = [[_sheet_cell(value) for value in row] for row in _to_plain_frame(upserts).values.tolist()]
+            n_columns = len(upserts.columns)
+            key_positions = [list(upserts.columns).index(column) for column in self.key_columns]
+            removed = {tuple(row) for row in deleted[list(self.key_columns)].astype(object).values.tolist()}
+            replacements = {tuple(row[i] for i in key_positions): row for row in values}
+
+            current = [list(row) + [""] * (n_columns - len(row)) for row in self.read_rows()]
+            updated = []
+            for row in current:
+                key = tuple(row[i] for i in key_positions)
+                if key in removed:
+                    continue
+                updated.append(replacements.pop(key, row))
+            updated.extend(row for row in values if tuple(row[i] for i in key_positions) in replacements)
+
+            changed = {offset: row for offset, row in enumerate(updated)
+                       if offset >= len(current) or current[offset] != row}
+            blocks = _merge_blocks(changed)
+            written_rows = len(changed)
+            self._write_blocks(blocks, n_columns)
+
+            if len(updated) < len(current):
+                first_column = _column_letter(self.start_column)
+                last_column = _column_letter(self.start_column + n_columns - 1)
+                self._execute(self.service.spreadsheets().values().batchClear(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={'ranges': [f"{self.sheet_name}!{first_column}{self.start_row + len(updated)}:{last_column}"]}
+                ))
+
+            requests_sent = self.requests_sent - requests_before
+            logging.info(f"Google Sheets: {len(values)} upsert dan {len(removed)} hapus, "
+                         f"{written_rows} baris ditulis dengan {requests_sent} request.")
+        except Exception as e:
+            logging.error(f"Gagal menerapkan perubahan ke Google Sheets: {e}")
+            raise e
+
+        result = {
+            "rows": len(updated),
+            "written_rows": written_rows,
+            "requests": requests_sent,
+            "seconds": time.perf_counter() - start
+        }
+        self.history.append(result)
+        return result
+
+    def _diff_blocks(self, df: pd.DataFrame, values: list, n_columns: int):
+        """
+        Membandingkan `values` dengan isi sheet saat ini berdasarkan kolom kunci.
+
+        Returns:
+        list: Blok baris yang perlu ditulis [(row_offset, rows), ...].
+        """
+        key_positions = [list(df.columns).index(column) for column in self.key_columns]
+        current = self.read_rows()
+
+        existing = {}
+        for offset, row in enumerate(current):
+            row = list(row) + [""] * (n_columns - len(row))
+            existing.setdefault(tuple(row[i] for i in key_positions), (offset, row[:n_columns]))
+
+        changed = {}
+        next_offset = len(current)
+        for row in values:
+            key = tuple(row[i] for i in key_positions)
+            if key in existing:
+                offset, old_row = existing[key]
+                if old_row != row:
+                    changed[offset] = row
+            else:
+                changed[next_offset] = row
+                existing[key] = (next_offset, row)
+                next_offset += 1
+
+        return _merge_blocks(changed)
+
+
+def _get_database_url() -> str:
+    """
+    Menyusun URL koneksi PostgreSQL dari environment variable (.env).
 
     Returns:
-    None
+    str: URL SQLAlchemy untuk driver psycopg2.
 
     Raises:
-    Exception: Jika terjadi kegagalan saat menyimpan ke PostgreSQL.
+    EnvironmentError: Jika DB_USER/DB_PASSWORD/DB_HOST/DB_PORT/DB_NAME belum lengkap.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    user     = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    host     = os.getenv("DB_HOST")
+    port     = os.getenv("DB_PORT")
+    db       = os.getenv("DB_NAME")
+
+    if not all([user, password, host, port, db]):
+        error_msg = "Environment variable DB_USER/DB_PASSWORD/DB_HOST/DB_PORT/DB_NAME belum lengkap!"
+        logging.error(error_msg)
+        raise EnvironmentError(error_msg)
+
+    logging.info("Semua environment variable berhasil dimuat.")
+    logging.info(f"Database user: {user}")
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db}"
+
+
+def _products_table(metadata, table_name: str, with_source: bool = False):
+    """Definisi struktur tabel produk (sqlalchemy.Table); `with_source` menambah kolom nama situs (multi-situs)."""
+    from sqlalchemy import Column, Float, Integer, String, Table
+
+    columns = [
+        Column("title", String),
+        Column("price", Float),
+        Column("rating", Float),
+        Column("colors", Integer),
+        Column("size", String),
+        Column("gender", String),
+        Column("timestamp", String)
+    ]
+    if with_source:
+        columns.append(Column(SOURCE_COLUMN, String))
+    return Table(table_name, metadata, *columns)
+
+
+def _ensure_natural_key(connection, table_name: str, key_columns: tuple = NATURAL_KEY):
+    """
+    Memastikan tabel punya unique index pada `key_columns` (NATURAL_KEY, atau SITE_KEY untuk
+    multi-situs) agar bisa di-upsert.
+
+    Baris yang sudah ada tidak pernah dihapus: jika tabel masih berisi beberapa baris dengan
+    NATURAL_KEY yang sama (riwayat dari mode 'insert'), index tidak dibuat dan ValueError
+    dilempar beserta langkah migrasinya.
+
+    Raises:
+    ValueError: Jika tabel berisi NATURAL_KEY ganda.
+    """
+    from sqlalchemy import text
+
+    def index_exists(index_name):
+        return connection.execute(
+            text("SELECT 1 FROM pg_indexes WHERE tablename = :table AND indexname = :index"),
+            {"table": table_name, "index": index_name}
+        ).first() is not None
+
+    index_name = f"{table_name}_natural_key" if tuple(key_columns) == NATURAL_KEY else f"{table_name}_site_key"
+    if index_exists(index_name):
+        return
+    if SOURCE_COLUMN in key_columns and index_exists(f"{table_name}_natural_key"):
+        # Index tanpa source menolak produk yang sama dari situs lain; datanya sendiri tidak diubah
+        logging.warning(f"Unique index {table_name}_natural_key diganti dengan {index_name} (ditambah kolom source).")
+        connection.execute(text(f'DROP INDEX "{table_name}_natural_key"'))
+
+    natural_key = tuple(key_columns)
+    key_columns = ", ".join(f'"{column}"' for column in natural_key)
+    # NULL tidak dianggap sama oleh unique index, jadi hanya kunci lengkap yang menghalangi index
+    not_null = " AND ".join(f'"{column}" IS NOT NULL' for column in natural_key)
+    duplicates = connection.execute(text(
+        f'SELECT COUNT(*) FROM (SELECT 1 FROM "{table_name}" WHERE {not_null} '
+        f'GROUP BY {key_columns} HAVING COUNT(*) > 1) AS duplicated'
+    )).scalar()
+    if duplicates:
+        raise ValueError(
+            f"Tabel {table_name} berisi {duplicates} kunci ({', '.join(natural_key)}) dengan lebih dari satu "
+            f"baris, misalnya riwayat dari mode 'insert', sehingga mode 'bulk' tidak bisa membuat unique index. "
+            f"Tidak ada baris yang diubah. Tetap pakai mode 'insert' untuk tabel ini, atau pindahkan riwayatnya "
+            f"lebih dulu (misal ALTER TABLE \"{table_name}\" RENAME TO \"{table_name}_history\") lalu jalankan ulang."
+        )
+
+    connection.execute(text(f'CREATE UNIQUE INDEX "{index_name}" ON "{table_name}" ({key_columns})'))
+
+
+def _bulk_upsert(connection, table, df: pd.DataFrame, chunk_size: int,
+                 key_columns: tuple = NATURAL_KEY) -> int:
+    """
+    Mengalirkan DataFrame ke staging table lewat COPY FROM STDIN per chunk, lalu
+    menggabungkannya ke tabel tujuan dengan INSERT ... ON CONFLICT pada `key_columns`.
+    Dijalankan di dalam transaksi milik `connection`; unique index harus sudah ada.
+
+    Returns:
+    int: Jumlah baris yang di-insert atau di-update di tabel tujuan.
     """
+    from sqlalchemy import text
+
+    table_name = table.name
+    staging = f"{table_name}_staging"
+    columns = [column.name for column in table.columns]
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    update_columns = ", ".join(
+        f'"{column}" = EXCLUDED."{column}"' for column in columns if column not in key_columns
+    )
+    key_columns = ", ".join(f'"{column}"' for column in key_columns)
+
+    connection.execute(text(
+        f'CREATE TEMP TABLE "{staging}" (LIKE "{table_name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+    ))
+    # Nomor urut baris agar duplikat di dalam satu batch diselesaikan dengan baris terakhir
+    connection.execute(text(f'ALTER TABLE "{staging}" ADD COLUMN "_row" BIGSERIAL'))
+
+    cursor = connection.connection.cursor()
     try:
-        # Ambil kredensial dari .env
-        user     = os.getenv("DB_USER")
-        password = os.getenv("DB_PASSWORD")
-        host     = os.getenv("DB_HOST")
-        port     = os.getenv("DB_PORT")
-        db       = os.getenv("DB_NAME")
-
-        if not all([user, password, host, port, db]):
-            error_msg = "Environment variable DB_USER/DB_PASSWORD/DB_HOST/DB_PORT/DB_NAME belum lengkap!"
-            logging.error(error_msg)
-            raise EnvironmentError(error_msg)
-        else:
-            logging.info("Semua environment variable berhasil dimuat.")
-            logging.info(f"Database user: {user}")
-
-        # Buat koneksi ke database
-        db_url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db}"
-        engine = create_engine(db_url)
-        metadata = MetaData()
-
-        # Definisikan struktur tabel
-        table = Table(
-            table_name,
-            metadata,
-            Column("title", String),
-            Column("price", Float),
-            Column("rating", Float),
-            Column("colors", Integer),
-            Column("size", String),
-            Column("gender", String),
-            Column("timestamp", String)
+        for start in range(0, len(df), chunk_size):
+            buffer = io.StringIO()
+            df.iloc[start:start + chunk_size][columns].to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY \"{staging}\" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buffer
+            )
+    finally:
+        cursor.close()
+
+    return connection.execute(text(
+        f'INSERT INTO "{table_name}" ({column_list}) '
+        f'SELECT DISTINCT ON ({key_columns}) {column_list} FROM "{staging}" '
+        f'ORDER BY {key_columns}, "_row" DESC '
+        f'ON CONFLICT ({key_columns}) DO UPDATE SET {update_columns}'
+    )).rowcount
+
+
+def _bulk_delete(connection, table_name: str, keys: pd.DataFrame, key_columns: tuple = NATURAL_KEY) -> int:
+    """
+    Menghapus baris yang `key_columns`-nya ada di `keys` lewat COPY ke staging table
+    lalu satu DELETE ... USING. Dijalankan di dalam transaksi milik `connection`.
+
+    Returns:
+    int: Jumlah baris yang dihapus.
+    """
+    from sqlalchemy import text
+
+    staging = f"{table_name}_deleted"
+    key_list = ", ".join(f'"{column}"' for column in key_columns)
+    connection.execute(text(
+        f'CREATE TEMP TABLE "{staging}" ON COMMIT DROP AS SELECT {key_list} FROM "{table_name}" WITH NO DATA'
+    ))
+
+    buffer = io.StringIO()
+    keys[list(key_columns)].to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY \"{staging}\" ({key_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buffer)
+    finally:
+        cursor.close()
+
+    key_match = " AND ".join(f't."{column}" = d."{column}"' for column in key_columns)
+    return connection.execute(text(f'DELETE FROM "{table_name}" t USING "{staging}" d WHERE {key_match}')).rowcount
+
+
+class PostgresLoader:
+    """
+    Loader PostgreSQL yang dipakai ulang untuk banyak pemanggilan `load()`.
+
+    Engine beserta connection pool-nya dibuat sekali, dan skema tabel dibuat /
+    divalidasi hanya pada `load()` pertama, sehingga memuat data per chunk atau
+    dari scheduler yang berjalan lama tidak membayar ulang biaya koneksi dan DDL.
+    Setiap pemanggilan `load()` dicatat di `history` (rows, affected, seconds).
+
+    Parameters:
+    table_name (str)    : Nama tabel tujuan. Default = 'products'.
+    mode (str)          : 'insert' atau 'bulk' (lihat `save_to_postgres`). Default = 'bulk'.
+    database_url (str)  : URL SQLAlchemy. Default = disusun dari environment variable.
+    pool_size (int)     : Jumlah koneksi yang disimpan di pool. Default = 5.
+    max_overflow (int)  : Koneksi tambahan di atas pool_size saat sibuk. Default = 5.
+    pool_pre_ping (bool): Cek koneksi sebelum dipakai agar koneksi basi diganti. Default = True.
+    pool_recycle (int)  : Umur maksimum koneksi dalam detik. Default = 1800.
+    chunk_size (int)    : Jumlah baris per COPY pada mode 'bulk'.
+    validate_schema (bool): Cocokkan kolom tabel yang sudah ada dengan struktur yang diharapkan. Default = True.
+    key_columns (tuple) : Kunci upsert dan hapus. Default = NATURAL_KEY; SITE_KEY untuk multi-situs
+                          (tabel diberi kolom `source`, ditambahkan ke tabel lama jika belum ada).
+    """
+
+    def __init__(self, table_name: str = 'products', mode: str = 'bulk', database_url: str = None,
+                 pool_size: int = 5, max_overflow: int = 5, pool_pre_ping: bool = True,
+                 pool_recycle: int = 1800, chunk_size: int = COPY_CHUNK_SIZE, validate_schema: bool = True,
+                 key_columns: tuple = NATURAL_KEY):
+        if mode not in ('insert', 'bulk'):
+            raise ValueError(f"Mode PostgreSQL tidak dikenal: {mode}")
+
+        from sqlalchemy import MetaData, create_engine
+
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.validate_schema = validate_schema
+        self.key_columns = tuple(key_columns)
+        self.engine = create_engine(
+            database_url or _get_database_url(),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle
         )
-        metadata.create_all(engine)
+        self.metadata = MetaData()
+        self.table = _products_table(self.metadata, table_name, with_source=SOURCE_COLUMN in self.key_columns)
+        self.history = []
+        self._schema_ready = False
+
+    def ensure_schema(self):
+        """Membuat tabel (dan unique index untuk mode bulk) serta memvalidasi kolomnya, hanya sekali."""
+        if self._schema_ready:
+            return
+
+        from sqlalchemy import text
+
+        self.metadata.create_all(self.engine)
+        if SOURCE_COLUMN in self.key_columns:
+            # Tabel lama dari run satu situs: tambah kolom source (nullable), baris lama tetap ada
+            with self.engine.begin() as connection:
+                connection.execute(text(
+                    f'ALTER TABLE "{self.table.name}" ADD COLUMN IF NOT EXISTS "{SOURCE_COLUMN}" VARCHAR'
+                ))
+        if self.validate_schema:
+            self._check_columns()
+        if self.mode == 'bulk':
+            with self.engine.begin() as connection:
+                _ensure_natural_key(connection, self.table.name, self.key_columns)
+        self._schema_ready = True
+
+    def _check_columns(self):
+        """Memastikan tabel yang sudah ada memiliki semua kolom yang dibutuhkan."""
+        from sqlalchemy import inspect
+
+        existing = {column["name"] for column in inspect(self.engine).get_columns(self.table.name)}
+        expected = {column.name for column in self.table.columns}
+        missing = expected - existing
+        if missing:
+            raise ValueError(f"Tabel {self.table.name} tidak memiliki kolom: {sorted(missing)}")
+        extra = existing - expected
+        if extra:
+            logging.warning(f"Tabel {self.table.name} memiliki kolom tambahan yang tidak diisi: {sorted(extra)}")
+
+    def load(self, df: pd.DataFrame) -> dict:
+        """
+        Memuat satu DataFrame (atau chunk) ke tabel tujuan.
+
+        Parameters:
+        df (pd.DataFrame): Data yang akan disimpan.
 
-        with engine.connect() as connection:
-            logging.info("Terhubung ke PostgreSQL...")
+        Returns:
+        dict: Ringkasan pemanggilan berisi rows, affected dan seconds.
 
-            # Insert data
-            data_to_insert = df.to_dict(orient='records')
-            logging.info(f"Contoh data yang akan dimasukkan: {data_to_insert[0]}")
-            insert_stmt = insert(table).values(data_to_insert)
-            connection.execute(insert_stmt)
-            connection.commit()
+        Raises:
+        Exception: Jika terjadi kegagalan saat menyimpan ke PostgreSQL.
+        """
+        from sqlalchemy import insert
 
-            logging.info("Data berhasil disimpan ke PostgreSQL.")
+        start = time.perf_counter()
+        try:
+            self.ensure_schema()
+            plain_df = _to_plain_frame(df)
 
+            if self.mode == 'bulk':
+                with self.engine.begin() as connection:
+                    logging.info("Terhubung ke PostgreSQL (mode bulk COPY + upsert)...")
+                    affected = _bulk_upsert(connection, self.table, plain_df, self.chunk_size, self.key_columns)
+                    logging.info(f"Data berhasil disimpan ke PostgreSQL: {affected} baris di-insert/di-update.")
+            else:
+                with self.engine.connect() as connection:
+                    logging.info("Terhubung ke PostgreSQL...")
+
+                    # Insert data
+                    # Hanya kolom tabel; `source` hanya dimuat jika key_columns memuatnya, seperti pada mode bulk
+                    columns = [column.name for column in self.table.columns]
+                    data_to_insert = plain_df[columns].to_dict(orient='records')
+                    logging.info(f"Contoh data yang akan dimasukkan: {data_to_insert[0]}")
+                    insert_stmt = insert(self.table).values(data_to_insert)
+                    connection.execute(insert_stmt)
+                    connection.commit()
+                    affected = len(data_to_insert)
+
+                    logging.info("Data berhasil disimpan ke PostgreSQL.")
+
+        except Exception as e:
+            logging.error(f"Gagal menyimpan data ke PostgreSQL: {e}")
+            raise e
+
+        result = {"rows": len(df), "affected": affected, "seconds": time.perf_counter() - start}
+        self.history.append(result)
+        return result
+
+    def apply_changes(self, upserts: pd.DataFrame, deleted: pd.DataFrame) -> dict:
+        """
+        Menerapkan perubahan (mode incremental): upsert baris baru / berubah dan menghapus
+        produk yang hilang, semuanya dalam satu transaksi. Hanya untuk mode 'bulk'.
+
+        Parameters:
+        upserts (pd.DataFrame): Baris baru dan baris yang berubah.
+        deleted (pd.DataFrame): Kolom `key_columns` dari produk yang hilang.
+
+        Returns:
+        dict: Ringkasan pemanggilan berisi rows, affected, deleted dan seconds.
+
+        Raises:
+        ValueError: Jika loader tidak memakai mode 'bulk'.
+        Exception: Jika terjadi kegagalan saat menyimpan ke PostgreSQL.
+        """
+        if self.mode != 'bulk':
+            raise ValueError("apply_changes hanya didukung pada mode 'bulk'.")
+
+        start = time.perf_counter()
+        try:
+            self.ensure_schema()
+            with self.engine.begin() as connection:
+                affected = _bulk_upsert(connection, self.table, _to_plain_frame(upserts), self.chunk_size,
+                                        self.key_columns) if len(upserts) else 0
+                removed = _bulk_delete(connection, self.table.name, deleted, self.key_columns) if len(deleted) else 0
+            logging.info(f"Perubahan berhasil disimpan ke PostgreSQL: {affected} baris di-upsert, {removed} dihapus.")
+        except Exception as e:
+            logging.error(f"Gagal menerapkan perubahan ke PostgreSQL: {e}")
+            raise e
+
+        result = {"rows": len(upserts), "affected": affected, "deleted": removed,
+                  "seconds": time.perf_counter() - start}
+        self.history.append(result)
+        return result
+
+    def close(self):
+        """Menutup semua koneksi di pool."""
+        self.engine.dispose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def save_to_postgres(df: pd.DataFrame, table_name: str, mode: str = 'insert', chunk_size: int = COPY_CHUNK_SIZE):
+    """
+    Menyimpan DataFrame ke PostgreSQL menggunakan SQLAlchemy Table.
+
+    Mode 'insert' menambahkan semua baris dengan satu insert statement (perilaku awal).
+    Mode 'bulk' mengalirkan baris lewat COPY ke staging table per chunk lalu melakukan
+    upsert ke tabel tujuan berdasarkan NATURAL_KEY (title, size, gender, colors),
+    semuanya dalam satu transaksi, sehingga run berulang tidak menambah duplikat.
+
+    Untuk banyak pemanggilan berturut-turut gunakan `PostgresLoader` agar engine dan skema dipakai ulang.
+
+    Parameters:
+    df (pd.DataFrame): Data yang akan disimpan.
+    table_name (str): Nama tabel tujuan di database.
+    mode (str): 'insert' atau 'bulk'. Default = 'insert'.
+    chunk_size (int): Jumlah baris per COPY pada mode 'bulk'.
+
+    Returns:
+    None
+
+    Raises:
+    ValueError: Jika mode tidak dikenal.
+    Exception: Jika terjadi kegagalan saat menyimpan ke PostgreSQL.
+    """
+    if mode not in ('insert', 'bulk'):
+        raise ValueError(f"Mode PostgreSQL tidak dikenal: {mode}")
+
+    try:
+        loader = PostgresLoader(table_name, mode=mode, chunk_size=chunk_size, validate_schema=False)
     except Exception as e:
         logging.error(f"Gagal menyimpan data ke PostgreSQL: {e}")
         raise e
+
+    with loader:
+        loader.load(df)
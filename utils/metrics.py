@@ -0,0 +1,232 @@
+import cProfile
+import json
+import logging
+import os
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+PROMETHEUS_PREFIX = "etl"
+
+
+class PipelineMetrics:
+    """
+    Pencatat metrik satu run pipeline: waktu wall dan CPU per stage dan per halaman/chunk,
+    bytes yang di-download, jumlah baris masuk/keluar, baris yang dibuang per aturan filter,
+    serta baris yang ditulis per sink.
+
+    Waktu CPU diukur dengan `time.process_time()` sehingga mencakup semua thread
+    (misal thread pool scraping atau thread sink) selama stage berjalan.
+
+    Parameters:
+    run_id (str): Penanda run. Default = waktu mulai + id acak.
+    """
+
+    def __init__(self, run_id: str = None):
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.started_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.records = []
+        self.pages = []
+        self.filter_drops = {}
+        self.sinks = {}
+        self.profile = {}
+
+    @contextmanager
+    def stage(self, name: str, item=None):
+        """
+        Mengukur satu stage (atau satu halaman/chunk dari stage tersebut).
+
+        Dictionary yang di-yield boleh diisi pemanggil dengan rows_in, rows_out dan bytes.
+
+        Parameters:
+        name (str): Nama stage, misal 'extract', 'transform', 'load'.
+        item      : Penanda halaman/chunk (opsional).
+        """
+        record = {"stage": name, "item": item, "rows_in": None, "rows_out": None, "bytes": None, "error": None}
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            self.records.append(record)
+
+    def add_pages(self, page_stats: list):
+        """Menambahkan ringkasan per halaman dari `scrape_all_pages(stats=...)`."""
+        self.pages.extend(page_stats)
+
+    def add_transform_stats(self, stats: dict):
+        """Menambahkan jumlah baris yang dibuang per aturan dari `clean_and_transform(stats=...)`."""
+        for rule, count in (stats.get("dropped") or {}).items():
+            self.filter_drops[rule] = self.filter_drops.get(rule, 0) + int(count)
+
+    def add_sink_results(self, results: list):
+        """Menambahkan hasil `run_sinks()`: baris yang ditulis, durasi dan error per sink."""
+        for result in results:
+            total = self.sinks.setdefault(result["sink"], {"rows": 0, "seconds": 0.0, "calls": 0, "errors": 0})
+            total["rows"] += result["rows"]
+            total["seconds"] += result["seconds"] or 0.0
+            total["calls"] += 1
+            total["errors"] += 1 if result["error"] else 0
+
+    def stage_summary(self) -> dict:
+        """Total per stage: calls, wall_seconds, cpu_seconds, rows_in, rows_out, bytes."""
+        summary = {}
+        for record in self.records:
+            total = summary.setdefault(record["stage"], {
+                "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "rows_in": 0, "rows_out": 0, "bytes": 0,
+                "errors": 0
+            })
+            total["calls"] += 1
+            total["wall_seconds"] += record["wall_seconds"]
+            total["cpu_seconds"] += record["cpu_seconds"]
+            for field in ("rows_in", "rows_out", "bytes"):
+                total[field] += record[field] or 0
+            total["errors"] += 1 if record["error"] else 0
+        return summary
+
+    def finish(self):
+        """Menandai run selesai."""
+        self.finished_at = datetime.now().isoformat()
+
+    def to_dict(self) -> dict:
+        """Laporan run lengkap dalam bentuk dictionary (siap di-serialize ke JSON)."""
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "stages": self.stage_summary(),
+            "records": self.records,
+            "pages": self.pages,
+            "filter_drops": self.filter_drops,
+            "sinks": self.sinks,
+            "profile": self.profile,
+        }
+
+    def write_json(self, path: str):
+        """Menyimpan laporan run sebagai file JSON."""
+        _makedirs_for(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        logging.info(f"Laporan metrik disimpan ke {path}")
+
+    def to_prometheus(self) -> str:
+        """
+        Metrik run dalam format teks Prometheus (misal untuk textfile collector node_exporter).
+        Hanya total per stage / aturan / sink yang diekspor agar jumlah label tetap kecil;
+        detail per halaman dan chunk ada di laporan JSON.
+        """
+        lines = []
+
+        def metric(name, help_text, samples, kind="gauge"):
+            full_name = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"{full_name}{{{label_text}}} {value}" if label_text else f"{full_name} {value}")
+
+        stages = self.stage_summary()
+        for field, help_text in (
+            ("wall_seconds", "Wall time per stage."),
+            ("cpu_seconds", "Process CPU time per stage."),
+            ("rows_in", "Rows entering each stage."),
+            ("rows_out", "Rows leaving each stage."),
+            ("bytes", "Bytes handled by each stage (downloaded bytes for extract)."),
+        ):
+            metric(f"stage_{field}", help_text, [({"stage": name}, total[field]) for name, total in stages.items()])
+
+        # Seri `_total` adalah counter: naik selama run dan mulai lagi dari nol pada run berikutnya (reset counter)
+        metric("pages_total", "Pages requested.", [({}, len(self.pages))], "counter")
+        metric("pages_failed_total", "Pages that ended with an error.",
+               [({}, sum(1 for page in self.pages if page.get("error")))], "counter")
+        metric("pages_cache_hits_total", "Pages served from the conditional-GET cache.",
+               [({}, sum(1 for page in self.pages if page.get("cache_hit")))], "counter")
+        metric("filter_dropped_rows", "Rows dropped by each transform filter rule.",
+               [({"rule": rule}, count) for rule, count in self.filter_drops.items()])
+        metric("sink_rows_written", "Rows written per sink.",
+               [({"sink": name}, total["rows"]) for name, total in self.sinks.items()])
+        metric("sink_seconds", "Time spent per sink.",
+               [({"sink": name}, total["seconds"]) for name, total in self.sinks.items()])
+        metric("sink_errors_total", "Failed or timed-out loads per sink.",
+               [({"sink": name}, total["errors"]) for name, total in self.sinks.items()], "counter")
+        if "peak_memory_bytes" in self.profile:
+            metric("peak_traced_memory_bytes", "Peak memory traced by tracemalloc.",
+                   [({}, self.profile["peak_memory_bytes"])])
+        metric("run_finished_timestamp_seconds", "Unix time the run finished.", [({}, time.time())])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Menyimpan metrik dalam format teks Prometheus (ditulis atomik lewat file sementara)."""
+        _makedirs_for(path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        logging.info(f"Metrik Prometheus disimpan ke {path}")
+
+    def log_summary(self):
+        """Mencatat ringkasan waktu per stage di log."""
+        for name, total in self.stage_summary().items():
+            logging.info(
+                f"Stage {name}: {total['wall_seconds']:.2f} detik wall, {total['cpu_seconds']:.2f} detik CPU, "
+                f"{total['rows_in']} baris masuk, {total['rows_out']} baris keluar, {total['bytes']} bytes"
+            )
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _makedirs_for(path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+@contextmanager
+def profile_run(metrics: PipelineMetrics, cprofile_path: str = None, trace_memory: bool = False, top: int = 20):
+    """
+    Mengaktifkan cProfile dan/atau tracemalloc selama blok berjalan.
+
+    Hasil cProfile disimpan ke `cprofile_path` (bisa dibuka dengan pstats / snakeviz).
+    Hasil tracemalloc (peak dan alokasi terbesar per baris kode) dicatat di `metrics.profile`.
+
+    Parameters:
+    metrics (PipelineMetrics): Tempat mencatat hasil profiling.
+    cprofile_path (str)      : Lokasi file .prof. None = cProfile tidak aktif.
+    trace_memory (bool)      : Aktifkan tracemalloc. Default = False.
+    top (int)                : Jumlah alokasi terbesar yang dicatat. Default = 20.
+    """
+    profiler = cProfile.Profile() if cprofile_path else None
+    if trace_memory:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            _makedirs_for(cprofile_path)
+            profiler.dump_stats(cprofile_path)
+            metrics.profile["cprofile_path"] = cprofile_path
+            logging.info(f"Hasil cProfile disimpan ke {cprofile_path}")
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            metrics.profile["peak_memory_bytes"] = peak
+            metrics.profile["top_allocations"] = [
+                {"location": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:top]
+            ]
@@ -0,0 +1,270 @@
+import logging
+import time
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:  # lxml opsional, fallback ke html.parser bawaan BeautifulSoup
+    lxml = None
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Urutan field produk (tanpa timestamp) pada tuple ringkas hasil `parse_product_rows`
+PRODUCT_FIELDS = ('title', 'price', 'rating', 'colors', 'size', 'gender')
+
+# Kata kunci pada <p> dan nama field tujuannya, dicek berurutan seperti parser lama
+FIELD_KEYWORDS = (
+    ('Rating:', 'rating'),
+    ('Colors', 'colors'),
+    ('Size:', 'size'),
+    ('Gender:', 'gender'),
+)
+
+
+def _make_product(title, price, fields, timestamp):
+    """Menyusun dictionary produk dengan urutan key yang sama di semua backend."""
+    return {
+        "title": title,
+        "price": price,
+        "rating": fields.get('rating'),
+        "colors": fields.get('colors'),
+        "size": fields.get('size'),
+        "gender": fields.get('gender'),
+        "timestamp": timestamp
+    }
+
+
+def _match_keyword(text, fields):
+    """Mengisi field yang cocok dengan teks <p> (field yang muncul belakangan menimpa yang lama)."""
+    for keyword, field in FIELD_KEYWORDS:
+        if keyword in text:
+            fields[field] = text
+            return
+
+
+def parse_products_bs4(html, timestamp, page_num=None):
+    """
+    Parser asli berbasis BeautifulSoup + html.parser. Dipakai sebagai fallback.
+
+    Parameters:
+    html (str)     : Isi halaman HTML.
+    timestamp (str): Waktu scraping yang disematkan ke setiap produk.
+    page_num (int) : Nomor halaman, hanya untuk pesan log.
+
+    Returns:
+    list: Daftar dictionary produk.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    product_cards = soup.find_all('div', class_='collection-card')
+
+    page_data = []
+    for card in product_cards:
+        try:
+            # Title
+            title_tag = card.find(class_='product-title')
+            title = title_tag.text.strip() if title_tag else None
+
+            # Price (ambil dari dalam .price-container .price atau p.price)
+            price = None
+            price_container = card.find(class_='price-container')
+            if price_container:
+                price_tag = price_container.find(class_='price')
+                if price_tag:
+                    price = price_tag.text.strip()
+            if not price:
+                price_tag = card.find('p', class_='price')
+                if price_tag:
+                    price = price_tag.text.strip()
+
+            # Cari <p> yang mengandung kata kunci
+            fields = {}
+            for p in card.find_all('p'):
+                _match_keyword(p.text.strip(), fields)
+
+            page_data.append(_make_product(title, price, fields, timestamp))
+
+        except AttributeError as e:
+            logging.warning(f"[WARNING] Missing field in product on page {page_num}: {e}")
+        except Exception as e:
+            logging.error(f"[ERROR] Unexpected error on page {page_num}: {e}")
+
+    return page_data
+
+
+def _classes(element):
+    """Token atribut class sebuah elemen lxml."""
+    return element.get('class', '').split()
+
+
+def lxml_root(html):
+    """
+    Mem-parse HTML menjadi elemen root lxml.
+
+    Returns:
+    lxml.html.HtmlElement: Root dokumen, atau None jika HTML kosong.
+    """
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html)
+    except ValueError:
+        # String unicode dengan deklarasi encoding XML harus di-parse sebagai bytes
+        return lxml.html.fromstring(html.encode('utf-8'))
+
+
+def parse_products_lxml(html, timestamp, page_num=None):
+    """
+    Parser cepat berbasis lxml. Setiap card hanya ditelusuri satu kali untuk
+    mengambil ketujuh field, dengan hasil identik dengan `parse_products_bs4`.
+
+    Parameters:
+    html (str)     : Isi halaman HTML.
+    timestamp (str): Waktu scraping yang disematkan ke setiap produk.
+    page_num (int) : Nomor halaman, hanya untuk pesan log.
+
+    Returns:
+    list: Daftar dictionary produk.
+
+    Raises:
+    ImportError: Jika lxml tidak terpasang.
+    """
+    if lxml is None:
+        raise ImportError("Backend 'lxml' membutuhkan paket lxml.")
+    root = lxml_root(html)
+    if root is None:
+        return []
+
+    page_data = []
+    for card in root.iter('div'):
+        if 'collection-card' not in _classes(card):
+            continue
+        try:
+            title = None
+            title_found = False
+            container_price = None
+            container_found = False
+            fallback_price = None
+            fields = {}
+
+            for element in card.iterdescendants():
+                tag = element.tag
+                if not isinstance(tag, str):
+                    # Lewati komentar dan processing instruction
+                    continue
+                classes = _classes(element)
+
+                if not title_found and 'product-title' in classes:
+                    title = element.text_content().strip()
+                    title_found = True
+
+                if not container_found and 'price-container' in classes:
+                    container_found = True
+                    for inner in element.iterdescendants():
+                        if isinstance(inner.tag, str) and 'price' in _classes(inner):
+                            container_price = inner.text_content().strip()
+                            break
+
+                if tag == 'p':
+                    text = element.text_content().strip()
+                    if fallback_price is None and 'price' in classes:
+                        fallback_price = text
+                    _match_keyword(text, fields)
+
+            # Sama seperti parser lama: fallback p.price hanya dipakai jika harga di container kosong
+            price = container_price
+            if not price and fallback_price is not None:
+                price = fallback_price
+            page_data.append(_make_product(title, price, fields, timestamp))
+
+        except Exception as e:
+            logging.error(f"[ERROR] Unexpected error on page {page_num}: {e}")
+
+    return page_data
+
+
+PARSER_BACKENDS = {
+    'bs4': parse_products_bs4,
+    'lxml': parse_products_lxml,
+}
+
+
+def available_backends():
+    """
+    Daftar backend parser yang bisa dipakai di environment ini.
+
+    Returns:
+    list: Nama backend, backend tercepat lebih dulu.
+    """
+    backends = ['bs4']
+    if lxml is not None:
+        backends.insert(0, 'lxml')
+    return backends
+
+
+def parse_products(html, timestamp, backend=None, page_num=None, site=None):
+    """
+    Mengekstrak daftar produk dari HTML halaman katalog memakai backend yang dipilih.
+
+    Parameters:
+    html (str)     : Isi halaman HTML.
+    timestamp (str): Waktu scraping yang disematkan ke setiap produk.
+    backend (str)  : 'lxml', 'bs4', atau None untuk memilih backend tercepat yang tersedia.
+    page_num (int) : Nomor halaman, hanya untuk pesan log.
+    site (SiteConfig): Opsional. Konfigurasi selector situs lain (lihat `utils.sites`);
+                     None = parser bawaan fashion-studio.
+
+    Returns:
+    list: Daftar dictionary produk (title, price, rating, colors, size, gender, timestamp).
+
+    Raises:
+    ValueError: Jika nama backend tidak dikenal.
+    """
+    if backend is None:
+        backend = available_backends()[0]
+    if site is not None:
+        return site.parse(html, timestamp, backend=backend, page_num=page_num)
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Backend parser tidak dikenal: {backend}")
+    return PARSER_BACKENDS[backend](html, timestamp, page_num=page_num)
+
+
+def parse_product_rows(content, encoding=None, backend=None, page_num=None, site=None):
+    """
+    Stage parse untuk process pool: menerima bytes HTML mentah dan mengembalikan tuple ringkas.
+
+    Tuple (urutan `PRODUCT_FIELDS`, tanpa timestamp) jauh lebih murah di-pickle antar proses
+    daripada dictionary; gunakan `rows_to_products` untuk kembali ke format dictionary.
+
+    Parameters:
+    content (bytes): Isi halaman HTML mentah.
+    encoding (str) : Encoding halaman. Default = 'utf-8'.
+    backend (str)  : 'lxml', 'bs4', atau None untuk memilih backend tercepat yang tersedia.
+    page_num (int) : Nomor halaman, hanya untuk pesan log.
+    site (SiteConfig): Opsional. Konfigurasi selector situs (lihat `parse_products`).
+
+    Returns:
+    tuple: (rows, parse_seconds) dengan rows berupa list of tuple produk.
+    """
+    start = time.perf_counter()
+    try:
+        html = content.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        html = content.decode('utf-8', errors='replace')
+    products = parse_products(html, None, backend=backend, page_num=page_num, site=site)
+    rows = [tuple(product[field] for field in PRODUCT_FIELDS) for product in products]
+    return rows, time.perf_counter() - start
+
+
+def rows_to_products(rows, timestamp):
+    """
+    Mengubah tuple hasil `parse_product_rows` menjadi dictionary produk seperti `parse_products`.
+
+    Parameters:
+    rows (list)    : List of tuple produk (urutan `PRODUCT_FIELDS`).
+    timestamp (str): Waktu scraping yang disematkan ke setiap produk.
+
+    Returns:
+    list: Daftar dictionary produk (title, price, rating, colors, size, gender, timestamp).
+    """
+    return [dict(zip(PRODUCT_FIELDS, row), timestamp=timestamp) for row in rows]
@@ -0,0 +1,385 @@
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.metrics import PROMETHEUS_PREFIX
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock antar proses tidak tersedia
+    fcntl = None
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Field ekspresi cron: (nama, nilai minimum, nilai maksimum)
+CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 6))
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+CRON_NAMES = {
+    "month": {name: index for index, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)},
+    "weekday": {name: index for index, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])},
+}
+INTERVAL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+INTERVAL_RE = re.compile(r'^(?:every\s+)?(\d+(?:\.\d+)?)\s*([smhd]?)$')
+
+# Batas pencarian jadwal cron berikutnya, agar ekspresi mustahil (misal 30 Februari) tidak berputar selamanya
+CRON_SEARCH_YEARS = 5
+
+
+class IntervalSchedule:
+    """
+    Jadwal interval tetap: run pertama langsung saat scheduler mulai, lalu setiap `seconds`
+    dihitung dari jadwal sebelumnya (bukan dari selesainya run), sehingga tidak bergeser.
+
+    Parameters:
+    seconds (float): Jarak antar run dalam detik.
+
+    Raises:
+    ValueError: Jika interval tidak positif.
+    """
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval jadwal harus lebih dari 0 detik.")
+        self.seconds = float(seconds)
+
+    def first_run(self, now: float) -> float:
+        return now
+
+    def next_after(self, due: float) -> float:
+        return due + self.seconds
+
+    def __repr__(self):
+        return f"IntervalSchedule({self.seconds:g}s)"
+
+
+def _parse_cron_field(text, name, low, high):
+    """Mengubah satu field cron (misal '*/15', '1-5', 'mon,wed') menjadi set nilai yang diizinkan."""
+    names = CRON_NAMES.get(name, {})
+    values = set()
+
+    def value_of(token):
+        token = token.lower()
+        if token in names:
+            return names[token]
+        if not token.isdigit():
+            raise ValueError(f"Nilai {name} cron tidak valid: {token!r}")
+        value = int(token)
+        # Minggu boleh ditulis 7
+        return 0 if name == "weekday" and value == 7 else value
+
+    for part in text.split(","):
+        base, slash, step_text = part.partition("/")
+        if slash and not (step_text.isdigit() and int(step_text) > 0):
+            raise ValueError(f"Step {name} cron tidak valid: {part!r}")
+        step = int(step_text) if slash else 1
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start, end = (value_of(token) for token in base.split("-", 1))
+        else:
+            start = value_of(base)
+            # 'a/n' berarti mulai dari a sampai nilai maksimum dengan step n
+            end = high if slash else start
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ValueError(f"Nilai {name} cron di luar rentang {low}-{high}: {part!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Jadwal ekspresi cron 5 field (menit jam tanggal bulan hari), waktu lokal, misal '*/15 * * * *'
+    atau '0 2 * * mon-fri'. Mendukung '*', rentang, list, step, nama bulan/hari dan alias
+    seperti '@daily'. Seperti cron, jika tanggal dan hari sama-sama dibatasi, salah satunya cukup cocok.
+
+    Parameters:
+    expression (str): Ekspresi cron.
+
+    Raises:
+    ValueError: Jika ekspresi tidak valid.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Ekspresi cron harus berisi 5 field: {expression!r}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_cron_field(text, name, low, high) for text, (name, low, high) in zip(fields, CRON_FIELDS)
+        )
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def first_run(self, now: float) -> float:
+        return self.next_after(now)
+
+    def next_after(self, due: float) -> float:
+        """Unix time menit pertama setelah `due` yang cocok dengan ekspresi."""
+        moment = datetime.fromtimestamp(due).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment.year + CRON_SEARCH_YEARS
+        while moment.year <= limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"Ekspresi cron tidak pernah cocok: {self.expression!r}")
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+
+def parse_schedule(spec: str):
+    """
+    Membuat jadwal dari teks: interval ('every 15m', '30s', '2h', '1d', '900') atau ekspresi cron.
+
+    Returns:
+    IntervalSchedule | CronSchedule: Jadwal siap pakai.
+
+    Raises:
+    ValueError: Jika teks bukan interval maupun ekspresi cron yang valid.
+    """
+    match = INTERVAL_RE.match(spec.strip().lower())
+    if match:
+        return IntervalSchedule(float(match.group(1)) * INTERVAL_UNITS[match.group(2)])
+    return CronSchedule(spec)
+
+
+class Scheduler:
+    """
+    Menjalankan `job` berulang sesuai jadwal dalam satu proses yang terus hidup, sehingga
+    import, connection pool, session HTTP dan cache milik job tetap hangat antar run.
+
+    Run tidak pernah tumpang tindih: job dijalankan berurutan di thread scheduler, jadwal yang
+    terlewat selama run berjalan dilewati (tidak ditumpuk), dan dengan `lock_path` sebuah file
+    lock (flock) mencegah run bersamaan dengan proses lain, misal daemon kedua di host yang sama.
+    Waktu mulai setiap run digeser acak 0..`jitter` detik agar banyak instance tidak
+    menghantam situs sumber pada detik yang sama.
+
+    Parameters:
+    job (callable)   : Fungsi tanpa argumen untuk satu run. Nilai kembaliannya disimpan di
+                       `last_result` (misal PipelineMetrics untuk endpoint /metrics). Exception
+                       dihitung sebagai run gagal dan tidak menghentikan scheduler.
+    schedule         : IntervalSchedule atau CronSchedule (lihat `parse_schedule`).
+    jitter (float)   : Pergeseran acak maksimum waktu mulai dalam detik. Default = 0.
+    lock_path (str)  : File lock antar proses. None = tanpa lock.
+    max_runs (int)   : Berhenti setelah sejumlah run (untuk test). None = terus berjalan.
+    seed (int)       : Seed acak jitter. Default = acak.
+    """
+
+    def __init__(self, job, schedule, jitter: float = 0.0, lock_path: str = None, max_runs: int = None,
+                 seed: int = None):
+        self.job = job
+        self.schedule = schedule
+        self.jitter = jitter
+        self.lock_path = lock_path
+        self.max_runs = max_runs
+        self._random = random.Random(seed)
+        self._stop = threading.Event()
+        self.started_at = time.time()
+        self.runs = 0
+        self.failures = 0
+        # Dua alasan run dilewati dihitung terpisah: daemon lain memegang lock vs run sendiri terlalu lama
+        self.lock_skips = 0
+        self.missed_slots = 0
+        self.running = False
+        self.next_run = None
+        self.last_start = None
+        self.last_duration = None
+        self.last_success = None
+        self.last_error = None
+        self.last_result = None
+
+    def stop(self):
+        """Menghentikan scheduler setelah run yang sedang berjalan selesai."""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def _acquire_lock(self):
+        """Membuka file lock; None jika proses lain sedang menjalankan run."""
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle = open(self.lock_path, "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                return None
+        return handle
+
+    def run_once(self) -> bool:
+        """
+        Menjalankan job satu kali dan mencatat hasilnya.
+
+        Returns:
+        bool: True jika job selesai tanpa exception; False jika gagal atau dilewati karena lock.
+        """
+        lock = None
+        if self.lock_path:
+            lock = self._acquire_lock()
+            if lock is None:
+                self.lock_skips += 1
+                logging.warning(f"Run dilewati: lock {self.lock_path} dipegang proses lain.")
+                return False
+
+        self.running = True
+        self.last_start = time.time()
+        start = time.perf_counter()
+        try:
+            self.last_result = self.job()
+            self.last_success = time.time()
+            self.last_error = None
+            return True
+        except Exception as e:
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            logging.error(f"Run terjadwal gagal: {self.last_error}")
+            return False
+        finally:
+            self.last_duration = time.perf_counter() - start
+            self.runs += 1
+            self.running = False
+            if lock is not None:
+                lock.close()
+
+    def run_forever(self):
+        """Loop utama scheduler; kembali setelah `stop()` atau `max_runs` tercapai."""
+        due = self.schedule.first_run(time.time())
+        logging.info(f"Scheduler mulai dengan jadwal {self.schedule!r}, jitter {self.jitter:g} detik.")
+        while not self._stop.is_set():
+            self.next_run = due + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self._stop.wait(max(0.0, self.next_run - time.time())):
+                break
+            self.run_once()
+            if self.max_runs is not None and self.runs >= self.max_runs:
+                break
+
+            # Jadwal yang lewat selama run berjalan dilewati agar run tidak menumpuk
+            due = self.schedule.next_after(due)
+            missed = 0
+            now = time.time()
+            while due <= now:
+                missed += 1
+                due = self.schedule.next_after(due)
+            if missed:
+                self.missed_slots += missed
+                logging.warning(f"{missed} jadwal terlewat karena run sebelumnya belum selesai.")
+        self.next_run = None
+        logging.info("Scheduler berhenti.")
+
+    def status(self) -> dict:
+        """Ringkasan status untuk endpoint /health."""
+        return {
+            "status": "ok" if self.last_error is None else "failing",
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "lock_skips": self.lock_skips,
+            "missed_slots": self.missed_slots,
+            "last_start": self.last_start,
+            "last_duration": self.last_duration,
+            "last_success": self.last_success,
+            "last_error": self.last_error,
+            "next_run": self.next_run,
+            "uptime": time.time() - self.started_at,
+        }
+
+    def to_prometheus(self) -> str:
+        """Metrik scheduler dalam format teks Prometheus, ditambah metrik run terakhir jika ada."""
+        lines = []
+        for name, help_text, value in (
+            ("scheduler_runs_total", "Scheduled runs started.", self.runs),
+            ("scheduler_failures_total", "Scheduled runs that raised an error.", self.failures),
+            ("scheduler_lock_skips_total", "Runs skipped because another process held the lock.", self.lock_skips),
+            ("scheduler_missed_slots_total", "Schedule slots skipped because the previous run was still busy.",
+             self.missed_slots),
+            ("scheduler_running", "1 while a run is in progress.", int(self.running)),
+            ("scheduler_last_duration_seconds", "Duration of the last run.", self.last_duration or 0),
+            ("scheduler_last_success_timestamp_seconds", "Unix time the last successful run finished.",
+             self.last_success or 0),
+            ("scheduler_next_run_timestamp_seconds", "Unix time of the next scheduled run.", self.next_run or 0),
+            ("scheduler_uptime_seconds", "Seconds since the scheduler started.", time.time() - self.started_at),
+        ):
+            full_name = f"{PROMETHEUS_PREFIX}_{name}"
+            kind = "counter" if name.endswith("_total") else "gauge"
+            lines += [f"# HELP {full_name} {help_text}", f"# TYPE {full_name} {kind}", f"{full_name} {value}"]
+        text = "\n".join(lines) + "\n"
+        if hasattr(self.last_result, "to_prometheus"):
+            text += self.last_result.to_prometheus()
+        return text
+
+
+def serve_health(scheduler: Scheduler, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Menjalankan endpoint HTTP di thread background: GET /health (status JSON; 503 jika run
+    terakhir gagal) dan GET /metrics (teks Prometheus dari `Scheduler.to_prometheus`).
+
+    Parameters:
+    scheduler (Scheduler): Scheduler yang dilaporkan.
+    port (int)           : Port HTTP; 0 = port acak (lihat `server.server_port`).
+    host (str)           : Alamat bind. Default = 127.0.0.1.
+
+    Returns:
+    ThreadingHTTPServer: Server yang sedang berjalan; hentikan dengan `shutdown()` lalu `server_close()`.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0].rstrip("/")
+            if path == "/health":
+                status = scheduler.status()
+                body = json.dumps(status).encode("utf-8")
+                code = 200 if status["status"] == "ok" else 503
+                content_type = "application/json"
+            elif path == "/metrics":
+                body = scheduler.to_prometheus().encode("utf-8")
+                code = 200
+                content_type = "text/plain; version=0.0.4"
+            else:
+                body, code, content_type = b"not found", 404, "text/plain"
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="scheduler-health", daemon=True).start()
+    logging.info(f"Endpoint health/metrics aktif di http://{host}:{server.server_port}/health")
+    return server
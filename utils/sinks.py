@@ -0,0 +1,261 @@
+import logging
+import threading
+import time
+import uuid
+import pandas as pd
+from utils.load import save_to_csv, save_changes_to_csv, save_to_parquet, GoogleSheetsLoader, PostgresLoader
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Batas waktu default satu sink untuk satu pemanggilan load (detik)
+SINK_TIMEOUT = 300
+
+SINKS = {}
+
+
+def register_sink(name: str):
+    """
+    Decorator untuk mendaftarkan kelas sink dengan nama tertentu, sehingga tujuan baru
+    bisa dipakai lewat `create_sinks()` tanpa mengubah `main.py`.
+    """
+    def decorator(cls):
+        cls.name = name
+        SINKS[name] = cls
+        return cls
+    return decorator
+
+
+class Sink:
+    """
+    Tujuan load yang bisa dipanggil berkali-kali dalam satu run (misal sekali per chunk).
+
+    Subclass cukup mengimplementasikan `_load(df)`, `apply_changes(upserts, deleted)`
+    untuk mode incremental, dan bila perlu `close()`.
+    Jumlah baris yang sudah dimuat dicatat di `rows_loaded` agar sink bisa
+    menimpa data lama pada load pertama dan menambahkan data pada load berikutnya.
+
+    Parameters:
+    timeout (float): Batas waktu satu pemanggilan load dalam detik. Default = SINK_TIMEOUT.
+    """
+
+    name = None
+
+    def __init__(self, timeout: float = SINK_TIMEOUT):
+        self.timeout = timeout
+        self.rows_loaded = 0
+        # Thread pemanggilan yang melewati timeout dan masih berjalan (lihat `run_sinks`)
+        self.inflight = None
+
+    def load(self, df: pd.DataFrame):
+        """Memuat DataFrame ke tujuan lalu menambah hitungan `rows_loaded`."""
+        self._load(df)
+        self.rows_loaded += len(df)
+
+    def _load(self, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def apply_changes(self, upserts: pd.DataFrame, deleted: pd.DataFrame):
+        """Menerapkan baris baru / berubah (`upserts`) dan produk yang hilang (`deleted`)."""
+        raise NotImplementedError(f"Sink {self.name} tidak mendukung mode incremental.")
+
+    def reset(self):
+        """
+        Memulai run baru pada sink yang dipakai ulang antar run (mode scheduler): koneksi dan
+        client tetap hidup, tetapi load berikutnya diperlakukan sebagai load pertama run baru.
+        """
+        self.rows_loaded = 0
+
+    def close(self):
+        """Melepas resource milik sink (koneksi, client API)."""
+
+
+@register_sink("csv")
+class CsvSink(Sink):
+    """Sink file CSV: load pertama menimpa file, load berikutnya menambahkan baris."""
+
+    def __init__(self, filename: str = "products.csv", timeout: float = SINK_TIMEOUT):
+        super().__init__(timeout)
+        self.filename = filename
+
+    def _load(self, df):
+        save_to_csv(df, self.filename, append=self.rows_loaded > 0)
+
+    def apply_changes(self, upserts, deleted):
+        save_changes_to_csv(upserts, deleted, self.filename)
+
+
+@register_sink("parquet")
+class ParquetSink(Sink):
+    """
+    Sink dataset Parquet yang dipartisi per tanggal scraping; setiap load menambah file baru.
+
+    Pada mode incremental hanya baris baru / berubah yang ditambahkan sebagai riwayat
+    perubahan; produk yang hilang tidak ditulis karena dataset bersifat append-only.
+    """
+
+    def __init__(self, root_path: str = "products_parquet", compression: str = "zstd",
+                 timeout: float = SINK_TIMEOUT):
+        super().__init__(timeout)
+        self.root_path = root_path
+        self.compression = compression
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.calls = 0
+
+    def reset(self):
+        super().reset()
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.calls = 0
+
+    def _write(self, df):
+        self.calls += 1
+        save_to_parquet(df, self.root_path, compression=self.compression, run_id=f"{self.run_id}-{self.calls}")
+
+    def _load(self, df):
+        self._write(df)
+
+    def apply_changes(self, upserts, deleted):
+        if len(upserts):
+            self._write(upserts)
+
+
+@register_sink("google_sheets")
+class GoogleSheetsSink(Sink):
+    """Sink Google Sheets memakai satu GoogleSheetsLoader; setiap load ditulis tepat di bawah load sebelumnya."""
+
+    def __init__(self, spreadsheet_id: str, range_name: str, creds_json_path: str = None,
+                 timeout: float = SINK_TIMEOUT, **loader_options):
+        super().__init__(timeout)
+        self.loader = GoogleSheetsLoader(spreadsheet_id, range_name, creds_json_path, **loader_options)
+
+    def _load(self, df):
+        self.loader.load(df, offset=self.rows_loaded)
+
+    def apply_changes(self, upserts, deleted):
+        self.loader.apply_changes(upserts, deleted)
+
+
+@register_sink("postgres")
+class PostgresSink(Sink):
+    """Sink PostgreSQL memakai satu PostgresLoader yang dibuat saat load pertama."""
+
+    def __init__(self, timeout: float = SINK_TIMEOUT, **loader_options):
+        super().__init__(timeout)
+        self.loader_options = {"mode": "bulk", **loader_options}
+        self.loader = None
+
+    def _get_loader(self):
+        if self.loader is None:
+            self.loader = PostgresLoader(**self.loader_options)
+        return self.loader
+
+    def _load(self, df):
+        self._get_loader().load(df)
+
+    def apply_changes(self, upserts, deleted):
+        self._get_loader().apply_changes(upserts, deleted)
+
+    def close(self):
+        if self.loader is not None:
+            self.loader.close()
+
+
+def create_sinks(names, options: dict = None) -> list:
+    """
+    Membuat instance sink dari nama yang terdaftar di `SINKS`.
+
+    Parameters:
+    names (list)  : Nama sink yang akan dipakai, misal ['csv', 'postgres'].
+    options (dict): Argumen constructor per nama sink.
+
+    Returns:
+    list: Instance Sink sesuai urutan `names`.
+
+    Raises:
+    ValueError: Jika ada nama sink yang tidak terdaftar.
+    """
+    options = options or {}
+    unknown = [name for name in names if name not in SINKS]
+    if unknown:
+        raise ValueError(f"Sink tidak dikenal: {unknown}. Pilihan: {sorted(SINKS)}")
+    return [SINKS[name](**options.get(name, {})) for name in names]
+
+
+def run_sinks(df: pd.DataFrame, sinks: list, deleted: pd.DataFrame = None) -> list:
+    """
+    Mengirim DataFrame ke semua sink secara paralel, masing-masing di thread sendiri.
+
+    Jika `deleted` diberikan (mode incremental), `df` diperlakukan sebagai baris upsert
+    dan setiap sink menjalankan `apply_changes(df, deleted)` alih-alih `load(df)`.
+
+    Setiap sink punya batas waktu sendiri yang dihitung sejak semua sink dimulai.
+    Kegagalan atau timeout satu sink tidak menghentikan sink lain. Thread sink yang
+    melewati batas waktu tidak bisa dihentikan paksa; thread tersebut dibiarkan
+    selesai di background (daemon) dan hasilnya diabaikan. Selama thread itu masih
+    berjalan, sink tersebut dilewati pada pemanggilan berikutnya (dilaporkan sebagai error)
+    agar satu sink tidak pernah dimasuki dua thread sekaligus.
+
+    Parameters:
+    df (pd.DataFrame)     : Data yang akan dimuat.
+    sinks (list)          : Instance Sink tujuan.
+    deleted (pd.DataFrame): Kolom kunci produk yang dihapus. Default = None.
+
+    Returns:
+    list: Satu dict per sink berisi sink, rows (baris upsert + hapus pada mode incremental),
+          seconds dan error (None jika berhasil).
+    """
+    results = [{"sink": sink.name, "rows": 0, "seconds": None, "error": None} for sink in sinks]
+
+    def worker(sink, result):
+        start = time.perf_counter()
+        try:
+            if deleted is None:
+                sink.load(df)
+                result["rows"] = len(df)
+            else:
+                sink.apply_changes(df, deleted)
+                result["rows"] = len(df) + len(deleted)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    threads = []
+    for sink, result in zip(sinks, results):
+        if sink.inflight is not None and sink.inflight.is_alive():
+            result.update(seconds=0.0, error="Dilewati: pemanggilan sebelumnya yang timeout masih berjalan")
+            threads.append(None)
+            continue
+        thread = threading.Thread(target=worker, args=(sink, result), name=f"sink-{sink.name}", daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    final = []
+    for sink, result, thread in zip(sinks, results, threads):
+        if thread is None:
+            final.append(dict(result))
+            continue
+        thread.join(max(0.0, sink.timeout - (time.perf_counter() - start)))
+        if thread.is_alive():
+            sink.inflight = thread
+            final.append({"sink": sink.name, "rows": 0, "seconds": time.perf_counter() - start,
+                          "error": f"Timeout setelah {sink.timeout} detik"})
+        else:
+            sink.inflight = None
+            final.append(dict(result))
+
+    for result in final:
+        if result["error"]:
+            logging.error(f"Sink {result['sink']} gagal setelah {result['seconds']:.2f} detik: {result['error']}")
+        else:
+            logging.info(f"Sink {result['sink']}: {result['rows']} baris dalam {result['seconds']:.2f} detik.")
+    return final
+
+
+def close_sinks(sinks: list):
+    """Menutup semua sink; kegagalan menutup satu sink hanya dicatat di log."""
+    for sink in sinks:
+        try:
+            sink.close()
+        except Exception as e:
+            logging.error(f"Gagal menutup sink {sink.name}: {e}")
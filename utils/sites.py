@@ -0,0 +1,417 @@
+import json
+import logging
+import queue
+import re
+import threading
+import soupsieve
+from bs4 import BeautifulSoup
+import utils.extract as extract
+from utils.extract import iter_pages, get_session, create_parse_pool, _record_stats
+from utils.parsers import FIELD_KEYWORDS, _make_product, lxml_root
+
+try:
+    from lxml import etree
+except ImportError:  # lxml opsional, selector dijalankan lewat BeautifulSoup + soupsieve
+    etree = None
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Kata kunci bawaan per field; situs lain boleh memakai awalan sendiri (misal "Ukuran:" untuk size)
+DEFAULT_KEYWORDS = {field: keyword for keyword, field in FIELD_KEYWORDS}
+
+# Interval thread situs mengecek apakah konsumen sudah berhenti selagi antrian hasil penuh (detik)
+QUEUE_POLL_SECONDS = 0.1
+
+# Bagian CSS yang bisa diterjemahkan ke XPath: `tag`, `.class`, `tag.class.class`, dipisah spasi (descendant)
+_COMPOUND_RE = re.compile(r'^(?P<tag>[A-Za-z][\w-]*|\*)?(?P<classes>(?:\.[\w-]+)*)$')
+
+# Selector yang sudah dikompilasi, dipakai ulang oleh semua SiteConfig dan semua halaman di proses ini
+_COMPILED = {}
+
+
+def css_to_xpath(selector):
+    """
+    Menerjemahkan subset CSS (tag, class, descendant, dan alternatif dengan koma) ke XPath
+    relatif terhadap elemen konteks, untuk dijalankan dengan lxml tanpa paket cssselect.
+
+    Parameters:
+    selector (str): Selector CSS, misal '.price-container .price, p.price'.
+
+    Returns:
+    str: Ekspresi XPath yang setara (hasil berurutan sesuai dokumen, seperti CSS).
+
+    Raises:
+    ValueError: Jika selector memakai sintaks di luar subset yang didukung.
+    """
+    alternatives = []
+    for part in selector.split(','):
+        steps = part.split()
+        if not steps:
+            raise ValueError(f"Selector kosong: {selector!r}")
+        path = []
+        for step in steps:
+            match = _COMPOUND_RE.match(step)
+            if match is None or not step:
+                raise ValueError(f"Selector tidak didukung backend lxml: {selector!r}")
+            conditions = "".join(
+                f"[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+                for name in match.group('classes').split('.')[1:]
+            )
+            path.append(f"descendant::{match.group('tag') or '*'}{conditions}")
+        alternatives.append("/".join(path))
+    return " | ".join(alternatives)
+
+
+def _compile(selector, backend):
+    """
+    Mengompilasi selector sekali per proses untuk backend tertentu.
+
+    Returns:
+    object: lxml.etree.XPath untuk 'lxml', pola soupsieve untuk 'bs4', atau None jika
+            selector tidak bisa diterjemahkan untuk lxml.
+    """
+    key = (backend, selector)
+    if key not in _COMPILED:
+        if backend == 'lxml':
+            try:
+                _COMPILED[key] = etree.XPath(css_to_xpath(selector))
+            except ValueError:
+                _COMPILED[key] = None
+        else:
+            _COMPILED[key] = soupsieve.compile(selector)
+    return _COMPILED[key]
+
+
+class SiteConfig:
+    """
+    Konfigurasi deklaratif satu toko online dengan struktur halaman mirip fashion-studio.
+
+    Selector dikompilasi sekali (dan di-cache per proses), sehingga konfigurasi ini bisa dikirim
+    ke process pool parser tanpa biaya kompilasi ulang per halaman. Hasil parsing memakai format
+    dictionary produk yang sama dengan `parse_products`.
+
+    Parameters:
+    name (str)              : Nama situs, dipakai sebagai nilai kolom `source`.
+    base_url (str)          : URL dasar katalog, diakhiri '/'.
+    page_pattern (str)      : Pola URL halaman 2 dst; boleh memakai {base_url} dan {page}.
+    first_page_pattern (str): Pola URL halaman 1. Default = base_url.
+    card_selector (str)     : Selector CSS setiap card produk.
+    title_selector (str)    : Selector CSS judul produk di dalam card.
+    price_selectors (tuple) : Selector CSS harga, dicoba berurutan sampai ada yang berisi teks.
+    text_selector (str)     : Selector CSS elemen teks yang dicocokkan dengan kata kunci.
+    keywords (dict)         : Kata kunci per field (rating, colors, size, gender). Field yang
+                              tidak diisi memakai kata kunci bawaan.
+
+    Raises:
+    ValueError: Jika nama situs kosong, field kata kunci tidak dikenal, atau selector tidak valid.
+    """
+
+    def __init__(self, name, base_url, page_pattern="{base_url}page{page}", first_page_pattern="{base_url}",
+                 card_selector="div.collection-card", title_selector=".product-title",
+                 price_selectors=(".price-container .price", "p.price"), text_selector="p", keywords=None):
+        if not name:
+            raise ValueError("Nama situs wajib diisi.")
+        unknown = set(keywords or {}) - set(DEFAULT_KEYWORDS)
+        if unknown:
+            raise ValueError(f"Field kata kunci tidak dikenal: {sorted(unknown)}")
+
+        self.name = name
+        self.base_url = base_url
+        self.page_pattern = page_pattern
+        self.first_page_pattern = first_page_pattern
+        self.card_selector = card_selector
+        self.title_selector = title_selector
+        self.price_selectors = tuple([price_selectors] if isinstance(price_selectors, str) else price_selectors)
+        self.text_selector = text_selector
+        self.keywords = dict(DEFAULT_KEYWORDS, **(keywords or {}))
+        # Urutan pencocokan sama dengan parser lama; kata kunci situs diganti ke kata kunci bawaan
+        self._keyword_rules = tuple(
+            (self.keywords[field], field, DEFAULT_KEYWORDS[field]) for _, field in FIELD_KEYWORDS
+        )
+
+        try:
+            for selector in self.selectors:
+                _compile(selector, 'bs4')
+        except soupsieve.SelectorSyntaxError as e:
+            raise ValueError(f"Selector situs {name} tidak valid: {e}") from e
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Membuat SiteConfig dari dictionary (misal hasil JSON). Selector boleh dikelompokkan di
+        key 'selectors' dengan nama card, title, price dan text.
+
+        Raises:
+        ValueError: Jika ada key yang tidak dikenal.
+        """
+        data = dict(data)
+        selectors = data.pop('selectors', {})
+        renamed = {'card': 'card_selector', 'title': 'title_selector', 'price': 'price_selectors',
+                   'text': 'text_selector'}
+        unknown = set(selectors) - set(renamed)
+        if unknown:
+            raise ValueError(f"Selector tidak dikenal: {sorted(unknown)}")
+        data.update({renamed[key]: value for key, value in selectors.items()})
+        try:
+            return cls(**data)
+        except TypeError as e:
+            raise ValueError(f"Konfigurasi situs tidak valid: {e}") from e
+
+    @property
+    def selectors(self):
+        """Semua selector CSS konfigurasi ini."""
+        return (self.card_selector, self.title_selector, *self.price_selectors, self.text_selector)
+
+    def build_page_url(self, page_num):
+        """URL halaman katalog ke-`page_num` (lihat `utils.extract.build_page_url`)."""
+        pattern = self.first_page_pattern if page_num == 1 else self.page_pattern
+        return pattern.format(base_url=self.base_url, page=page_num)
+
+    def _match_keyword(self, text, fields):
+        for keyword, field, canonical in self._keyword_rules:
+            if keyword in text:
+                fields[field] = text if keyword == canonical else text.replace(keyword, canonical, 1)
+                return
+
+    def parse(self, html, timestamp, backend=None, page_num=None):
+        """
+        Mengekstrak daftar produk dari HTML situs ini.
+
+        Parameters:
+        html (str)     : Isi halaman HTML.
+        timestamp (str): Waktu scraping yang disematkan ke setiap produk.
+        backend (str)  : 'lxml' atau 'bs4'. Jika lxml tidak tersedia atau selector di luar subset
+                         yang bisa diterjemahkan, dipakai 'bs4'.
+        page_num (int) : Nomor halaman, hanya untuk pesan log.
+
+        Returns:
+        list: Daftar dictionary produk (title, price, rating, colors, size, gender, timestamp).
+        """
+        if backend != 'bs4' and etree is not None:
+            compiled = [_compile(selector, 'lxml') for selector in self.selectors]
+            if None not in compiled:
+                root = lxml_root(html)
+                if root is None:
+                    return []
+                return self._parse_cards(root.getroottree(), compiled, lambda element: element.text_content().strip(),
+                                         lambda pattern, element: pattern(element), timestamp, page_num)
+
+        compiled = [_compile(selector, 'bs4') for selector in self.selectors]
+        soup = BeautifulSoup(html, 'html.parser')
+        return self._parse_cards(soup, compiled, lambda element: element.text.strip(),
+                                 lambda pattern, element: pattern.select(element), timestamp, page_num)
+
+    def _parse_cards(self, root, compiled, text_of, select, timestamp, page_num):
+        """Menelusuri setiap card dengan selector yang sudah dikompilasi (sama untuk kedua backend)."""
+        card_pattern, title_pattern, *price_patterns, text_pattern = compiled
+        page_data = []
+        for card in select(card_pattern, root):
+            try:
+                titles = select(title_pattern, card)
+                title = text_of(titles[0]) if titles else None
+
+                price = None
+                for pattern in price_patterns:
+                    prices = select(pattern, card)
+                    if prices:
+                        price = text_of(prices[0])
+                    if price:
+                        break
+
+                fields = {}
+                for element in select(text_pattern, card):
+                    self._match_keyword(text_of(element), fields)
+
+                page_data.append(_make_product(title, price, fields, timestamp))
+            except Exception as e:
+                logging.error(f"[ERROR] Unexpected error on {self.name} page {page_num}: {e}")
+        return page_data
+
+    def __repr__(self):
+        return f"SiteConfig({self.name!r}, {self.base_url!r})"
+
+
+# Konfigurasi situs asli, hasilnya identik dengan `parse_products`
+FASHION_STUDIO = SiteConfig("fashion-studio", "https://fashion-studio.dicoding.dev/")
+
+
+def load_site_configs(path):
+    """
+    Membaca daftar konfigurasi situs dari file JSON (list of object, lihat `SiteConfig.from_dict`).
+
+    Parameters:
+    path (str): Path file JSON.
+
+    Returns:
+    list: Daftar SiteConfig, berurutan sesuai file.
+
+    Raises:
+    ValueError: Jika isi file bukan list, konfigurasi tidak valid, atau ada nama situs ganda.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list) or not data:
+        raise ValueError(f"File {path} harus berisi list konfigurasi situs.")
+    sites = [SiteConfig.from_dict(item) for item in data]
+    _check_names(sites)
+    return sites
+
+
+def _check_names(sites):
+    names = [site.name for site in sites]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Nama situs ganda: {duplicates}")
+
+
+def iter_site_pages(sites, max_workers=1, pool_size=None, parse_workers=0, done_pages=None, parse_pool=None,
+                    **scrape_kwargs):
+    """
+    Men-scrape beberapa situs sekaligus: satu thread `iter_pages` per situs, dengan satu connection
+    pool dan satu process pool parser yang dipakai bersama semua situs.
+
+    Setiap produk diberi kolom `source` berisi nama situsnya. Halaman dari situs yang berbeda
+    dikeluarkan begitu tersedia; halaman dari situs yang sama tetap berurutan.
+
+    Parameters:
+    sites (list)       : Daftar SiteConfig.
+    max_workers (int)  : Jumlah request bersamaan per situs. Default = 1.
+    pool_size (int)    : Ukuran connection pool bersama. Default = max(jumlah situs * max_workers, POOL_SIZE).
+    parse_workers (int): Jumlah proses parser bersama. Default = 0 (parse di thread fetch).
+    done_pages (dict)  : Halaman yang sudah diambil per situs: {source: {page_num: products}}.
+    parse_pool (Executor): Opsional. Process pool milik pemanggil; tidak dimatikan di sini.
+                         Jika diberikan, `parse_workers` diabaikan.
+    **scrape_kwargs    : Argumen lain untuk `iter_pages` (max_pages, rate_limit, stop_on_empty).
+
+    Yields:
+    tuple: (site, page_num, page_data).
+
+    Raises:
+    ValueError: Jika daftar situs kosong atau ada nama situs ganda.
+    """
+    sites = list(sites)
+    if not sites:
+        raise ValueError("Minimal satu situs harus dikonfigurasi.")
+    _check_names(sites)
+
+    # Session dibuat sekali di sini dengan ukuran akhirnya, agar thread situs tidak membuatnya ulang
+    pool_size = pool_size or max(len(sites) * max_workers, extract.POOL_SIZE)
+    get_session(pool_size)
+    own_pool = parse_pool is None and bool(parse_workers)
+    if own_pool:
+        parse_pool = create_parse_pool(parse_workers)
+    # Antrian dibatasi agar thread situs tidak menumpuk seluruh katalognya di depan konsumen
+    # (mode streaming): paling banyak sekitar satu gelombang request per situs yang menunggu
+    results = queue.Queue(maxsize=len(sites) * max_workers)
+    stop = threading.Event()
+    finished = object()
+
+    def put(item):
+        """Menaruh item di antrian; berhenti menunggu (False) jika konsumen sudah berhenti."""
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scrape_site(site):
+        try:
+            for page, page_data in iter_pages(max_workers=max_workers, pool_size=pool_size, parse_pool=parse_pool,
+                                              done_pages=(done_pages or {}).get(site.name), site=site,
+                                              **scrape_kwargs):
+                for product in page_data:
+                    product['source'] = site.name
+                if not put((site, page, page_data)):
+                    break
+        except Exception as e:
+            put((site, None, e))
+        finally:
+            put((site, finished, None))
+
+    threads = [threading.Thread(target=scrape_site, args=(site,), name=f"site-{site.name}", daemon=True)
+               for site in sites]
+    for thread in threads:
+        thread.start()
+    try:
+        remaining = len(threads)
+        while remaining:
+            site, page, item = results.get()
+            if page is finished:
+                remaining -= 1
+            elif page is None:
+                raise item
+            else:
+                yield site, page, item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if own_pool:
+            parse_pool.shutdown(cancel_futures=True)
+
+
+def scrape_sites(sites, stats=None, on_page=None, **scrape_kwargs):
+    """
+    Versi multi-situs dari `scrape_all_pages`: semua situs di-scrape bersamaan (lihat `iter_site_pages`).
+
+    Parameters:
+    sites (list)       : Daftar SiteConfig.
+    stats (list)       : Jika diberikan, diisi ringkasan per halaman seperti `scrape_all_pages`
+                         ditambah key `source`.
+    on_page (callable) : Dipanggil dengan (page_num, page_data, source=nama situs) setelah setiap halaman,
+                         misal `RunCheckpoint.save_page`.
+    **scrape_kwargs    : Argumen untuk `iter_site_pages`.
+
+    Returns:
+    list: Produk semua situs (dengan kolom `source`), berurutan per situs lalu per halaman.
+    """
+    sites = list(sites)
+    per_site = {site.name: [] for site in sites}
+    for site, page, page_data in iter_site_pages(sites, **scrape_kwargs):
+        per_site[site.name].extend(page_data)
+        if stats is not None:
+            _record_stats(stats, page, page_data)
+            stats[-1]["source"] = site.name
+        if on_page is not None:
+            on_page(page, page_data, source=site.name)
+
+    for name, products in per_site.items():
+        logging.info(f"Total products scraped from {name}: {len(products)}")
+    return [product for site in sites for product in per_site[site.name]]
+
+
+def iter_site_chunks(sites, chunk_pages=5, stats=None, **scrape_kwargs):
+    """
+    Versi multi-situs dari `iter_product_chunks`: produk dari `chunk_pages` halaman (dari situs mana pun,
+    sesuai urutan selesainya) dikelompokkan menjadi satu chunk.
+
+    Parameters:
+    sites (list)     : Daftar SiteConfig.
+    chunk_pages (int): Jumlah halaman per chunk. Default = 5.
+    stats (list)     : Jika diberikan, diisi ringkasan per halaman beserta `source`.
+    **scrape_kwargs  : Argumen untuk `iter_site_pages`.
+
+    Yields:
+    list: Produk mentah (dengan kolom `source`), chunk kosong dilewati.
+    """
+    if chunk_pages < 1:
+        raise ValueError("chunk_pages minimal 1.")
+
+    chunk = []
+    pages_in_chunk = 0
+    for site, page, page_data in iter_site_pages(sites, **scrape_kwargs):
+        if stats is not None:
+            _record_stats(stats, page, page_data)
+            stats[-1]["source"] = site.name
+        chunk.extend(page_data)
+        pages_in_chunk += 1
+        if pages_in_chunk == chunk_pages:
+            if chunk:
+                yield chunk
+            chunk = []
+            pages_in_chunk = 0
+    if chunk:
+        yield chunk
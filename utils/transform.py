@@ -1,81 +1,364 @@
+import numpy as np
 import pandas as pd
 import logging
 import re
+from utils.validation import DEFAULT_RULES, DEDUP_RULES
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+USD_TO_IDR      = 16000
 
-def clean_and_transform(raw_data):
+# Regex dikompilasi sekali dan dipakai ulang di setiap pemanggilan
+PRICE_STRIP_RE = re.compile(r'[^0-9.]')
+RATING_RE      = re.compile(r'(\d+\.?\d*)')
+COLORS_RE      = re.compile(r'(\d+)')
+
+# Nama aturan filter bawaan, berurutan sesuai urutan penerapannya; baris dihitung pada aturan pertama yang membuangnya
+FILTER_RULES = DEFAULT_RULES.names
+
+
+def raw_row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash 64-bit isi setiap baris mentah, yang disimpan di `seen` untuk deduplikasi lintas chunk.
+
+    Returns:
+    np.ndarray: Hash uint64 per baris, berurutan sesuai `df`.
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _seen_mask(df, seen):
+    """Mask baris yang sudah muncul di chunk sebelumnya, lalu mencatat hash baris baru ke `seen`."""
+    # Sama dengan drop_duplicates pada gabungan semua chunk: kemunculan pertama yang dipertahankan.
+    # Yang disimpan hanya hash 64-bit per baris, bukan tuple baris mentah, agar memori `seen`
+    # tetap kecil (sekitar 70 byte per produk) berapa pun panjang judul dan kolom lainnya.
+    hashes = raw_row_hashes(df).tolist()
+    mask = np.fromiter((value in seen for value in hashes), dtype=bool, count=len(hashes))
+    seen.update(hashes)
+    return mask
+
+
+def _drop_seen(df, seen):
+    """Membuang baris yang sudah muncul di chunk sebelumnya, lalu mencatat baris baru ke `seen`."""
+    return df.loc[~_seen_mask(df, seen)]
+
+
+def _clean_pandas(df, seen, dropped):
+    """Engine asli: rangkaian operasi `.str` dan filter pandas yang dijalankan satu per satu."""
+    counts = [len(df)]
+
+    # Buang baris dengan nilai null
+    df.dropna(inplace=True)
+    counts.append(len(df))
+
+    # Buang baris dengan data invalid eksplisit
+    df = df[~df['title'].str.lower().str.contains("unknown product")]
+    counts.append(len(df))
+    df = df[~df['rating'].isin(["Invalid Rating / 5", "Not Rated"])]
+    counts.append(len(df))
+    df = df[~df['price'].isin(["Price Unavailable", None])]
+    counts.append(len(df))
+
+    # Buang duplikat
+    df.drop_duplicates(inplace=True)
+    counts.append(len(df))
+    if seen is not None:
+        df = _drop_seen(df, seen)
+    counts.append(len(df))
+    _count_drops(dropped, counts)
+
+    # Membersihkan dan konversi kolom `price`
+    df['price'] = df['price'].str.replace(r'[^0-9.]', '', regex=True)
+    df['price'] = df['price'].astype(float) * 16000
+
+    # Membersihkan dan konversi kolom `rating`
+    df['rating'] = df['rating'].str.extract(r'(\d+\.?\d*)')
+    df['rating'] = df['rating'].astype(float)
+
+    # Membersihkan dan konversi kolom `colors`
+    df['colors'] = df['colors'].str.extract(r'(\d+)').astype(int)
+
+    # Membersihkan kolom `size` dan `gender`
+    df['size'] = df['size'].str.replace("Size: ", "").str.strip()
+    df['gender'] = df['gender'].str.replace("Gender: ", "").str.strip()
+    return df
+
+
+def _parse_price(text):
+    return float(PRICE_STRIP_RE.sub('', text)) * USD_TO_IDR
+
+
+def _parse_rating(text):
+    match = RATING_RE.search(text)
+    return float(match.group(1)) if match else np.nan
+
+
+def _parse_colors(text):
+    match = COLORS_RE.search(text)
+    if match is None:
+        raise ValueError("Cannot convert non-finite values (NA or inf) to integer")
+    return int(match.group(1))
+
+
+def _strip_prefix(prefix):
+    return lambda text: text.replace(prefix, "").strip()
+
+
+def _parse_column(series, parse, dtype):
+    """
+    Mem-parse satu kolom teks dalam satu lintasan. Setiap nilai unik hanya di-parse sekali,
+    sehingga kolom berkardinalitas rendah (rating, colors, size, gender) hampir gratis.
+    """
+    codes, uniques = pd.factorize(series.to_numpy(dtype=object))
+    parsed = np.array([parse(value) for value in uniques], dtype=dtype)
+    missing = codes < 0
+    if not missing.any():
+        return parsed[codes]
+    # Null tidak di-parse dan tetap null (bisa lolos jika aturan not_null tidak dipakai):
+    # kode -1 diarahkan ke elemen null tambahan di akhir `parsed`
+    if np.issubdtype(dtype, np.integer):
+        return pd.arrays.IntegerArray(np.append(parsed, 0)[codes], missing)
+    return np.append(parsed, np.array([None if dtype is object else np.nan], dtype=dtype))[codes]
+
+
+def _count_drops(dropped, counts):
+    """Mengisi `dropped` dengan jumlah baris yang dibuang tiap aturan dari urutan jumlah baris."""
+    if dropped is not None:
+        for rule, before, after in zip(FILTER_RULES, counts, counts[1:]):
+            dropped[rule] = dropped.get(rule, 0) + before - after
+
+
+def _parse_frame(df):
+    """Mem-parse setiap kolom mentah dalam satu lintasan dengan regex yang sudah dikompilasi."""
+    return df.assign(
+        price=_parse_column(df['price'], _parse_price, np.float64),
+        rating=_parse_column(df['rating'], _parse_rating, np.float64),
+        colors=_parse_column(df['colors'], _parse_colors, np.int64),
+        size=_parse_column(df['size'], _strip_prefix("Size: "), object),
+        gender=_parse_column(df['gender'], _strip_prefix("Gender: "), object),
+    )
+
+
+def _clean_fast(df, seen, dropped, rules=DEFAULT_RULES, quarantine=None, history=None):
+    """
+    Engine cepat: aturan validasi (lihat `utils.validation`) dievaluasi per kolom secara vektor
+    menjadi satu array alasan penolakan yang diterapkan sekali, lalu setiap kolom di-parse dalam
+    satu lintasan dengan regex yang sudah dikompilasi. Dengan `DEFAULT_RULES` hasilnya identik
+    dengan `_clean_pandas`.
+
+    Dengan `history` (DedupIndex), deduplikasi memakai fingerprint isi produk tanpa timestamp:
+    baris kembar di data ini dihitung 'duplicate' dan baris yang sudah ada di riwayat 'seen_before'.
+    """
+    reasons = rules.evaluate(df)
+    kept = np.flatnonzero(reasons < 0)
+    clean = df.iloc[kept]
+
+    def drop(mask, code):
+        nonlocal kept, clean
+        reasons[kept[mask]] = code
+        kept = kept[~mask]
+        clean = clean[~mask]
+
+    if history is None:
+        drop(clean.duplicated().to_numpy(), len(rules))
+        if seen is not None:
+            drop(_seen_mask(clean, seen), len(rules) + 1)
+        clean = _parse_frame(clean)
+    else:
+        # Fingerprint dihitung dari hasil parse agar sama dengan data yang sudah dimuat ke sink
+        clean = _parse_frame(clean)
+        fingerprints = history.fingerprints(clean)
+        duplicate = pd.Series(fingerprints).duplicated().to_numpy()
+        drop(duplicate, len(rules))
+        fingerprints = fingerprints[~duplicate]
+        in_history = history.contains(fingerprints)
+        drop(in_history, len(rules) + 1)
+        history.add(fingerprints[~in_history])
+
+    if dropped is not None:
+        counts = np.bincount(reasons[reasons >= 0], minlength=len(rules) + len(DEDUP_RULES))
+        for rule, count in zip(rules.names, counts):
+            dropped[rule] = dropped.get(rule, 0) + int(count)
+    if quarantine is not None and len(kept) < len(df):
+        rejected = np.flatnonzero(reasons >= 0)
+        # Baris mentah yang dibuang beserta nama aturan pertama yang membuangnya
+        quarantine.append(df.iloc[rejected].assign(reject_rule=np.array(rules.names)[reasons[rejected]]))
+    return clean
+
+
+# Skema tipe data hasil transformasi: default dan versi ringkas (opt-in lewat compact=True)
+DEFAULT_DTYPES = {
+    'title'    : 'object',
+    'price'    : 'float64',
+    'rating'   : 'float64',
+    'colors'   : 'int64',
+    'size'     : 'object',
+    'gender'   : 'object',
+    'timestamp': 'object'
+}
+
+COMPACT_DTYPES = {
+    'title'    : 'object',
+    'price'    : 'float64',
+    'rating'   : 'float32',
+    'colors'   : 'int8',
+    'size'     : 'category',
+    'gender'   : 'category',
+    'timestamp': 'datetime64[ns]'
+}
+
+
+def to_compact(df):
+    """
+    Mengubah DataFrame hasil `clean_and_transform` ke skema ringkas (`COMPACT_DTYPES`):
+    kategori untuk size dan gender, datetime64 untuk timestamp, int8 untuk colors dan float32 untuk rating.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame bersih dengan skema default.
+
+    Returns:
+    pd.DataFrame: Salinan DataFrame dengan tipe data ringkas.
+    """
+    return df.assign(
+        rating=df['rating'].astype('float32'),
+        # downcast memilih int8, dan otomatis memakai tipe lebih besar jika nilainya tidak muat
+        colors=pd.to_numeric(df['colors'], downcast='integer'),
+        size=df['size'].astype('category'),
+        gender=df['gender'].astype('category'),
+        timestamp=pd.to_datetime(df['timestamp'], format='ISO8601'),
+    )
+
+
+def validate_dtypes(df, expected_dtypes):
+    """
+    Mencatat di log apakah tipe data setiap kolom sesuai skema.
+
+    Parameters:
+    df (pd.DataFrame)     : DataFrame yang dicek.
+    expected_dtypes (dict): Nama kolom -> nama tipe data yang diharapkan.
+
+    Returns:
+    list: Nama kolom yang tipe datanya tidak sesuai.
+    """
+    mismatched = []
+    for column, expected_type in expected_dtypes.items():
+        if column not in df.columns:
+            continue
+        actual_type = df[column].dtype
+        if str(actual_type) == expected_type:
+            logging.info(f"Tipe data kolom '{column}' sudah sesuai: {actual_type}")
+        else:
+            logging.warning(f"Tipe data kolom '{column}' TIDAK SESUAI! Diharapkan: {expected_type}, Aktual: {actual_type}")
+            mismatched.append(column)
+    return mismatched
+
+
+TRANSFORM_ENGINES = {
+    'fast': _clean_fast,
+    'pandas': _clean_pandas,
+}
+
+
+def clean_and_transform(raw_data, seen=None, engine='fast', compact=False, stats=None, rules=None, quarantine=None,
+                        history=None):
     """
     Membersihkan dan mentransformasi data hasil scraping menjadi dataset yang bersih dan terstruktur.
 
     Parameters:
     raw_data (list): List of dictionary berisi data mentah hasil scraping.
+    seen (set)     : Opsional. Kumpulan hash baris mentah (lihat `raw_row_hashes`) yang sudah lolos
+                     di chunk sebelumnya; dipakai untuk deduplikasi lintas chunk dan diperbarui di tempat.
+    engine (str)   : 'fast' (satu mask + satu lintasan regex per kolom) atau 'pandas'
+                     (rangkaian operasi `.str` versi awal). Hasil keduanya identik.
+    compact (bool) : Jika True, hasil memakai skema ringkas `COMPACT_DTYPES` (lihat `to_compact`).
+    stats (dict)   : Jika diberikan, diisi rows_in, rows_out dan dropped (jumlah baris yang
+                     dibuang per aturan, lihat `FILTER_RULES`).
+    rules (RuleSet): Aturan validasi baris (lihat `utils.validation`). Default = `DEFAULT_RULES`.
+                     Hanya untuk engine 'fast'.
+    quarantine (list): Jika diberikan, ditambah satu DataFrame berisi baris mentah yang dibuang
+                     beserta kolom `reject_rule` (jika ada baris yang dibuang).
+    history (DedupIndex): Opsional, pengganti `seen`. Indeks persisten fingerprint isi produk
+                     (lihat `utils.dedup`): produk yang sudah ada di riwayat dibuang ('seen_before')
+                     tanpa memandang timestamp, dan produk baru ditambahkan ke indeks.
+                     Hanya untuk engine 'fast'.
 
     Returns:
     pd.DataFrame: DataFrame yang sudah dibersihkan dan ditransformasi.
 
     Raises:
-    ValueError: Jika data tidak berbentuk list atau kosong.
+    ValueError: Jika data tidak berbentuk list atau kosong, engine tidak dikenal, aturan /
+                karantina / history dipakai dengan engine 'pandas', atau `seen` dan `history`
+                diberikan bersamaan.
     Exception: Jika terjadi kesalahan saat proses pembersihan atau transformasi data.
     """
     if not isinstance(raw_data, list) or not raw_data:
         raise ValueError("Input harus berupa list dan tidak boleh kosong.")
+    if engine not in TRANSFORM_ENGINES:
+        raise ValueError(f"Engine transformasi tidak dikenal: {engine}")
+    if engine != 'fast' and (rules is not None or quarantine is not None or history is not None):
+        raise ValueError("Aturan validasi, karantina dan indeks dedup hanya didukung engine 'fast'.")
+    if seen is not None and history is not None:
+        raise ValueError("Pilih salah satu: seen atau history.")
 
     try:
         df = pd.DataFrame(raw_data)
+        dropped = {} if stats is not None else None
+        if engine == 'fast':
+            df = _clean_fast(df, seen, dropped, rules or DEFAULT_RULES, quarantine, history)
+        else:
+            df = TRANSFORM_ENGINES[engine](df, seen, dropped)
 
-        # Buang baris dengan nilai null
-        df.dropna(inplace=True)
-
-        # Buang baris dengan data invalid eksplisit
-        df = df[~df['title'].str.lower().str.contains("unknown product")]
-        df = df[~df['rating'].isin(["Invalid Rating / 5", "Not Rated"])]
-        df = df[~df['price'].isin(["Price Unavailable", None])]
-
-        # Buang duplikat
-        df.drop_duplicates(inplace=True)
-
-        # Membersihkan dan konversi kolom `price`
-        df['price'] = df['price'].str.replace(r'[^0-9.]', '', regex=True)
-        df['price'] = df['price'].astype(float) * 16000
-
-        # Membersihkan dan konversi kolom `rating`
-        df['rating'] = df['rating'].str.extract(r'(\d+\.?\d*)')
-        df['rating'] = df['rating'].astype(float)
-
-        # Membersihkan dan konversi kolom `colors`
-        df['colors'] = df['colors'].str.extract(r'(\d+)').astype(int)
-
-        # Membersihkan kolom `size` dan `gender`
-        df['size'] = df['size'].str.replace("Size: ", "").str.strip()
-        df['gender'] = df['gender'].str.replace("Gender: ", "").str.strip()
+        if compact:
+            df = to_compact(df)
 
         # Validasi tipe data kolom
-        expected_dtypes = {
-            'title' : 'object',
-            'price' : 'float64',
-            'rating': 'float64',
-            'colors': 'int64',
-            'size'  : 'object',
-            'gender': 'object'
-        }
-
-        for column, expected_type in expected_dtypes.items():
-            actual_type = df[column].dtype
-            if str(actual_type) == expected_type:
-                logging.info(f"Tipe data kolom '{column}' sudah sesuai: {actual_type}")
-            else:
-                logging.warning(f"Tipe data kolom '{column}' TIDAK SESUAI! Diharapkan: {expected_type}, Aktual: {actual_type}")
+        validate_dtypes(df, COMPACT_DTYPES if compact else DEFAULT_DTYPES)
 
         # Reset index
         df.reset_index(drop=True, inplace=True)
 
         logging.info(f"Data berhasil dibersihkan: {df.shape[0]} baris")
+        if dropped:
+            summary = ", ".join(f"{rule}={count}" for rule, count in dropped.items() if count)
+            logging.info(f"Baris dibuang per aturan: {summary or '-'}")
+
+        if stats is not None:
+            stats.update(rows_in=len(raw_data), rows_out=len(df), dropped=dropped)
 
         return df
 
     except Exception as e:
         logging.error(f"Error saat membersihkan dan mentransformasi data: {e}")
         raise e
+
+
+def transform_stream(raw_chunks, compact=False, stats=None, rules=None, quarantine=None, history=None):
+    """
+    Membersihkan data mentah per chunk dengan hasil yang sama seperti `clean_and_transform`
+    pada gabungan seluruh chunk, tanpa pernah menyimpan semua data sekaligus.
+
+    Parameters:
+    raw_chunks (iterable): Iterable berisi list of dictionary data mentah (misal dari `iter_product_chunks`).
+    compact (bool)       : Jika True, setiap chunk memakai skema ringkas `COMPACT_DTYPES`.
+    stats (list)         : Jika diberikan, diisi statistik per chunk seperti `stats` pada `clean_and_transform`.
+    rules (RuleSet)      : Aturan validasi baris, seperti pada `clean_and_transform`.
+    quarantine (list)    : Jika diberikan, ditambah DataFrame baris yang dibuang untuk setiap chunk.
+    history (DedupIndex) : Jika diberikan, dipakai untuk deduplikasi lintas chunk (dan lintas run)
+                           menggantikan set hash baris mentah.
+
+    Yields:
+    pd.DataFrame: DataFrame bersih untuk setiap chunk yang masih menyisakan baris.
+    """
+    seen = set() if history is None else None
+    for chunk in raw_chunks:
+        if not chunk:
+            continue
+        chunk_stats = {} if stats is not None else None
+        df = clean_and_transform(chunk, seen=seen, compact=compact, stats=chunk_stats, rules=rules,
+                                 quarantine=quarantine, history=history)
+        if stats is not None:
+            stats.append(chunk_stats)
+        if not df.empty:
+            yield df
+
@@ -0,0 +1,213 @@
+import json
+import re
+import numpy as np
+import pandas as pd
+
+# Literal invalid dari situs sumber
+INVALID_RATINGS = frozenset(["Invalid Rating / 5", "Not Rated"])
+INVALID_PRICES  = frozenset(["Price Unavailable"])
+
+# Nama aturan deduplikasi yang selalu dijalankan transform setelah aturan validasi baris
+DEDUP_RULES = ("duplicate", "seen_before")
+
+# Jenis aturan: key pada konfigurasi -> arti (baris dibuang jika ...)
+RULE_KINDS = {
+    'not_null'   : "salah satu kolom (default semua kolom) bernilai null",
+    'contains'   : "teks kolom mengandung substring (tidak peka huruf besar/kecil)",
+    'in'         : "nilai kolom termasuk salah satu literal",
+    'matches'    : "teks kolom cocok dengan regex (re.search)",
+    'not_matches': "teks kolom tidak cocok dengan regex (re.search)",
+}
+
+
+def _match_rows(series, predicate, alive):
+    """
+    Mengevaluasi `predicate` pada setiap baris yang masih lolos aturan sebelumnya (`alive`).
+    Nilai null (dan non-string) tidak pernah cocok; null ditangani aturan `not_null`.
+    """
+    values = series.to_numpy(dtype=object)
+    if alive is None:
+        return np.fromiter((isinstance(value, str) and predicate(value) for value in values),
+                           dtype=bool, count=len(values))
+    hits = np.zeros(len(values), dtype=bool)
+    rows = np.flatnonzero(alive)
+    hits[rows] = np.fromiter((isinstance(value, str) and predicate(value) for value in values[rows]),
+                             dtype=bool, count=len(rows))
+    return hits
+
+
+class Rule:
+    """
+    Satu aturan validasi baris yang dikompilasi sekali (literal menjadi set, regex dikompilasi,
+    substring di-lowercase) dan dievaluasi per kolom secara vektor.
+
+    Parameters:
+    name (str)   : Nama aturan, dipakai di statistik `dropped`, metrik dan kolom `reject_rule` karantina.
+    kind (str)   : Jenis aturan, salah satu key `RULE_KINDS`.
+    column       : Kolom yang dicek (str). Untuk 'not_null' boleh list kolom atau None (semua kolom).
+    value        : Parameter aturan: substring ('contains'), list literal ('in') atau regex ('matches',
+                   'not_matches'). Tidak dipakai oleh 'not_null'.
+
+    Raises:
+    ValueError: Jika jenis aturan tidak dikenal, kolom atau parameter tidak diisi, atau regex tidak valid.
+    """
+
+    def __init__(self, name, kind, column=None, value=None):
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Jenis aturan tidak dikenal: {kind}")
+        if not name or name in DEDUP_RULES:
+            raise ValueError(f"Nama aturan tidak valid: {name!r}")
+        if kind != 'not_null' and (not isinstance(column, str) or value is None):
+            raise ValueError(f"Aturan {name} ({kind}) membutuhkan 'column' dan nilai aturan.")
+
+        self.name = name
+        self.kind = kind
+        self.column = column
+        self.value = value
+        if kind == 'not_null':
+            self._columns = [column] if isinstance(column, str) else (list(column) if column else None)
+        elif kind == 'contains':
+            needle = str(value).lower()
+            self._predicate = lambda text: needle in text.lower()
+        elif kind == 'in':
+            self._values = list(dict.fromkeys(value if isinstance(value, (list, tuple, set, frozenset)) else [value]))
+        else:
+            try:
+                pattern = re.compile(value)
+            except re.error as e:
+                raise ValueError(f"Regex aturan {name} tidak valid: {e}") from e
+            search = pattern.search
+            self._predicate = search if kind == 'matches' else (lambda text: search(text) is None)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Membuat Rule dari dictionary, misal {"name": "invalid_rating", "column": "rating", "in": ["Not Rated"]}
+        atau {"name": "null", "not_null": true}.
+
+        Raises:
+        ValueError: Jika tidak tepat satu jenis aturan diisi atau ada key yang tidak dikenal.
+        """
+        kinds = [kind for kind in RULE_KINDS if kind in data]
+        unknown = set(data) - set(RULE_KINDS) - {'name', 'column'}
+        if len(kinds) != 1 or unknown:
+            raise ValueError(f"Aturan tidak valid (harus berisi tepat satu dari {', '.join(RULE_KINDS)}): {data}")
+        kind = kinds[0]
+        value = data[kind]
+        if kind == 'not_null':
+            # {"not_null": true} = semua kolom, {"not_null": ["title"]} = kolom tertentu
+            return cls(data.get('name'), kind, column=data.get('column') or (value if value is not True else None))
+        return cls(data.get('name'), kind, column=data.get('column'), value=value)
+
+    def rejects(self, df, alive=None):
+        """
+        Baris yang dibuang aturan ini.
+
+        Parameters:
+        df (pd.DataFrame)  : Data mentah.
+        alive (np.ndarray) : Opsional, mask baris yang belum dibuang aturan sebelumnya. Aturan teks
+                             hanya mengevaluasi baris ini; baris lain boleh bernilai apa saja.
+
+        Returns:
+        np.ndarray: Mask boolean sepanjang `df`, True = baris melanggar aturan.
+
+        Raises:
+        ValueError: Jika kolom aturan tidak ada di DataFrame.
+        """
+        if self.kind == 'not_null':
+            columns = self._columns or list(df.columns)
+            missing = [column for column in columns if column not in df.columns]
+            if missing:
+                raise ValueError(f"Kolom aturan {self.name} tidak ditemukan: {missing}")
+            frame = df if self._columns is None else df[columns]
+            # Satu pemanggilan isna pada array 2D, lebih cepat dari notna().all(axis=1) per Series
+            return pd.isna(frame.to_numpy()).any(axis=1)
+
+        if self.column not in df.columns:
+            raise ValueError(f"Kolom aturan {self.name} tidak ditemukan: {self.column}")
+        series = df[self.column]
+        if self.kind == 'in':
+            return series.isin(self._values).to_numpy()
+        return _match_rows(series, self._predicate, alive)
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.kind!r}, column={self.column!r})"
+
+
+class RuleSet:
+    """
+    Kumpulan aturan validasi baris yang dievaluasi berurutan. Setiap baris dicatat pada aturan
+    pertama yang membuangnya, sama seperti rangkaian filter transform sebelumnya.
+
+    Parameters:
+    rules (list): Daftar Rule, berurutan sesuai prioritas.
+
+    Raises:
+    ValueError: Jika ada nama aturan ganda.
+    """
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        names = [rule.name for rule in self.rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Nama aturan ganda: {duplicates}")
+
+    @classmethod
+    def from_list(cls, items):
+        """Membuat RuleSet dari list dictionary (lihat `Rule.from_dict`)."""
+        return cls([Rule.from_dict(item) for item in items])
+
+    @property
+    def names(self):
+        """Nama semua aturan termasuk aturan deduplikasi, sesuai urutan penerapannya."""
+        return tuple(rule.name for rule in self.rules) + DEDUP_RULES
+
+    def evaluate(self, df):
+        """
+        Mengevaluasi semua aturan terhadap `df`.
+
+        Returns:
+        np.ndarray: Indeks aturan pertama yang membuang setiap baris (int16), -1 untuk baris yang lolos.
+        """
+        reasons = np.full(len(df), -1, dtype=np.int16)
+        alive = np.ones(len(df), dtype=bool)
+        for index, rule in enumerate(self.rules):
+            # Baris yang sudah dibuang aturan sebelumnya tidak dihitung lagi (first match)
+            hits = rule.rejects(df, alive) & alive
+            reasons[hits] = index
+            alive &= ~hits
+        return reasons
+
+    def __len__(self):
+        return len(self.rules)
+
+
+# Aturan bawaan: identik dengan rangkaian filter transform versi awal
+DEFAULT_RULES = RuleSet([
+    Rule("null", "not_null"),
+    Rule("unknown_product", "contains", "title", "unknown product"),
+    Rule("invalid_rating", "in", "rating", sorted(INVALID_RATINGS)),
+    Rule("invalid_price", "in", "price", sorted(INVALID_PRICES)),
+])
+
+
+def load_rules(path):
+    """
+    Membaca aturan validasi dari file JSON berisi list aturan (lihat `Rule.from_dict`), sehingga
+    aturan bisa diubah tanpa mengubah kode.
+
+    Parameters:
+    path (str): Path file JSON.
+
+    Returns:
+    RuleSet: Aturan berurutan sesuai file.
+
+    Raises:
+    ValueError: Jika isi file bukan list atau ada aturan yang tidak valid.
+    """
+    with open(path, encoding='utf-8') as f:
+        items = json.load(f)
+    if not isinstance(items, list):
+        raise ValueError(f"File {path} harus berisi list aturan.")
+    return RuleSet.from_list(items)
@@ -0,0 +1,464 @@
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import socket
+import sqlite3
+import time
+import utils.extract as extract
+from utils.extract import iter_pages, is_last_page, _record_stats
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SHARD_DIR = '.cache/shards'
+
+# Lama lease satu shard (detik); diperpanjang setiap halaman selesai diambil
+DEFAULT_LEASE_SECONDS = 60
+# Batas percobaan satu shard sebelum dianggap gagal
+DEFAULT_MAX_ATTEMPTS = 3
+# Jeda worker saat semua shard yang tersisa sedang di-lease worker lain
+POLL_INTERVAL = 0.5
+
+
+class ShardLease:
+    """
+    Shard yang sedang dikerjakan satu worker: rentang halaman `first_page`..`last_page`.
+
+    Parameters:
+    shard (int)     : Nomor shard.
+    first_page (int): Halaman pertama shard.
+    last_page (int) : Halaman terakhir shard.
+    worker (str)    : ID worker pemegang lease.
+    attempts (int)  : Percobaan ke berapa lease ini (1 = pertama kali).
+    """
+
+    def __init__(self, shard, first_page, last_page, worker, attempts):
+        self.shard = shard
+        self.first_page = first_page
+        self.last_page = last_page
+        self.worker = worker
+        self.attempts = attempts
+
+
+class PageQueue:
+    """
+    Work queue rentang halaman katalog di SQLite, dipakai bersama oleh beberapa proses worker.
+
+    Katalog dibagi menjadi shard berisi `shard_pages` halaman. Worker mengambil shard lewat
+    `claim()` (transaksi `BEGIN IMMEDIATE`, sehingga satu shard hanya dipegang satu worker),
+    memperpanjang lease setiap halaman, lalu menulis hasilnya ke `shard-<nomor>.json` dan menandai
+    shard selesai. Lease yang kedaluwarsa (worker mati atau macet) diambil ulang worker lain,
+    sampai `max_attempts` percobaan. Shard yang menemukan akhir katalog (halaman kosong atau 404)
+    mencatat `end_page`; shard setelahnya tidak perlu diambil lagi.
+
+    Disimpan di `<directory>/`:
+    - queue.sqlite     : status, lease dan percobaan per shard, serta konfigurasi scraping
+    - shard-<n>.json   : produk mentah dan ringkasan per halaman hasil setiap shard
+
+    Worker di host lain bisa ikut lewat direktori bersama selama filesystem-nya mendukung
+    lock SQLite (lihat `run_worker`).
+
+    Parameters:
+    directory (str): Direktori work queue; dibuat jika belum ada.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        # Transaksi diatur sendiri (autocommit); timeout menunggu lock dari proses lain
+        self._conn = sqlite3.connect(os.path.join(directory, 'queue.sqlite'), timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS shards (
+                shard         INTEGER PRIMARY KEY,
+                first_page    INTEGER NOT NULL,
+                last_page     INTEGER NOT NULL,
+                state         TEXT NOT NULL DEFAULT 'pending',
+                worker        TEXT,
+                lease_expires REAL,
+                attempts      INTEGER NOT NULL DEFAULT 0,
+                error         TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Transaksi tulis yang langsung mengambil lock, agar claim dari banyak proses tidak bentrok."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def create(self, max_pages: int, shard_pages: int, scrape_options: dict = None,
+               lease_seconds: float = DEFAULT_LEASE_SECONDS, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+               base_url: str = None):
+        """
+        Mengisi antrian dengan shard halaman 1..`max_pages` dan menyimpan konfigurasi worker.
+
+        Jika antrian sudah berisi shard (run dilanjutkan), shard yang ada dipakai apa adanya:
+        shard yang sudah selesai tidak diambil ulang dan shard yang gagal diberi kesempatan lagi.
+
+        Parameters:
+        max_pages (int)      : Jumlah maksimum halaman katalog.
+        shard_pages (int)    : Jumlah halaman per shard.
+        scrape_options (dict): Argumen `iter_pages` untuk setiap worker (max_workers, rate_limit, ...).
+        lease_seconds (float): Lama lease shard. Default = DEFAULT_LEASE_SECONDS.
+        max_attempts (int)   : Batas percobaan per shard. Default = DEFAULT_MAX_ATTEMPTS.
+        base_url (str)       : URL katalog yang di-scrape worker. Default = `utils.extract.BASE_URL`.
+
+        Raises:
+        ValueError: Jika max_pages, shard_pages, lease_seconds atau max_attempts tidak positif.
+        """
+        if max_pages < 1 or shard_pages < 1:
+            raise ValueError("max_pages dan shard_pages minimal 1.")
+        if lease_seconds <= 0 or max_attempts < 1:
+            raise ValueError("lease_seconds harus positif dan max_attempts minimal 1.")
+        config = {
+            "max_pages": max_pages,
+            "lease_seconds": lease_seconds,
+            "max_attempts": max_attempts,
+            "base_url": base_url or extract.BASE_URL,
+            "scrape": scrape_options or {},
+        }
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('config', ?)", (json.dumps(config),))
+            if conn.execute("SELECT COUNT(*) FROM shards").fetchone()[0]:
+                conn.execute("UPDATE shards SET state = 'pending', attempts = 0, worker = NULL WHERE state = 'failed'")
+            else:
+                conn.executemany(
+                    "INSERT INTO shards (shard, first_page, last_page) VALUES (?, ?, ?)",
+                    [(index, first, min(first + shard_pages - 1, max_pages))
+                     for index, first in enumerate(range(1, max_pages + 1, shard_pages), start=1)]
+                )
+
+    @property
+    def config(self) -> dict:
+        """Konfigurasi yang disimpan `create()` (kosong jika antrian belum dibuat)."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'config'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    @property
+    def end_page(self):
+        """Halaman akhir katalog yang sudah ditemukan worker, atau None jika belum."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'end_page'").fetchone()
+        return int(row[0]) if row else None
+
+    def _last_needed_page(self) -> int:
+        """Halaman terakhir yang masih perlu diambil: akhir katalog jika sudah diketahui."""
+        end_page = self.end_page
+        return end_page if end_page is not None else self.config.get("max_pages", 0)
+
+    def claim(self, worker: str):
+        """
+        Mengambil shard berikutnya (nomor halaman terkecil) yang belum dikerjakan atau yang lease-nya
+        sudah kedaluwarsa.
+
+        Parameters:
+        worker (str): ID worker yang mengambil shard.
+
+        Returns:
+        ShardLease: Shard yang di-lease, atau None jika tidak ada shard yang bisa diambil saat ini.
+        """
+        config = self.config
+        now = time.time()
+        with self._transaction() as conn:
+            # Lease kedaluwarsa yang sudah mencapai batas percobaan tidak diambil lagi
+            conn.execute(
+                "UPDATE shards SET state = 'failed', worker = NULL, error = COALESCE(error, 'lease expired') "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, config["max_attempts"])
+            )
+            row = conn.execute(
+                "SELECT shard, first_page, last_page, attempts FROM shards "
+                "WHERE first_page <= ? AND (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) "
+                "ORDER BY first_page LIMIT 1",
+                (self._last_needed_page(), now)
+            ).fetchone()
+            if row is None:
+                return None
+            shard, first_page, last_page, attempts = row
+            conn.execute(
+                "UPDATE shards SET state = 'leased', worker = ?, lease_expires = ?, attempts = ? WHERE shard = ?",
+                (worker, now + config["lease_seconds"], attempts + 1, shard)
+            )
+        if attempts:
+            logging.warning(f"Shard {shard} (halaman {first_page}-{last_page}) diambil ulang oleh {worker}, "
+                            f"percobaan ke-{attempts + 1}.")
+        return ShardLease(shard, first_page, last_page, worker, attempts + 1)
+
+    def heartbeat(self, lease: ShardLease) -> bool:
+        """
+        Memperpanjang lease shard.
+
+        Returns:
+        bool: False jika lease sudah diambil alih worker lain (hasil shard ini sebaiknya dibuang).
+        """
+        cursor = self._conn.execute(
+            "UPDATE shards SET lease_expires = ? WHERE shard = ? AND worker = ? AND state = 'leased'",
+            (time.time() + self.config["lease_seconds"], lease.shard, lease.worker)
+        )
+        return cursor.rowcount == 1
+
+    def _result_path(self, shard: int) -> str:
+        return os.path.join(self.directory, f"shard-{shard:05d}.json")
+
+    def complete(self, lease: ShardLease, pages: list, end_page: int = None) -> bool:
+        """
+        Menyimpan hasil shard (ditulis atomik) lalu menandainya selesai.
+
+        Parameters:
+        lease (ShardLease): Shard yang selesai.
+        pages (list)      : Hasil per halaman: dictionary berisi page, products dan stats.
+        end_page (int)    : Halaman akhir katalog jika ditemukan di shard ini; shard setelahnya dilewati.
+
+        Returns:
+        bool: False jika lease sudah diambil alih worker lain (shard tetap milik worker tersebut).
+        """
+        path = self._result_path(lease.shard)
+        tmp_path = f"{path}.{lease.worker}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(pages, f)
+        os.replace(tmp_path, path)
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE shards SET state = 'done', worker = NULL, lease_expires = NULL, error = NULL "
+                "WHERE shard = ? AND worker = ? AND state = 'leased'",
+                (lease.shard, lease.worker)
+            )
+            if cursor.rowcount != 1:
+                return False
+            if end_page is not None:
+                known = self.end_page
+                end_page = end_page if known is None else min(known, end_page)
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('end_page', ?)", (str(end_page),))
+                conn.execute("UPDATE shards SET state = 'skipped' WHERE state = 'pending' AND first_page > ?",
+                             (end_page,))
+        return True
+
+    def fail(self, lease: ShardLease, error: str):
+        """Mengembalikan shard ke antrian setelah error, atau menandainya gagal jika percobaan sudah habis."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE shards SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, lease_expires = NULL, error = ? WHERE shard = ? AND worker = ? AND state = 'leased'",
+                (self.config["max_attempts"], error, lease.shard, lease.worker)
+            )
+
+    def counts(self) -> dict:
+        """Jumlah shard per status: {pending, leased, done, failed, skipped}."""
+        return dict(self._conn.execute("SELECT state, COUNT(*) FROM shards GROUP BY state").fetchall())
+
+    def failed(self) -> dict:
+        """Shard yang gagal sebelum akhir katalog beserta error terakhirnya: {shard: error}."""
+        return dict(self._conn.execute(
+            "SELECT shard, error FROM shards WHERE state = 'failed' AND first_page <= ? ORDER BY shard",
+            (self._last_needed_page(),)
+        ).fetchall())
+
+    def finished(self) -> bool:
+        """True jika tidak ada lagi shard sebelum akhir katalog yang menunggu atau sedang dikerjakan."""
+        return self._conn.execute(
+            "SELECT 1 FROM shards WHERE state IN ('pending', 'leased') AND first_page <= ? LIMIT 1",
+            (self._last_needed_page(),)
+        ).fetchone() is None
+
+    def results(self):
+        """
+        Generator hasil seluruh shard yang selesai, berurutan sesuai nomor halaman sampai akhir katalog.
+
+        Yields:
+        dict: Hasil satu halaman (page, products, stats).
+
+        Raises:
+        RuntimeError: Jika masih ada shard sebelum akhir katalog yang belum selesai.
+        """
+        last_page = self._last_needed_page()
+        rows = self._conn.execute(
+            "SELECT shard, state FROM shards WHERE first_page <= ? ORDER BY first_page", (last_page,)
+        ).fetchall()
+        unfinished = [shard for shard, state in rows if state != 'done']
+        if unfinished:
+            raise RuntimeError(f"Shard belum selesai: {unfinished}")
+        for shard, _ in rows:
+            with open(self._result_path(shard), encoding="utf-8") as f:
+                for page in json.load(f):
+                    if page["page"] <= last_page:
+                        yield page
+
+    def close(self):
+        """Menutup koneksi SQLite antrian."""
+        self._conn.close()
+
+    def remove(self):
+        """Menghapus antrian dan hasil shard dari disk."""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _scrape_shard(queue, lease, scrape_options):
+    """
+    Mengambil semua halaman satu shard.
+
+    Returns:
+    tuple: (pages, end_page), atau (None, None) jika lease diambil alih worker lain di tengah jalan.
+    """
+    pages = []
+    end_page = None
+    stop_on_empty = scrape_options.get("stop_on_empty", True)
+    for page, page_data in iter_pages(max_pages=lease.last_page, start_page=lease.first_page, **scrape_options):
+        stats = []
+        _record_stats(stats, page, page_data)
+        pages.append({"page": page, "products": list(page_data), "stats": stats[0]})
+        if stop_on_empty and is_last_page(page_data):
+            end_page = page
+        if not queue.heartbeat(lease):
+            return None, None
+    return pages, end_page
+
+
+def run_worker(directory: str, worker_id: str = None, poll_interval: float = POLL_INTERVAL) -> int:
+    """
+    Menjalankan satu worker: mengambil shard dari antrian dan men-scrape-nya sampai antrian selesai.
+
+    Konfigurasi scraping (URL katalog, max_workers, rate_limit, ...) dibaca dari antrian, sehingga
+    worker tambahan cukup diberi direktori antriannya, termasuk dari host lain lewat direktori
+    bersama (`python main.py --join-queue <directory>`). Selama shard yang tersisa masih di-lease
+    worker lain, worker menunggu dan mengambilnya jika lease tersebut kedaluwarsa.
+
+    Parameters:
+    directory (str)     : Direktori `PageQueue` yang sudah dibuat coordinator.
+    worker_id (str)     : ID worker di antrian. Default = <hostname>-<pid>.
+    poll_interval (float): Jeda (detik) saat belum ada shard yang bisa diambil. Default = POLL_INTERVAL.
+
+    Returns:
+    int: Jumlah shard yang diselesaikan worker ini.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    completed = 0
+    with PageQueue(directory) as queue:
+        config = queue.config
+        if not config:
+            raise ValueError(f"Work queue {directory} belum dibuat.")
+        # Konfigurasi per proses: worker men-scrape katalog yang sama dengan coordinator
+        extract.BASE_URL = config["base_url"]
+        while not queue.finished():
+            lease = queue.claim(worker_id)
+            if lease is None:
+                time.sleep(poll_interval)
+                continue
+            try:
+                pages, end_page = _scrape_shard(queue, lease, config["scrape"])
+            except Exception as e:
+                logging.error(f"[ERROR] Shard {lease.shard} gagal di {worker_id}: {e}")
+                queue.fail(lease, str(e))
+                continue
+            if pages is None or not queue.complete(lease, pages, end_page):
+                logging.warning(f"Lease shard {lease.shard} diambil alih worker lain; hasil {worker_id} dibuang.")
+                continue
+            completed += 1
+    logging.info(f"Worker {worker_id} selesai: {completed} shard.")
+    return completed
+
+
+def scrape_sharded(max_pages=50, workers=2, shard_pages=10, directory=None, lease_seconds=DEFAULT_LEASE_SECONDS,
+                   max_attempts=DEFAULT_MAX_ATTEMPTS, stats=None, on_page=None, rate_limit=None, **scrape_options):
+    """
+    Coordinator scraping ter-shard: membagi halaman katalog ke `workers` proses lewat `PageQueue`,
+    menunggu semua worker selesai, lalu menggabungkan hasil per shard.
+
+    Hasilnya sama dengan `scrape_all_pages`: produk mentah berurutan sesuai nomor halaman sampai
+    akhir katalog. `rate_limit` adalah batas total per host, sehingga dibagi rata ke setiap worker.
+    Jika `directory` diberikan dan sudah berisi antrian (misal run yang gagal di tengah), shard yang
+    sudah selesai tidak diambil ulang.
+
+    Parameters:
+    max_pages (int)      : Jumlah maksimum halaman yang akan di-scrape. Default = 50.
+    workers (int)        : Jumlah proses worker. Default = 2.
+    shard_pages (int)    : Jumlah halaman per shard. Default = 10. Shard kecil membagi kerja lebih rata,
+                           tetapi setiap shard menunggu request terakhirnya sebelum shard berikutnya dimulai.
+    directory (str)      : Direktori antrian. Default = direktori sementara di SHARD_DIR yang dihapus setelah selesai.
+    lease_seconds (float): Lama lease shard (lihat `PageQueue`). Default = DEFAULT_LEASE_SECONDS.
+    max_attempts (int)   : Batas percobaan per shard. Default = DEFAULT_MAX_ATTEMPTS.
+    stats (list)         : Jika diberikan, diisi ringkasan per halaman seperti pada `scrape_all_pages`.
+    on_page (callable)   : Dipanggil dengan (page_num, products) untuk setiap halaman saat digabungkan.
+    rate_limit (float)   : Batas request per detik per host untuk semua worker. None = tanpa batas.
+    **scrape_options     : Argumen `iter_pages` per worker (max_workers, parse_workers, stop_on_empty, ...).
+
+    Returns:
+    list: Gabungan seluruh data produk dari setiap halaman.
+
+    Raises:
+    ValueError  : Jika workers kurang dari 1.
+    RuntimeError: Jika ada shard yang gagal setelah `max_attempts` percobaan atau semua worker berhenti
+                  sebelum antrian selesai.
+    """
+    if workers < 1:
+        raise ValueError("workers minimal 1.")
+    # Diimpor di sini agar proses worker tidak ikut memuat pandas
+    from utils.checkpoint import new_run_id
+
+    own_directory = directory is None
+    directory = directory or os.path.join(SHARD_DIR, new_run_id())
+    if rate_limit:
+        scrape_options["rate_limit"] = rate_limit / workers
+
+    queue = PageQueue(directory)
+    processes = []
+    try:
+        queue.create(max_pages, shard_pages, scrape_options, lease_seconds=lease_seconds, max_attempts=max_attempts)
+        logging.info(f"Work queue {directory}: {queue.counts()} dengan {workers} worker.")
+        # Sama seperti process pool parser: proses baru tidak di-fork dari proses yang punya banyak thread
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        context = multiprocessing.get_context(method)
+        processes = [context.Process(target=run_worker, args=(directory,), daemon=True) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            if process.exitcode:
+                logging.warning(f"Worker pid {process.pid} berhenti dengan exit code {process.exitcode}.")
+
+        failed = queue.failed()
+        if failed:
+            raise RuntimeError(f"Shard gagal setelah {max_attempts} percobaan: {failed}")
+        if not queue.finished():
+            raise RuntimeError(f"Semua worker berhenti sebelum antrian selesai: {queue.counts()}")
+
+        all_data = []
+        for page in queue.results():
+            all_data.extend(page["products"])
+            if stats is not None:
+                stats.append(page["stats"])
+            if on_page is not None:
+                on_page(page["page"], page["products"])
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        if own_directory:
+            queue.remove()
+        else:
+            queue.close()
+
+    logging.info(f"Total products scraped: {len(all_data)}")
+    return all_data